@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Load test for the Decision AI API
+
+Drives the app at a fixed concurrency (closed loop) or request rate (open
+loop) with a mix of /predict, /predict_with_data and /predict/batch calls,
+and reports throughput, latency percentiles, error rate and the CPU/RSS of
+the serving process(es) over time.
+
+    # In-process, through an ASGI transport (no sockets; CPU figures then
+    # include the load generator itself)
+    python load_test.py --duration 30 --concurrency 16
+
+    # A local prefork server started for the test, at 200 requests/s
+    python load_test.py --spawn-server --workers 2 --rate 200 --duration 60
+
+    # An already running server
+    python load_test.py --url http://localhost:8000 --server-pid 1234 --concurrency 32
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent / "src"))
+
+import httpx
+
+DEFAULT_MIX = "predict=0.7,predict_with_data=0.2,batch=0.1"
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """``name=weight,...`` into normalized weights"""
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ("predict", "predict_with_data", "batch"):
+            raise ValueError(f"Unknown request type {name!r}")
+        weights[name] = float(weight or 1.0)
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError("The request mix needs a positive weight")
+    return {name: weight / total for name, weight in weights.items()}
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return float("nan")
+    # Smallest value with at least q of the samples at or below it; rounded
+    # first so float noise (0.95 * 100 = 95.00000000000001) does not skip a rank
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(round(q * len(sorted_values), 9)) - 1))
+    return sorted_values[rank]
+
+def latency_summary(latencies: List[float]) -> Dict[str, float]:
+    values = sorted(latencies)
+    return {
+        'count': len(values),
+        'p50_ms': percentile(values, 0.50) * 1000,
+        'p95_ms': percentile(values, 0.95) * 1000,
+        'p99_ms': percentile(values, 0.99) * 1000,
+        'max_ms': values[-1] * 1000 if values else float("nan")
+    }
+
+class ProcessSampler:
+    """CPU time and RSS of a process tree, read from /proc (Linux)"""
+
+    def __init__(self, root_pid: int):
+        self.root_pid = root_pid
+        self.clock_ticks = os.sysconf("SC_CLK_TCK")
+        self.page_size = os.sysconf("SC_PAGE_SIZE")
+
+    def _tree(self) -> List[int]:
+        pids, pending = [], [self.root_pid]
+        while pending:
+            pid = pending.pop()
+            pids.append(pid)
+            try:
+                for task in os.listdir(f"/proc/{pid}/task"):
+                    with open(f"/proc/{pid}/task/{task}/children") as f:
+                        pending.extend(int(child) for child in f.read().split())
+            except OSError:
+                pass
+        return pids
+
+    def sample(self) -> Tuple[float, int]:
+        """(cpu seconds, RSS bytes) summed over the tree"""
+        cpu_seconds, rss = 0.0, 0
+        for pid in self._tree():
+            try:
+                with open(f"/proc/{pid}/stat") as f:
+                    fields = f.read().rsplit(")", 1)[1].split()
+                with open(f"/proc/{pid}/statm") as f:
+                    rss += int(f.read().split()[1]) * self.page_size
+            except OSError:
+                continue
+            # utime and stime are fields 14 and 15 of /proc/pid/stat
+            cpu_seconds += (int(fields[11]) + int(fields[12])) / self.clock_ticks
+        return cpu_seconds, rss
+
+class LoadTest:
+    """Sends the request mix and records one (type, latency, ok) per request"""
+
+    def __init__(self, client: httpx.AsyncClient, mix: Dict[str, float], pairs: List[Tuple[str, str]],
+                 batch_size: int, seed: int):
+        self.client = client
+        self.mix_names = list(mix)
+        self.mix_weights = list(mix.values())
+        self.pairs = pairs
+        self.batch_size = batch_size
+        self.random = random.Random(seed)
+        self.records: List[Tuple[str, float, bool]] = []
+        self.statuses: Dict[str, int] = {}
+
+    def _request(self) -> Tuple[str, str, Dict]:
+        kind = self.random.choices(self.mix_names, self.mix_weights)[0]
+        if kind == "predict":
+            candidate_id, job_id = self.random.choice(self.pairs)
+            return kind, "/predict", {'candidate_id': candidate_id, 'job_id': job_id}
+        if kind == "batch":
+            pairs = [self.random.choice(self.pairs) for _ in range(self.batch_size)]
+            return kind, "/predict/batch", {
+                'pairs': [{'candidate_id': candidate_id, 'job_id': job_id} for candidate_id, job_id in pairs]
+            }
+        number = self.random.randrange(1_000_000)
+        return kind, "/predict_with_data", {
+            'candidate': {
+                'id': f"load-{number}",
+                'skills': self.random.sample(["Python", "SQL", "Docker", "SAP ABAP", "Java", "AWS"], 3),
+                'experience_years': self.random.randint(0, 20),
+                'location': self.random.choice(["São Paulo - SP", "Rio de Janeiro - RJ", "Curitiba - PR"]),
+                'salary_expectation': str(self.random.randint(30, 200) * 100),
+                'culture_fit': "Colaborativo"
+            },
+            'job': {
+                'id': f"load-job-{number}",
+                'title': "Desenvolvedor Python",
+                'required_skills': ["Python", "SQL", "AWS"],
+                'experience_level': "Pleno",
+                'location': "São Paulo - SP",
+                'salary_range': "8000-12000",
+                'company_culture': "Colaborativo"
+            }
+        }
+
+    async def send(self, scheduled: Optional[float] = None):
+        """One request; open-loop latency counts from its scheduled start"""
+        kind, path, payload = self._request()
+        start = scheduled if scheduled is not None else time.perf_counter()
+        try:
+            response = await self.client.post(path, json=payload)
+            ok = response.status_code == 200
+            status = str(response.status_code)
+        except httpx.HTTPError as e:
+            ok, status = False, type(e).__name__
+        self.records.append((kind, time.perf_counter() - start, ok))
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    async def run_closed_loop(self, concurrency: int, deadline: float):
+        async def worker():
+            while time.perf_counter() < deadline:
+                await self.send()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    async def run_open_loop(self, rate: float, deadline: float, max_in_flight: int):
+        interval = 1.0 / rate
+        next_send = time.perf_counter()
+        in_flight = set()
+        while next_send < deadline:
+            now = time.perf_counter()
+            if next_send > now:
+                await asyncio.sleep(next_send - now)
+            if len(in_flight) < max_in_flight:
+                task = asyncio.ensure_future(self.send(scheduled=next_send))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+            else:
+                self.records.append(("dropped", 0.0, False))
+                self.statuses["dropped"] = self.statuses.get("dropped", 0) + 1
+            next_send += interval
+        if in_flight:
+            await asyncio.gather(*in_flight)
+
+async def sample_resources(sampler: ProcessSampler, interval: float, samples: List[Dict], stop: asyncio.Event):
+    start = time.perf_counter()
+    previous_time, (previous_cpu, _) = start, sampler.sample()
+    while not stop.is_set():
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
+        now = time.perf_counter()
+        cpu, rss = sampler.sample()
+        samples.append({
+            't': round(now - start, 3),
+            'cpu_percent': 100.0 * (cpu - previous_cpu) / (now - previous_time),
+            'rss_mb': rss / 2 ** 20
+        })
+        previous_time, previous_cpu = now, cpu
+
+def load_pairs(limit: int, seed: int) -> List[Tuple[str, str]]:
+    """Known (candidate_id, job_id) pairs from the resident data"""
+    import api.main as api
+    api.initialize_models()
+    prospects = api.entity_store.prospects_df
+    if prospects.empty:
+        raise RuntimeError("No prospects in data/; run src/train_model.py or generate synthetic data first")
+    prospects = prospects[prospects['candidate_id'].map(api.entity_store.has_candidate)
+                          & prospects['job_id'].map(api.entity_store.has_job)]
+    sample = prospects.sample(n=min(limit, len(prospects)), random_state=seed)
+    return list(zip(sample['candidate_id'], sample['job_id']))
+
+def start_server(port: int, workers: int) -> subprocess.Popen:
+    server = subprocess.Popen(
+        [sys.executable, str(Path(__file__).parent / "src" / "api" / "serve.py"),
+         "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.time() + 120
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1.0).status_code == 200:
+                return server
+        except httpx.HTTPError:
+            pass
+        if server.poll() is not None:
+            raise RuntimeError(f"Server exited with status {server.returncode}")
+        time.sleep(0.5)
+    server.terminate()
+    raise RuntimeError("Server did not become healthy in time")
+
+async def run(args) -> Dict:
+    mix = parse_mix(args.mix)
+    pairs = load_pairs(args.pairs, args.seed)
+    server = None
+
+    if args.spawn_server:
+        server = start_server(args.port, args.workers)
+        base_url, monitored_pid = f"http://127.0.0.1:{args.port}", server.pid
+        client = httpx.AsyncClient(base_url=base_url, timeout=args.timeout,
+                                   limits=httpx.Limits(max_connections=max(args.concurrency, args.max_in_flight)))
+    elif args.url:
+        base_url, monitored_pid = args.url, args.server_pid
+        client = httpx.AsyncClient(base_url=base_url, timeout=args.timeout,
+                                   limits=httpx.Limits(max_connections=max(args.concurrency, args.max_in_flight)))
+    else:
+        import api.main as api
+        base_url, monitored_pid = "asgi://in-process", os.getpid()
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=api.app), base_url="http://loadtest",
+                                   timeout=args.timeout)
+
+    sampler = ProcessSampler(monitored_pid) if monitored_pid and Path("/proc").exists() else None
+    load_test = LoadTest(client, mix, pairs, args.batch_size, args.seed)
+    samples: List[Dict] = []
+    stop = asyncio.Event()
+    try:
+        # Warm-up traffic is not recorded
+        if args.warmup > 0:
+            await load_test.run_closed_loop(max(1, args.concurrency), time.perf_counter() + args.warmup)
+            load_test.records.clear()
+            load_test.statuses.clear()
+
+        cpu_before = sampler.sample()[0] if sampler else None
+        sampling = asyncio.ensure_future(sample_resources(sampler, args.sample_interval, samples, stop)) \
+            if sampler else None
+        start = time.perf_counter()
+        deadline = start + args.duration
+        if args.rate:
+            await load_test.run_open_loop(args.rate, deadline, args.max_in_flight)
+        else:
+            await load_test.run_closed_loop(args.concurrency, deadline)
+        elapsed = time.perf_counter() - start
+        stop.set()
+        if sampling:
+            await sampling
+        cpu_used = sampler.sample()[0] - cpu_before if sampler else None
+    finally:
+        await client.aclose()
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    completed = [(kind, latency, ok) for kind, latency, ok in load_test.records if kind != "dropped"]
+    successes = sum(ok for _, _, ok in completed)
+    report = {
+        'target': base_url,
+        'mode': f"open loop at {args.rate} req/s" if args.rate else f"closed loop, concurrency {args.concurrency}",
+        'duration_s': elapsed,
+        'requests': len(load_test.records),
+        'throughput_rps': len(completed) / elapsed,
+        'error_rate': 1.0 - successes / len(load_test.records) if load_test.records else 0.0,
+        'statuses': load_test.statuses,
+        'latency': latency_summary([latency for _, latency, _ in completed]),
+        'by_type': {kind: latency_summary([latency for k, latency, _ in completed if k == kind]) for kind in mix},
+        'resources': samples
+    }
+    if cpu_used:
+        report['cpu_seconds'] = cpu_used
+        report['requests_per_cpu_second'] = len(completed) / cpu_used
+    if samples:
+        report['peak_rss_mb'] = max(sample['rss_mb'] for sample in samples)
+    return report
+
+def print_report(report: Dict):
+    print(f"\n📊 {report['target']} - {report['mode']}")
+    print(f"   requests: {report['requests']} in {report['duration_s']:.1f}s "
+          f"({report['throughput_rps']:.1f} req/s), error rate {report['error_rate']:.2%}")
+    print(f"   statuses: {report['statuses']}")
+    for name, summary in [('all', report['latency'])] + list(report['by_type'].items()):
+        if summary['count']:
+            print(f"   {name:<18} n={summary['count']:<7} p50 {summary['p50_ms']:8.2f} ms  "
+                  f"p95 {summary['p95_ms']:8.2f} ms  p99 {summary['p99_ms']:8.2f} ms  max {summary['max_ms']:8.2f} ms")
+    if 'requests_per_cpu_second' in report:
+        print(f"   CPU: {report['cpu_seconds']:.2f}s used, {report['requests_per_cpu_second']:.1f} requests per "
+              f"CPU-second (≈ capacity per core); peak RSS {report.get('peak_rss_mb', 0):.0f} MB")
+
+def main():
+    parser = argparse.ArgumentParser(description="Decision AI API load test")
+    parser.add_argument("--url", help="running server to test; default is in-process through ASGI")
+    parser.add_argument("--server-pid", type=int, help="pid of the --url server, for CPU/RSS sampling")
+    parser.add_argument("--spawn-server", action="store_true", help="start src/api/serve.py for the test")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+    parser.add_argument("--warmup", type=float, default=3.0, help="seconds of unrecorded traffic first")
+    parser.add_argument("--concurrency", type=int, default=8, help="closed loop: requests kept in flight")
+    parser.add_argument("--rate", type=float, help="open loop: requests per second instead of --concurrency")
+    parser.add_argument("--max-in-flight", type=int, default=1000, help="open loop: requests beyond are dropped")
+    parser.add_argument("--mix", default=DEFAULT_MIX)
+    parser.add_argument("--batch-size", type=int, default=32, help="pairs per /predict/batch call")
+    parser.add_argument("--pairs", type=int, default=10000, help="distinct known pairs to draw from")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--sample-interval", type=float, default=1.0, help="seconds between CPU/RSS samples")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write the report as JSON")
+    args = parser.parse_args()
+
+    print("🚀 DECISION AI - LOAD TEST")
+    print("=" * 50)
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Report written to {args.output}")
+    return 0 if report['error_rate'] == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
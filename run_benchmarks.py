@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Performance benchmarks for Decision AI
+
+Generates synthetic datasets of several sizes, times the data loader,
+feature engineering, training, model inference and in-process /predict
+latency, and writes the results as JSON. With a baseline file, benchmarks
+whose median got slower than the threshold are flagged as regressions.
+
+    python run_benchmarks.py --sizes small,medium --output benchmarks/results.json
+    python run_benchmarks.py --baseline benchmarks/baseline.json --threshold 0.2
+    python run_benchmarks.py --sizes small --save-baseline benchmarks/baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent / "src"))
+
+# Every /predict call must reach the model, not the cache
+os.environ.setdefault("PREDICTION_CACHE_SIZE", "0")
+
+import numpy as np
+import pandas as pd
+
+from data.data_loader import DataLoader
+from data.synthetic_data import SyntheticDataGenerator
+from features.feature_engineering import FeatureEngineer
+from models.artifact import DEFAULT_ARTIFACT_DIR, save_artifact
+from models.candidate_job_matcher import CandidateJobMatcher
+
+# (jobs, applicants, prospects)
+SIZES = {
+    'tiny': (50, 500, 2000),
+    'small': (200, 2000, 10000),
+    'medium': (2000, 20000, 100000),
+    'large': (20000, 200000, 1000000)
+}
+
+def summarize(timings: List[float]) -> Dict[str, float]:
+    """Median, p95 and min of wall times (seconds)"""
+    timings = sorted(timings)
+    return {
+        'median': statistics.median(timings),
+        'p95': timings[min(len(timings) - 1, int(round(0.95 * (len(timings) - 1))))],
+        'min': timings[0],
+        'runs': len(timings)
+    }
+
+def measure(func: Callable[[], object], repeat: int, warmup: int = 1) -> Dict[str, float]:
+    """Wall-time statistics of ``repeat`` calls of ``func``"""
+    for _ in range(warmup):
+        func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return summarize(timings)
+
+def benchmark_size(size: str, repeat: int, seed: int, predict_requests: int) -> Dict[str, Dict]:
+    """Run every benchmark against one generated dataset"""
+    n_jobs, n_applicants, n_prospects = SIZES[size]
+    results = {}
+    cwd = os.getcwd()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        data_dir = Path(temp_dir) / "data"
+        start = time.perf_counter()
+        SyntheticDataGenerator(n_jobs, n_applicants, n_prospects, seed=seed).write(data_dir)
+        print(f"   generated {size} dataset in {time.perf_counter() - start:.1f}s")
+        # Slow stages run fewer times on large datasets
+        slow_repeat = max(1, repeat // 3) if n_prospects >= 100000 else repeat
+
+        loader = DataLoader(str(data_dir))
+        results['load_cold'] = measure(lambda: loader.process_decision_data(streaming=True), slow_repeat, warmup=0)
+        snapshot_loader = DataLoader(str(data_dir), use_snapshot=True)
+        results['load_snapshot'] = measure(snapshot_loader.process_decision_data, repeat)
+        results['get_job_candidate_pairs'] = measure(
+            lambda: snapshot_loader.get_job_candidate_pairs(as_columns=True), slow_repeat
+        )
+
+        vagas_df, prospects_df, applicants_df = snapshot_loader.process_decision_data()
+        feature_engineer = FeatureEngineer()
+        results['create_features'] = measure(
+            lambda: feature_engineer.create_features(vagas_df, applicants_df, prospects_df), slow_repeat
+        )
+        results['prepare_training_data'] = measure(
+            lambda: FeatureEngineer().prepare_training_data(vagas_df, applicants_df, prospects_df), slow_repeat
+        )
+
+        X, y = feature_engineer.prepare_training_data(vagas_df, applicants_df, prospects_df)
+        matcher = CandidateJobMatcher()
+        results['train'] = measure(lambda: CandidateJobMatcher().train(X, y), max(1, slow_repeat // 2), warmup=0)
+        matcher.train(X, y)
+
+        single = X.iloc[:1]
+        batch = X.iloc[:1000]
+        results['predict_proba_single'] = measure(lambda: matcher.predict_proba(single), repeat * 20)
+        results['predict_proba_batch_1000'] = measure(lambda: matcher.predict_proba(batch), repeat)
+        results['early_exit_batch_1000'] = measure(
+            lambda: matcher.evaluate_confidence_arrays(batch, early_exit=True), repeat
+        )
+        trees_used = matcher.evaluate_confidence_arrays(batch, early_exit=True)['trees_used']
+        print(f"   early exit: {trees_used.mean():.1f} of {matcher.compiled_forest.n_trees} trees per row on average")
+
+        # In-process API, serving the artifact and data written above
+        models_dir = Path(temp_dir) / "models"
+        models_dir.mkdir()
+        os.chdir(temp_dir)
+        try:
+            save_artifact(DEFAULT_ARTIFACT_DIR, matcher, feature_engineer)
+            results['api_predict'] = benchmark_api(prospects_df, predict_requests, seed)
+        finally:
+            os.chdir(cwd)
+
+    return results
+
+def benchmark_api(prospects_df: pd.DataFrame, n_requests: int, seed: int) -> Dict[str, float]:
+    """Latency of sequential /predict calls through the full ASGI stack"""
+    from fastapi.testclient import TestClient
+    import api.main as api
+
+    api.initialize_models(force=True)
+    api.prediction_cache.clear()
+    pairs = prospects_df[['candidate_id', 'job_id']].sample(
+        n=min(n_requests + 10, len(prospects_df)), replace=len(prospects_df) < n_requests + 10, random_state=seed
+    ).to_dict('records')
+
+    timings = []
+    with TestClient(api.app) as client:
+        for number, pair in enumerate(pairs):
+            start = time.perf_counter()
+            response = client.post("/predict", json=pair)
+            elapsed = time.perf_counter() - start
+            if response.status_code != 200:
+                raise RuntimeError(f"/predict returned {response.status_code}: {response.text}")
+            if number >= 10:  # warm-up requests are not counted
+                timings.append(elapsed)
+    return summarize(timings)
+
+def environment() -> Dict[str, str]:
+    """Where the numbers come from"""
+    import sklearn
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=Path(__file__).parent).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'git_commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sklearn': sklearn.__version__
+    }
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[Dict]:
+    """Benchmarks present in both runs, with their median ratio; ``regression`` above ``1 + threshold``"""
+    comparisons = []
+    for size, benchmarks in results['benchmarks'].items():
+        for name, stats in benchmarks.items():
+            base = baseline.get('benchmarks', {}).get(size, {}).get(name)
+            if not base or not base.get('median'):
+                continue
+            ratio = stats['median'] / base['median']
+            comparisons.append({
+                'size': size,
+                'benchmark': name,
+                'baseline_median': base['median'],
+                'median': stats['median'],
+                'ratio': ratio,
+                'regression': ratio > 1.0 + threshold
+            })
+    return comparisons
+
+def print_results(results: Dict, comparisons: List[Dict]):
+    by_key = {(item['size'], item['benchmark']): item for item in comparisons}
+    for size, benchmarks in results['benchmarks'].items():
+        print(f"\n📊 {size} {SIZES[size]}")
+        for name, stats in benchmarks.items():
+            line = f"   {name:<26} median {stats['median'] * 1000:10.2f} ms   p95 {stats['p95'] * 1000:10.2f} ms"
+            item = by_key.get((size, name))
+            if item:
+                marker = "❌ REGRESSION" if item['regression'] else "✅"
+                line += f"   x{item['ratio']:.2f} vs baseline {marker}"
+            print(line)
+
+def main():
+    parser = argparse.ArgumentParser(description="Decision AI performance benchmarks")
+    parser.add_argument("--sizes", default="small", help=f"comma-separated, from {', '.join(SIZES)}")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--predict-requests", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="benchmarks/results.json")
+    parser.add_argument("--baseline", help="results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown, 0.2 = 20%%")
+    parser.add_argument("--save-baseline", help="also write the results here as the new baseline")
+    args = parser.parse_args()
+
+    sizes = [size.strip() for size in args.sizes.split(",") if size.strip()]
+    unknown = [size for size in sizes if size not in SIZES]
+    if unknown:
+        parser.error(f"unknown sizes: {', '.join(unknown)}")
+
+    print("🚀 DECISION AI - BENCHMARKS")
+    print("=" * 50)
+    results = {'environment': environment(), 'threshold': args.threshold, 'benchmarks': {}}
+    for size in sizes:
+        print(f"🔄 Running {size} benchmarks...")
+        results['benchmarks'][size] = benchmark_size(size, args.repeat, args.seed, args.predict_requests)
+
+    comparisons = []
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            comparisons = compare(results, json.load(f), args.threshold)
+        results['comparison'] = {'baseline': args.baseline, 'results': comparisons}
+
+    print_results(results, comparisons)
+
+    for path in filter(None, [args.output, args.save_baseline]):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Results written to {path}")
+
+    regressions = [item for item in comparisons if item['regression']]
+    if regressions:
+        print(f"\n❌ {len(regressions)} benchmark(s) slower than baseline by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,22 +1,38 @@
 """
 FastAPI application for Decision AI candidate-job matching
 """
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from starlette.routing import Match
 from pydantic import BaseModel
 import pandas as pd
+import asyncio
 import joblib
+import json
 import logging
+import os
+import threading
+import time
 from pathlib import Path
 import sys
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 # Add src to path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from models.candidate_job_matcher import CandidateJobMatcher
+from models.artifact import DEFAULT_ARTIFACT_DIR, read_manifest
 from features.feature_engineering import FeatureEngineer
 from data.data_loader import DataLoader
+from data.entity_store import EntityStore
+from data.data_refresher import DataRefresher
+from api.scoring_pool import ScoringPool, ScoringPoolFull
+from api.micro_batcher import MicroBatcher
+from api.prediction_cache import PredictionCache
+from api.model_reload import ArtifactWatcher, ModelBundle, request_reload
 from monitoring.drift_detector import DriftDetector
+from monitoring.metrics import REGISTRY, stage_timer
+from monitoring.profiling import RequestProfiler
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -33,8 +49,38 @@ app = FastAPI(
 matcher: Optional[CandidateJobMatcher] = None
 feature_engineer: Optional[FeatureEngineer] = None
 data_loader: Optional[DataLoader] = None
+entity_store: Optional[EntityStore] = None
 drift_detector: Optional[DriftDetector] = None
 
+# The matcher and feature engineer actually used for scoring; replaced as a
+# unit on reload, requests keep the bundle they started with
+model_bundle: Optional[ModelBundle] = None
+artifact_watcher: Optional[ArtifactWatcher] = None
+data_refresher: Optional[DataRefresher] = None
+reload_lock = threading.Lock()
+
+# Blocking pandas/sklearn work runs here so the event loop stays responsive
+scoring_pool = ScoringPool.from_env()
+
+# Repeated /predict pairs are answered from memory
+prediction_cache = PredictionCache.from_env()
+
+# Opt-in: PROFILE_SAMPLE_RATE, or an admin X-Profile header per request
+request_profiler = RequestProfiler.from_env()
+
+# Request metrics, scraped from /metrics along with the stage timers
+REQUEST_SECONDS = REGISTRY.histogram(
+    "decision_request_seconds", "Request latency by endpoint", ("method", "endpoint", "status")
+)
+REQUESTS = REGISTRY.counter(
+    "decision_requests_total", "Requests served by endpoint", ("method", "endpoint", "status")
+)
+IN_FLIGHT = REGISTRY.gauge("decision_requests_in_flight", "Requests being served by endpoint", ("endpoint",))
+TREES_USED = REGISTRY.histogram(
+    "decision_early_exit_trees_used", "Trees evaluated per pair scored in bucket mode",
+    buckets=(8, 16, 24, 32, 48, 64, 96, 128, 256, 512)
+)
+
 # Pydantic models for API
 class CandidateData(BaseModel):
     id: str
@@ -66,28 +112,100 @@ class MatchResponse(BaseModel):
     confidence: float
     recommendation: str
     key_factors: List[str]
+    # Signed contribution of each key factor to this match score
+    factor_contributions: Optional[Dict[str, float]] = None
+    # Bucket mode: trees evaluated before the recommendation was settled
+    trees_used: Optional[int] = None
+    model_version: Optional[str] = None
+
+class BatchMatchRequest(BaseModel):
+    pairs: List[MatchRequest] = []
+    records: List[MatchRequestWithData] = []
+
+class BatchMatchResult(BaseModel):
+    candidate_id: str
+    job_id: str
+    match_score: Optional[float] = None
+    confidence: Optional[float] = None
+    recommendation: Optional[str] = None
+    key_factors: List[str] = []
+    factor_contributions: Optional[Dict[str, float]] = None
+    error: Optional[str] = None
+
+class BatchMatchResponse(BaseModel):
+    results: List[BatchMatchResult]
+    model_version: Optional[str] = None
 
-def initialize_models():
-    """Initialize models synchronously"""
-    global matcher, feature_engineer, data_loader, drift_detector
+def map_candidate_data(candidate: CandidateData) -> Dict:
+    """Map API candidate fields to the internal Decision fields"""
+    candidate_data = candidate.model_dump()
+    return {
+        'candidate_id': candidate_data['id'],
+        'nome': candidate_data.get('name', 'Unknown'),
+        'conhecimentos_tecnicos': candidate_data.get('skills', []),
+        'anos_experiencia': candidate_data.get('experience_years', 0),
+        'localizacao': candidate_data.get('location', ''),
+        'pretensao_salarial': str(candidate_data.get('salary_expectation', '0')),
+        'nivel_ingles': candidate_data.get('english_level', 'Intermediário'),
+        'nivel_espanhol': candidate_data.get('spanish_level', 'Básico'),
+        'nivel_academico': candidate_data.get('academic_level', 'Superior Completo')
+    }
+
+def map_job_data(job: JobData) -> Dict:
+    """Map API job fields to the internal Decision fields"""
+    job_data = job.model_dump()
+    return {
+        'job_id': job_data['id'],
+        'titulo': job_data.get('title', 'Unknown'),
+        'competencias_tecnicas': job_data.get('required_skills', []),
+        'nivel_profissional': job_data.get('experience_level', 'Pleno'),
+        'localizacao': job_data.get('location', ''),
+        'salario_range': job_data.get('salary_range', '0-0'),
+        'nivel_ingles': job_data.get('english_requirement', 'Intermediário'),
+        'nivel_espanhol': job_data.get('spanish_requirement', 'Não requerido'),
+        'is_sap': job_data.get('is_sap', False)
+    }
+
+def initialize_models(force: bool = False):
+    """Initialize models synchronously
+    
+    Idempotent: a no-op once loaded (e.g. in workers forked by serve.py
+    from an initialized parent) unless ``force`` is set.
+    """
+    global matcher, feature_engineer, data_loader, entity_store, drift_detector
+    
+    if entity_store is not None and not force:
+        logger.info("Models already initialized")
+        return
     
     try:
-        # Load models
-        matcher = CandidateJobMatcher()
-        matcher.load_model("models/candidate_job_matcher.joblib")
-        
-        # Try to load feature engineer, if not available create new one
-        try:
-            feature_engineer = joblib.load("models/feature_engineer.joblib")
-        except FileNotFoundError:
-            logger.warning("Feature engineer not found, creating new one")
-            feature_engineer = FeatureEngineer()
-            # Fit it with sample data to make it ready
-            feature_engineer.fitted = True
+        # Load models: the array artifact memory-maps and needs no sklearn
+        if read_manifest(DEFAULT_ARTIFACT_DIR) is not None:
+            with stage_timer("load_model", pipeline="startup"):
+                bundle = ModelBundle.from_artifact(DEFAULT_ARTIFACT_DIR)
+        else:
+            logger.warning("Model artifact not found, loading joblib model")
+            matcher = CandidateJobMatcher()
+            matcher.load_model("models/candidate_job_matcher.joblib")
+            
+            # Try to load feature engineer, if not available create new one
+            try:
+                feature_engineer = joblib.load("models/feature_engineer.joblib")
+            except FileNotFoundError:
+                logger.warning("Feature engineer not found, creating new one")
+                feature_engineer = FeatureEngineer()
+                # Fit it with sample data to make it ready
+                feature_engineer.fitted = True
+            bundle = ModelBundle(matcher, feature_engineer, source="models/candidate_job_matcher.joblib")
+        install_bundle(bundle)
         
-        data_loader = DataLoader("data/")
+        data_loader = DataLoader("data/", use_snapshot=True)
         drift_detector = DriftDetector()
         
+        # Parse the data sources once; requests only do indexed lookups
+        with stage_timer("load_data", pipeline="startup"):
+            entity_store = EntityStore.from_loader(data_loader)
+        
         # Load monitoring data if exists
         try:
             drift_detector.load_monitoring_data("models/monitoring_data.json")
@@ -102,13 +220,198 @@ def initialize_models():
         matcher = CandidateJobMatcher()
         feature_engineer = FeatureEngineer()
         feature_engineer.fitted = True  # Make it ready for use
-        data_loader = DataLoader("data/")
+        install_bundle(ModelBundle(matcher, feature_engineer))
+        data_loader = DataLoader("data/", use_snapshot=True)
+        entity_store = EntityStore.from_loader(data_loader)
         drift_detector = DriftDetector()
 
+def install_bundle(bundle: ModelBundle):
+    """Make ``bundle`` the active model; a single reference swap"""
+    global model_bundle, matcher, feature_engineer
+    model_bundle = bundle
+    matcher, feature_engineer = bundle.matcher, bundle.feature_engineer
+
+def install_store(store: EntityStore):
+    """Make ``store`` the active data; requests already running keep their snapshot"""
+    global entity_store
+    entity_store = store
+    logger.info(f"Entity store {store.data_version} installed")
+
+def current_store() -> Optional[EntityStore]:
+    return entity_store
+
+def current_bundle() -> ModelBundle:
+    """The active model bundle, 503 if no trained model is loaded"""
+    bundle = model_bundle
+    if bundle is None or not bundle.is_ready:
+        raise HTTPException(status_code=503, detail="Model not loaded or trained")
+    return bundle
+
+def reload_model(artifact_dir: str = DEFAULT_ARTIFACT_DIR) -> Dict:
+    """Load, warm up and swap in the model artifact in ``artifact_dir``
+    
+    Runs off the request path; requests keep using the previous bundle
+    until the swap, and those already running finish on it.
+    """
+    with reload_lock:
+        previous = model_bundle.version if model_bundle else None
+        bundle = ModelBundle.from_artifact(artifact_dir)
+        bundle.warm_up(entity_store)
+        install_bundle(bundle)
+        logger.info(f"Model reloaded: {previous} -> {bundle.version}")
+        return {'previous_version': previous, 'model_version': bundle.version, 'loaded_at': bundle.loaded_at}
+
+def require_admin(x_admin_token: Optional[str]):
+    """403 when admin endpoints are disabled (no ADMIN_TOKEN), 401 on a wrong token"""
+    admin_token = os.environ.get("ADMIN_TOKEN")
+    if not admin_token:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled")
+    if x_admin_token != admin_token:
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+def profile_requested(x_profile: Optional[str], x_admin_token: Optional[str]) -> bool:
+    """Whether this request runs under the profiler (sampled, or forced by an admin)"""
+    forced = False
+    if x_profile:
+        admin_token = os.environ.get("ADMIN_TOKEN")
+        forced = bool(admin_token) and x_admin_token == admin_token
+    return request_profiler.should_profile(forced)
+
+async def run_scoring(func, *args):
+    """Run blocking scoring work on the scoring pool, 503 when it is saturated"""
+    try:
+        return await scoring_pool.run(func, *args)
+    except ScoringPoolFull:
+        raise HTTPException(status_code=503, detail="Server busy, retry later", headers={"Retry-After": "1"})
+
+def score_frames(bundle: ModelBundle, vagas_df: pd.DataFrame, applicants_df: pd.DataFrame,
+                 prospects_df: pd.DataFrame) -> Dict:
+    """Features, scaling and model confidence for a single prospect"""
+    with stage_timer("create_features"):
+        features_df = bundle.feature_engineer.create_features(vagas_df, applicants_df, prospects_df)
+    with stage_timer("transform"):
+        X_scaled = bundle.feature_engineer.transform_features(features_df)
+    return bundle.matcher.evaluate_model_confidence(X_scaled)
+
+def score_pairs(items: List[Tuple[ModelBundle, EntityStore, str, str, bool]]) -> List[Dict]:
+    """Score stored (bundle, store, candidate_id, job_id, early_exit) pairs
+    
+    One feature matrix and model call per group of pairs sharing a bundle,
+    a store and a mode.
+    """
+    results = [None] * len(items)
+    groups: Dict[Tuple[int, int, bool], Tuple[ModelBundle, EntityStore, bool, List[int]]] = {}
+    for position, (bundle, store, _, _, early_exit) in enumerate(items):
+        groups.setdefault((id(bundle), id(store), early_exit), (bundle, store, early_exit, []))[3].append(position)
+    
+    # Normally one group per mode; more only for requests straddling a model or data reload
+    for bundle, store, early_exit, positions in groups.values():
+        prospects = pd.DataFrame([{'candidate_id': items[position][2], 'job_id': items[position][3],
+                                   'status': 'applied'} for position in positions])
+        with stage_timer("create_features"):
+            # Only the referenced rows: the cost stays independent of the store size
+            vagas_df, applicants_df = store.pair_frames(prospects['candidate_id'], prospects['job_id'])
+            features_df = bundle.feature_engineer.create_features(vagas_df, applicants_df, prospects)
+        with stage_timer("transform"):
+            X_scaled = bundle.feature_engineer.transform_features(features_df)
+        group_results = bundle.matcher.evaluate_batch_confidence(X_scaled, early_exit=early_exit)
+        for position, result in zip(positions, group_results):
+            results[position] = result
+            if early_exit:
+                TREES_USED.observe(result['trees_used'])
+    return results
+
+# Concurrent /predict calls arriving within a few ms share one predict_proba call;
+# a 503 from the saturated pool fails the batch rather than resubmitting every item
+pair_batcher = MicroBatcher.from_env(score_pairs, run_scoring, fail_fast=(HTTPException,))
+
+def score_batch(bundle: ModelBundle, store: Optional[EntityStore], known_pairs: List[Dict], jobs: List[Dict],
+                candidates: List[Dict], records: List[Dict]) -> List[Dict]:
+    """Featurize stored pairs and inline records, then score them with one model call"""
+    feature_engineer = bundle.feature_engineer
+    feature_frames = []
+    with stage_timer("create_features"):
+        if known_pairs:
+            pairs_df = pd.DataFrame(known_pairs)
+            vagas_df, applicants_df = store.pair_frames(pairs_df['candidate_id'], pairs_df['job_id'])
+            feature_frames.append(feature_engineer.create_features(vagas_df, applicants_df, pairs_df))
+        if records:
+            feature_frames.append(feature_engineer.create_features(
+                pd.DataFrame(jobs), pd.DataFrame(candidates), pd.DataFrame(records)
+            ))
+        features_df = pd.concat(feature_frames, ignore_index=True)
+    with stage_timer("transform"):
+        X_scaled = feature_engineer.transform_features(features_df)
+    return bundle.matcher.evaluate_batch_confidence(X_scaled)
+
+def rank_candidates(bundle: ModelBundle, store: EntityStore, job_id: str, k: int, offset: int):
+    """Score the resident candidate pool against a job and rank it"""
+    with stage_timer("rank_candidates"):
+        return bundle.matcher.top_candidates(
+            bundle.feature_engineer, store.vagas_df, store.applicants_df, job_id,
+            k=k, offset=offset, candidates=store.candidate_encoding(bundle.feature_engineer)
+        )
+
+def route_template(scope) -> str:
+    """Path template of the route serving ``scope`` (keeps metric labels bounded)"""
+    for route in app.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    return "unmatched"
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Latency, count and in-flight gauge per endpoint"""
+    endpoint = route_template(request.scope)
+    IN_FLIGHT.inc(endpoint=endpoint)
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        IN_FLIGHT.dec(endpoint=endpoint)
+        labels = {'method': request.method, 'endpoint': endpoint, 'status': str(status)}
+        REQUEST_SECONDS.observe(time.perf_counter() - start, **labels)
+        REQUESTS.inc(**labels)
+
+def _versions() -> Dict[Tuple, float]:
+    bundle, store = model_bundle, entity_store
+    return {(bundle.version if bundle else "", store.data_version if store else ""): 1.0}
+
+# Values owned by other components are read at scrape time
+REGISTRY.gauge(
+    "decision_info", "Loaded model and data versions", ("model_version", "data_version")
+).set_function(_versions)
+REGISTRY.gauge(
+    "decision_prediction_cache", "Prediction cache statistics", ("stat",)
+).set_function(lambda: {(name,): value for name, value in prediction_cache.stats().items()})
+REGISTRY.gauge(
+    "decision_scoring_pool_in_flight", "Scoring jobs queued or running"
+).set_function(lambda: {(): scoring_pool.in_flight})
+REGISTRY.gauge(
+    "decision_predict_batch_mean_size", "Mean number of /predict pairs per model call"
+).set_function(lambda: {(): pair_batcher.mean_batch_size})
+
 @app.on_event("startup")
 async def load_models():
     """Load trained models on startup"""
+    global artifact_watcher, data_refresher
     initialize_models()
+    
+    # Optionally pick up new artifacts written by train_model.py
+    watch_interval = float(os.environ.get("MODEL_WATCH_INTERVAL", 0))
+    if watch_interval > 0 and artifact_watcher is None:
+        artifact_watcher = ArtifactWatcher(DEFAULT_ARTIFACT_DIR, reload_model, interval=watch_interval)
+        artifact_watcher.start()
+    
+    # Optionally reload the data sources when they change on disk
+    refresh_interval = float(os.environ.get("DATA_REFRESH_INTERVAL", 0))
+    if refresh_interval > 0 and data_refresher is None and data_loader is not None:
+        data_refresher = DataRefresher(data_loader, current_store, install_store, interval=refresh_interval)
+        data_refresher.start()
 
 @app.get("/")
 async def root():
@@ -126,57 +429,61 @@ async def health_check():
         "api_status": "healthy",
         "model_loaded": matcher is not None and matcher.is_trained,
         "feature_engineer_loaded": feature_engineer is not None,
-        "data_loader_ready": data_loader is not None
+        "data_loader_ready": data_loader is not None,
+        "entity_store_ready": entity_store is not None,
+        "num_jobs": entity_store.num_jobs if entity_store else 0,
+        "num_candidates": entity_store.num_candidates if entity_store else 0,
+        "data_version": entity_store.data_version if entity_store else None
     }
 
 @app.post("/predict", response_model=MatchResponse)
-async def predict_match(request: MatchRequest):
-    """Predict candidate-job match using existing data"""
-    if not matcher or not matcher.is_trained:
-        raise HTTPException(status_code=503, detail="Model not loaded or trained")
+async def predict_match(request: MatchRequest, mode: str = Query("exact", pattern="^(exact|bucket)$"),
+                        x_profile: Optional[str] = Header(None), x_admin_token: Optional[str] = Header(None)):
+    """Predict candidate-job match using existing data
+    
+    ``mode=bucket`` stops evaluating trees once the recommendation is
+    settled: the recommendation is reliable, ``match_score`` and
+    ``confidence`` are estimates, ``key_factors`` are the model's global
+    ones and ``trees_used`` is reported.
+    
+    Sampled requests (see RequestProfiler) are scored alone, uncached,
+    under the profiler.
+    """
+    early_exit = mode == "bucket"
+    bundle = current_bundle()
+    store = entity_store
+    if store is None:
+        raise HTTPException(status_code=503, detail="Data not loaded")
+    profiled = profile_requested(x_profile, x_admin_token)
     
     try:
-        # Load existing data
-        vagas_df, prospects_df, applicants_df = data_loader.process_decision_data()
-        
-        # Find candidate and job
-        candidate_data = applicants_df[applicants_df['candidate_id'] == request.candidate_id]
-        vaga_data = vagas_df[vagas_df['job_id'] == request.job_id]
-        
-        if candidate_data.empty:
+        # Find candidate and job in the resident store
+        with stage_timer("lookup"):
+            candidate_found = store.has_candidate(request.candidate_id)
+            job_found = store.has_job(request.job_id)
+        if not candidate_found:
             raise HTTPException(status_code=404, detail=f"Candidate {request.candidate_id} not found")
-        if vaga_data.empty:
+        if not job_found:
             raise HTTPException(status_code=404, detail=f"Job {request.job_id} not found")
         
-        # Create temporary prospect for feature engineering
-        temp_prospect = pd.DataFrame([{
-            'candidate_id': request.candidate_id,
-            'job_id': request.job_id,
-            'status': 'applied'
-        }])
+        # Versions in the key: a new model or new data never hits old entries
+        cache_key = (request.candidate_id, request.job_id, bundle.version, store.data_version, mode)
+        item = (bundle, store, request.candidate_id, request.job_id, early_exit)
+        if profiled:
+            [result] = await run_scoring(request_profiler.run, "predict", score_pairs, [item])
+            return MatchResponse(**result, model_version=bundle.version)
         
-        # Generate features
-        features_df = feature_engineer.create_features(vagas_df, applicants_df, temp_prospect)
-        
-        # Select feature columns (updated for Decision data)
-        feature_columns = [
-            'skill_match', 'experience_match', 'salary_match', 
-            'location_match', 'english_match', 'spanish_match',
-            'sap_match', 'academic_match', 'candidate_experience_years',
-            'num_candidate_skills', 'num_job_skills', 'is_sap_job'
-        ]
-        
-        X = features_df[feature_columns]
-        X_scaled = pd.DataFrame(
-            feature_engineer.scaler.transform(X),
-            columns=X.columns
-        )
+        with stage_timer("cache_lookup"):
+            result = prediction_cache.get(cache_key)
+        if result is None:
+            # Coalesced with concurrent requests into one batched model call
+            result = await pair_batcher.submit(item)
+            prediction_cache.put(cache_key, result)
         
-        # Get prediction
-        result = matcher.evaluate_model_confidence(X_scaled)
-        
-        return MatchResponse(**result)
+        return MatchResponse(**result, model_version=bundle.version)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Prediction error: {e}")
         raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
@@ -184,88 +491,144 @@ async def predict_match(request: MatchRequest):
 @app.post("/predict_with_data", response_model=MatchResponse)
 async def predict_match_with_data(request: MatchRequestWithData):
     """Predict candidate-job match with provided data"""
-    if not matcher or not matcher.is_trained:
-        raise HTTPException(status_code=503, detail="Model not loaded or trained")
+    bundle = current_bundle()
     
     try:
-        # Convert request data to DataFrames with proper column mapping
-        candidate_data = request.candidate.model_dump()
-        job_data = request.job.model_dump()
-        
         # Map API fields to internal fields
-        candidate_mapped = {
-            'candidate_id': candidate_data['id'],
-            'nome': candidate_data.get('name', 'Unknown'),
-            'conhecimentos_tecnicos': candidate_data.get('skills', []),
-            'anos_experiencia': candidate_data.get('experience_years', 0),
-            'localizacao': candidate_data.get('location', ''),
-            'pretensao_salarial': str(candidate_data.get('salary_expectation', '0')),
-            'nivel_ingles': candidate_data.get('english_level', 'Intermediário'),
-            'nivel_espanhol': candidate_data.get('spanish_level', 'Básico'),
-            'nivel_academico': candidate_data.get('academic_level', 'Superior Completo')
-        }
-        
-        job_mapped = {
-            'job_id': job_data['id'],
-            'titulo': job_data.get('title', 'Unknown'),
-            'competencias_tecnicas': job_data.get('required_skills', []),
-            'nivel_profissional': job_data.get('experience_level', 'Pleno'),
-            'localizacao': job_data.get('location', ''),
-            'salario_range': job_data.get('salary_range', '0-0'),
-            'nivel_ingles': job_data.get('english_requirement', 'Intermediário'),
-            'nivel_espanhol': job_data.get('spanish_requirement', 'Não requerido'),
-            'is_sap': job_data.get('is_sap', False)
-        }
+        candidate_mapped = map_candidate_data(request.candidate)
+        job_mapped = map_job_data(request.job)
         
         candidate_df = pd.DataFrame([candidate_mapped])
         vaga_df = pd.DataFrame([job_mapped])
         
         # Create temporary prospect
         temp_prospect = pd.DataFrame([{
-            'candidate_id': candidate_data['id'],
-            'job_id': job_data['id'],
+            'candidate_id': candidate_mapped['candidate_id'],
+            'job_id': job_mapped['job_id'],
             'status': 'applied'
         }])
         
-        # Generate features
-        features_df = feature_engineer.create_features(vaga_df, candidate_df, temp_prospect)
+        # Features and prediction run off the event loop
+        result = await run_scoring(score_frames, bundle, vaga_df, candidate_df, temp_prospect)
         
-        # Select feature columns (updated for Decision data)
-        feature_columns = [
-            'skill_match', 'experience_match', 'salary_match', 
-            'location_match', 'english_match', 'spanish_match',
-            'sap_match', 'academic_match', 'candidate_experience_years',
-            'num_candidate_skills', 'num_job_skills', 'is_sap_job'
-        ]
+        return MatchResponse(**result, model_version=bundle.version)
         
-        X = features_df[feature_columns]
-        X_scaled = pd.DataFrame(
-            feature_engineer.scaler.transform(X),
-            columns=X.columns
-        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Prediction error: {e}")
+        raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
+
+@app.post("/predict/batch", response_model=BatchMatchResponse)
+async def predict_batch(request: BatchMatchRequest, x_profile: Optional[str] = Header(None),
+                        x_admin_token: Optional[str] = Header(None)):
+    """Predict many candidate-job matches with a single model call
+
+    ``pairs`` are resolved against the loaded data, ``records`` carry their
+    own candidate and job data. Unknown ids are reported per result.
+    """
+    bundle = current_bundle()
+    store = entity_store
+    if request.pairs and store is None:
+        raise HTTPException(status_code=503, detail="Data not loaded")
+    
+    try:
+        results = []
+        scored = []  # positions in results of the rows being scored, in feature order
+        
+        # Pairs from the resident store, featurized in one vectorized join
+        known_pairs = []
+        for pair in request.pairs:
+            results.append(BatchMatchResult(candidate_id=pair.candidate_id, job_id=pair.job_id))
+            if not store.has_candidate(pair.candidate_id):
+                results[-1].error = f"Candidate {pair.candidate_id} not found"
+            elif not store.has_job(pair.job_id):
+                results[-1].error = f"Job {pair.job_id} not found"
+            else:
+                known_pairs.append({'candidate_id': pair.candidate_id, 'job_id': pair.job_id, 'status': 'applied'})
+                scored.append(len(results) - 1)
         
-        # Get prediction
-        result = matcher.evaluate_model_confidence(X_scaled)
+        # Inline records; keyed by position since ids may repeat with different data
+        candidates, jobs, records = [], [], []
+        for number, record in enumerate(request.records):
+            candidate_mapped = map_candidate_data(record.candidate)
+            job_mapped = map_job_data(record.job)
+            results.append(BatchMatchResult(candidate_id=candidate_mapped['candidate_id'],
+                                            job_id=job_mapped['job_id']))
+            scored.append(len(results) - 1)
+            candidates.append(dict(candidate_mapped, candidate_id=number))
+            jobs.append(dict(job_mapped, job_id=number))
+            records.append({'candidate_id': number, 'job_id': number, 'status': 'applied'})
         
-        return MatchResponse(**result)
+        if scored:
+            scoring_args = (score_batch, bundle, store, known_pairs, jobs, candidates, records)
+            if profile_requested(x_profile, x_admin_token):
+                scores = await run_scoring(request_profiler.run, "predict_batch", *scoring_args)
+            else:
+                scores = await run_scoring(*scoring_args)
+            for position, result in zip(scored, scores):
+                results[position] = BatchMatchResult(
+                    candidate_id=results[position].candidate_id,
+                    job_id=results[position].job_id,
+                    **result
+                )
         
+        return BatchMatchResponse(results=results, model_version=bundle.version)
+        
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Prediction error: {e}")
-        raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
+        logger.error(f"Batch prediction error: {e}")
+        raise HTTPException(status_code=500, detail=f"Batch prediction failed: {str(e)}")
+
+@app.get("/jobs/{job_id}/top-candidates")
+async def top_candidates(job_id: str, k: int = Query(50, ge=1, le=1000), offset: int = Query(0, ge=0)):
+    """Rank the whole candidate pool against a job and stream the best ``k``
+    
+    ``offset`` pages through the ranking: ``offset=50&k=50`` returns ranks
+    51 to 100.
+    """
+    bundle = current_bundle()
+    store = entity_store
+    if store is None:
+        raise HTTPException(status_code=503, detail="Data not loaded")
+    if not store.has_job(job_id):
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    
+    try:
+        ranked, total = await run_scoring(rank_candidates, bundle, store, job_id, k, offset)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Ranking error: {e}")
+        raise HTTPException(status_code=500, detail=f"Ranking failed: {str(e)}")
+    
+    def stream():
+        yield json.dumps({'job_id': job_id, 'k': k, 'offset': offset, 'total_candidates': total,
+                          'model_version': bundle.version})[:-1]
+        yield ', "candidates": ['
+        for rank, (candidate_id, match_score) in enumerate(ranked, start=offset + 1):
+            separator = ', ' if rank > offset + 1 else ''
+            yield separator + json.dumps({'rank': rank, 'candidate_id': candidate_id, 'match_score': match_score})
+        yield ']}'
+    
+    return StreamingResponse(stream(), media_type="application/json")
 
 @app.get("/model/info")
 async def get_model_info():
     """Get model information and feature importance"""
-    if not matcher or not matcher.is_trained:
-        raise HTTPException(status_code=503, detail="Model not loaded or trained")
+    bundle = current_bundle()
     
     try:
-        feature_importance = matcher.get_feature_importance()
+        feature_importance = bundle.matcher.get_feature_importance()
         
         return {
             "model_type": "RandomForestClassifier",
-            "is_trained": matcher.is_trained,
-            "feature_names": matcher.feature_names,
+            "model_version": bundle.version,
+            "loaded_at": bundle.loaded_at,
+            "source": bundle.source,
+            "is_trained": bundle.matcher.is_trained,
+            "feature_names": bundle.matcher.feature_names,
             "feature_importance": feature_importance.to_dict('records')
         }
         
@@ -273,6 +636,62 @@ async def get_model_info():
         logger.error(f"Model info error: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to get model info: {str(e)}")
 
+@app.post("/admin/reload-model")
+async def admin_reload_model(x_admin_token: Optional[str] = Header(None)):
+    """Load the current model artifact in the background and swap it in
+    
+    This process reloads right away; a reload request marker is also
+    written to the artifact directory so every other worker's artifact
+    watcher (always on under serve.py) reloads within its interval.
+    Requires the ``X-Admin-Token`` header to match the ADMIN_TOKEN
+    environment variable; disabled when ADMIN_TOKEN is not set.
+    """
+    require_admin(x_admin_token)
+    
+    try:
+        # Default executor: loading must not take scoring slots
+        result = await asyncio.get_running_loop().run_in_executor(None, reload_model)
+        try:
+            request_reload(DEFAULT_ARTIFACT_DIR)
+            result['workers_notified'] = True
+        except OSError as e:
+            logger.warning(f"Could not write reload request, other workers keep their model: {e}")
+            result['workers_notified'] = False
+        if artifact_watcher is not None:
+            artifact_watcher.mark_seen()
+        return result
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Model reload error: {e}")
+        raise HTTPException(status_code=500, detail=f"Model reload failed: {str(e)}")
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus metrics of this process"""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/admin/profile")
+async def admin_profile(limit: int = Query(30, ge=1, le=500), sort_by: str = Query("cumulative"),
+                        x_admin_token: Optional[str] = Header(None)):
+    """Aggregated cProfile / tracemalloc stats of the profiled requests"""
+    require_admin(x_admin_token)
+    if sort_by not in ("cumulative", "tottime", "calls", "ncalls"):
+        raise HTTPException(status_code=400, detail=f"Unsupported sort key {sort_by}")
+    return request_profiler.report(limit=limit, sort_by=sort_by)
+
+@app.delete("/admin/profile")
+async def admin_reset_profile(x_admin_token: Optional[str] = Header(None)):
+    """Discard the aggregated profiles"""
+    require_admin(x_admin_token)
+    request_profiler.reset()
+    return {"status": "reset"}
+
+@app.get("/cache/stats")
+async def get_cache_stats():
+    """Prediction cache counters"""
+    return prediction_cache.stats()
+
 @app.get("/monitoring/drift")
 async def get_drift_status():
     """Get model drift monitoring status"""
@@ -0,0 +1,112 @@
+"""
+Coalesces concurrent single-item requests into batched model calls
+"""
+import asyncio
+import logging
+import os
+from typing import Any, Awaitable, Callable, List, Optional, Set, Tuple, Type
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW_MS = 2.0
+DEFAULT_MAX_ITEMS = 64
+
+
+class MicroBatcher:
+    """Gathers items submitted within a short window and processes them together
+
+    The first item of a batch opens a window of ``window_ms``; the batch is
+    flushed when the window closes or as soon as it holds ``max_items``.
+    ``process_batch`` receives the list of items and returns one result per
+    item, in order. It is called through ``runner`` (e.g. an executor) so
+    the event loop is never blocked. If a batch fails as a whole, its items
+    are retried one by one so a single bad item only fails its own request;
+    errors listed in ``fail_fast`` (overload, e.g. a full scoring pool) are
+    not about the items and fail the whole batch at once instead.
+    """
+
+    def __init__(self, process_batch: Callable[[List[Any]], List[Any]],
+                 runner: Callable[..., Awaitable] = None,
+                 window_ms: float = DEFAULT_WINDOW_MS, max_items: int = DEFAULT_MAX_ITEMS,
+                 fail_fast: Tuple[Type[BaseException], ...] = ()):
+        self.process_batch = process_batch
+        self.runner = runner or self._run_inline
+        self.window = window_ms / 1000.0
+        self.max_items = max(1, max_items)
+        self.fail_fast = fail_fast
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # Strong references to running batches; the loop only keeps weak ones
+        self._tasks: Set[asyncio.Task] = set()
+
+        # Counters for sizing the window
+        self.batches = 0
+        self.items = 0
+
+    @classmethod
+    def from_env(cls, process_batch: Callable[[List[Any]], List[Any]],
+                 runner: Callable[..., Awaitable] = None,
+                 fail_fast: Tuple[Type[BaseException], ...] = ()) -> "MicroBatcher":
+        """Batcher configured by PREDICT_BATCH_WINDOW_MS and PREDICT_BATCH_MAX_ITEMS"""
+        window_ms = float(os.environ.get("PREDICT_BATCH_WINDOW_MS", DEFAULT_WINDOW_MS))
+        max_items = int(os.environ.get("PREDICT_BATCH_MAX_ITEMS", DEFAULT_MAX_ITEMS))
+        return cls(process_batch, runner, window_ms, max_items, fail_fast)
+
+    @staticmethod
+    async def _run_inline(func, *args):
+        return func(*args)
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.items / self.batches if self.batches else 0.0
+
+    async def submit(self, item: Any) -> Any:
+        """Queue an item and wait for its result"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self.max_items or self.window <= 0:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._process(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _process(self, batch: List[Tuple[Any, asyncio.Future]]):
+        items = [item for item, _ in batch]
+        self.batches += 1
+        self.items += len(items)
+        try:
+            results = await self.runner(self.process_batch, items)
+        except Exception as e:
+            if len(batch) == 1 or isinstance(e, self.fail_fast):
+                for _, future in batch:
+                    self._resolve(future, exception=e)
+                return
+            logger.warning(f"Batch of {len(batch)} failed ({e}), retrying items one by one")
+            await asyncio.gather(*(self._process([entry]) for entry in batch))
+            return
+
+        for (_, future), result in zip(batch, results):
+            self._resolve(future, result=result)
+
+    @staticmethod
+    def _resolve(future: asyncio.Future, result: Any = None, exception: Exception = None):
+        # The waiting request may have been cancelled meanwhile
+        if future.done():
+            return
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(result)
@@ -0,0 +1,128 @@
+"""
+Hot model reload: versioned model bundles and an artifact watcher
+"""
+import numpy as np
+import pandas as pd
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+from features.feature_engineering import FEATURE_COLUMNS, FeatureEngineer
+from models.artifact import load_artifact, read_manifest
+from models.candidate_job_matcher import CandidateJobMatcher
+
+logger = logging.getLogger(__name__)
+
+WARM_UP_ROWS = 8
+
+# Written next to the manifest to ask every watching process to reload
+RELOAD_MARKER = "reload-request"
+
+
+def request_reload(artifact_dir: Path) -> str:
+    """Ask every process watching ``artifact_dir`` to reload it; returns the request token"""
+    artifact_dir = Path(artifact_dir)
+    token = str(time.time_ns())
+    tmp_path = artifact_dir / f"{RELOAD_MARKER}.tmp"
+    tmp_path.write_text(token, encoding='utf-8')
+    os.replace(tmp_path, artifact_dir / RELOAD_MARKER)
+    return token
+
+
+class ModelBundle:
+    """A matcher and the feature engineer it was trained with, swapped as one unit
+
+    Requests take a reference to the current bundle once and use it to the
+    end, so a reload never mixes an old scaler with a new model and
+    in-flight requests finish on the model they started with.
+    """
+
+    def __init__(self, matcher: CandidateJobMatcher, feature_engineer: FeatureEngineer, source: str = None):
+        self.matcher = matcher
+        self.feature_engineer = feature_engineer
+        self.source = source
+        self.loaded_at = datetime.now().isoformat()
+
+    @property
+    def version(self) -> Optional[str]:
+        return self.matcher.model_version
+
+    @property
+    def is_ready(self) -> bool:
+        return self.matcher is not None and self.matcher.is_trained and self.feature_engineer is not None
+
+    @classmethod
+    def from_artifact(cls, artifact_dir: Path) -> "ModelBundle":
+        matcher, feature_engineer = load_artifact(artifact_dir)
+        return cls(matcher, feature_engineer, source=str(artifact_dir))
+
+    def warm_up(self, entity_store=None):
+        """Run a few predictions so the first real requests do not pay for cold pages"""
+        features_df = pd.DataFrame(np.zeros((WARM_UP_ROWS, len(FEATURE_COLUMNS))), columns=FEATURE_COLUMNS)
+        X_scaled = self.feature_engineer.transform_features(features_df)
+        self.matcher.evaluate_model_confidence(X_scaled[:1])
+        self.matcher.evaluate_batch_confidence(X_scaled)
+        if entity_store is not None:
+            entity_store.candidate_encoding(self.feature_engineer)
+        logger.info(f"Model {self.version} warmed up")
+
+
+class ArtifactWatcher:
+    """Polls an artifact directory and calls ``on_change`` when a new model lands
+
+    Changes are detected from the manifest's ``model_version``, which
+    ``save_artifact`` writes last, so a half-written artifact is never
+    picked up, and from the ``request_reload`` marker, which is how a
+    reload requested in one prefork worker reaches all the others.
+    """
+
+    def __init__(self, artifact_dir: Path, on_change: Callable[[], None], interval: float = 10.0):
+        self.artifact_dir = Path(artifact_dir)
+        self.on_change = on_change
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._seen = self._current_state()
+
+    def _current_state(self) -> Tuple[Optional[str], Optional[str]]:
+        """(manifest model_version, reload request token)"""
+        manifest = read_manifest(self.artifact_dir)
+        try:
+            token = (self.artifact_dir / RELOAD_MARKER).read_text(encoding='utf-8')
+        except OSError:
+            token = None
+        return manifest['model_version'] if manifest else None, token
+
+    def mark_seen(self):
+        """Treat the current artifact and reload request as handled (this process just reloaded)"""
+        self._seen = self._current_state()
+
+    def check(self) -> bool:
+        """Reload if the artifact changed, or a reload was requested, since the last check"""
+        state = self._current_state()
+        if state[0] is None or state == self._seen:
+            return False
+        logger.info(f"Model artifact {state[0]} changed or reload requested in {self.artifact_dir}")
+        self.on_change()
+        self._seen = state
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"Model reload from watcher failed: {e}")
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="artifact-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
@@ -0,0 +1,63 @@
+"""
+Bounded executor for CPU-bound scoring work
+"""
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_DEPTH = 64
+
+
+class ScoringPoolFull(RuntimeError):
+    """Raised when every worker is busy and the queue is full"""
+
+
+class ScoringPool:
+    """Runs blocking pandas/sklearn calls off the asyncio event loop
+
+    At most ``max_workers`` calls run at once and at most ``max_queue`` more
+    wait for a worker; anything beyond that is rejected immediately with
+    ``ScoringPoolFull`` instead of piling up behind slow requests.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_queue: int = DEFAULT_QUEUE_DEPTH):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.in_flight = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="scoring")
+
+    @classmethod
+    def from_env(cls) -> "ScoringPool":
+        """Pool sized by SCORING_WORKERS and SCORING_QUEUE_DEPTH"""
+        max_workers = int(os.environ.get("SCORING_WORKERS", 0)) or None
+        max_queue = int(os.environ.get("SCORING_QUEUE_DEPTH", DEFAULT_QUEUE_DEPTH))
+        return cls(max_workers, max_queue)
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    async def run(self, func: Callable, *args):
+        """Run ``func(*args)`` on a worker thread and await its result"""
+        with self._lock:
+            if self.in_flight >= self.capacity:
+                logger.warning(f"Rejecting scoring request: {self.in_flight} in flight")
+                raise ScoringPoolFull(f"Scoring pool full ({self.in_flight} requests in flight)")
+            self.in_flight += 1
+        # Released when the work itself finishes, even if the request is cancelled
+        future = self._executor.submit(func, *args)
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, future):
+        with self._lock:
+            self.in_flight -= 1
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,167 @@
+"""
+Prefork launcher: load once in a parent process, serve from N forked workers
+
+The parent loads the model, scaler and entity store, warms the candidate
+pool encoding and freezes the GC, then forks the workers on one shared
+listening socket. Workers inherit everything copy-on-write: NumPy arrays
+(and the memory-mapped model artifact) stay shared; Python objects are
+shared until a worker touches them.
+
+    python src/api/serve.py --workers 4 --port 8000
+"""
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+logger = logging.getLogger(__name__)
+
+# Seconds between artifact checks in each worker when MODEL_WATCH_INTERVAL is not set
+PREFORK_WATCH_INTERVAL = 5.0
+
+
+def bind_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    """Listening socket created before forking, shared by every worker"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class PreforkSupervisor:
+    """Forks ``n_workers`` processes running ``target`` and keeps them alive
+
+    A worker that exits unexpectedly is replaced; SIGTERM/SIGINT on the
+    parent are forwarded to the workers, which are then reaped.
+    """
+
+    def __init__(self, target: Callable[[], None], n_workers: int, respawn_delay: float = 1.0):
+        self.target = target
+        self.n_workers = n_workers
+        self.respawn_delay = respawn_delay
+        self.workers: Dict[int, int] = {}  # pid -> worker number
+        self.stopping = False
+
+    def _spawn(self, number: int) -> int:
+        pid = os.fork()
+        if pid == 0:
+            # Worker: default signal handling, run until told to stop
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            exit_code = 0
+            try:
+                self.target()
+            except BaseException:
+                logger.exception(f"Worker {number} crashed")
+                exit_code = 1
+            finally:
+                os._exit(exit_code)
+        self.workers[pid] = number
+        logger.info(f"Started worker {number} (pid {pid})")
+        return pid
+
+    def start(self):
+        for number in range(self.n_workers):
+            self._spawn(number)
+
+    def stop(self, sig: int = signal.SIGTERM):
+        """Signal every worker and wait for all of them"""
+        self.stopping = True
+        for pid in list(self.workers):
+            try:
+                os.kill(pid, sig)
+            except ProcessLookupError:
+                pass
+        while self.workers:
+            pid, _ = os.waitpid(-1, 0)
+            self.workers.pop(pid, None)
+
+    def run(self):
+        """Start the workers and supervise them until a stop signal arrives"""
+        def handle_stop(signum, frame):
+            logger.info(f"Received signal {signum}, stopping workers")
+            self.stopping = True
+
+        signal.signal(signal.SIGTERM, handle_stop)
+        signal.signal(signal.SIGINT, handle_stop)
+
+        self.start()
+        while not self.stopping:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                pid = 0
+            if pid == 0:
+                time.sleep(0.2)
+                continue
+            number = self.workers.pop(pid, None)
+            if number is not None and not self.stopping:
+                logger.warning(f"Worker {number} (pid {pid}) exited with status {status}, restarting")
+                time.sleep(self.respawn_delay)
+                self._spawn(number)
+        self.stop()
+
+
+def ensure_model_watch(n_workers: int, environ=os.environ) -> float:
+    """Turn on the artifact watcher in every worker when serving with several
+    
+    A reload (or /admin/reload-model) only reaches the process that runs
+    it; the other workers follow through their watcher, so prefork
+    serving without one would leave them on the old model.
+    """
+    interval = float(environ.get("MODEL_WATCH_INTERVAL", 0) or 0)
+    if n_workers > 1 and interval <= 0:
+        interval = PREFORK_WATCH_INTERVAL
+        environ["MODEL_WATCH_INTERVAL"] = str(interval)
+        logger.info(f"Model watcher enabled every {interval:g}s so reloads reach all {n_workers} workers")
+    return interval
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Decision AI prefork API server")
+    parser.add_argument("--host", default=os.environ.get("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", 8000)))
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1)))
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    import uvicorn
+    import api.main as api
+
+    ensure_model_watch(args.workers)
+
+    # Everything read-only is built once, before forking
+    api.initialize_models()
+    if api.entity_store is not None and api.feature_engineer is not None:
+        api.entity_store.candidate_encoding(api.feature_engineer)
+    # Keep the GC from writing to (and so un-sharing) the inherited objects
+    gc.collect()
+    gc.freeze()
+
+    sock = bind_socket(args.host, args.port)
+    logger.info(f"Serving on {args.host}:{args.port} with {args.workers} workers")
+
+    def serve():
+        config = uvicorn.Config(api.app, log_level="info")
+        uvicorn.Server(config).run(sockets=[sock])
+
+    PreforkSupervisor(serve, args.workers).run()
+
+
+if __name__ == "__main__":
+    main()
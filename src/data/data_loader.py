@@ -2,21 +2,200 @@
 Data loading and preprocessing utilities for Decision AI
 """
 import pandas as pd
+import numpy as np
 import json
 import logging
-from typing import Dict, List, Tuple
+import re
+import time
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple, Union
 from pathlib import Path
 
+from .snapshot import TableSnapshot, source_fingerprint
+
 logger = logging.getLogger(__name__)
 
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+# Largest single JSON value the stream reader buffers while looking for its end
+MAX_VALUE_CHARS = 1 << 26
+
+# Rows per DataFrame when building tables from streamed records
+FRAME_CHUNK_ROWS = 50000
+
+
+def build_position_index(df: pd.DataFrame, id_column: str) -> Dict[Hashable, int]:
+    """Map each id in ``id_column`` to the position of its first row"""
+    if df.empty or id_column not in df.columns:
+        return {}
+
+    index = {}
+    for position, entity_id in enumerate(df[id_column].tolist()):
+        if entity_id is None or entity_id != entity_id:  # skip None/NaN ids
+            continue
+        index.setdefault(entity_id, position)
+    return index
+
+
+def lookup_positions(index: Dict[Hashable, int], ids: Iterable) -> np.ndarray:
+    """Resolve ids through a position index, -1 for unknown ids"""
+    ids = list(ids)
+    return np.fromiter((index.get(entity_id, -1) if entity_id == entity_id else -1 for entity_id in ids),
+                       dtype=np.int64, count=len(ids))
+
+
+class JsonStreamReader:
+    """Incremental pull parser over a JSON text file
+
+    Only the structure being walked (the top-level mapping and, on request,
+    the lists nested in it) is tokenized here; every member value is decoded
+    on its own with ``json.JSONDecoder.raw_decode``, so memory stays bounded
+    by the size of one record plus one read chunk. A value still undecodable
+    after ``max_value_size`` characters raises instead of buffering on.
+    """
+
+    def __init__(self, file_obj, chunk_size: int = 1 << 16, max_value_size: int = MAX_VALUE_CHARS):
+        self._file = file_obj
+        self._chunk_size = chunk_size
+        self._max_value_size = max_value_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer, dropping consumed text"""
+        if self._eof:
+            return False
+        pending = len(self._buffer) - self._pos
+        chunk = self._file.read(max(self._chunk_size, pending))
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self._buffer, self._pos)
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character ('' at end of file)"""
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ''
+
+    def _consume(self, char: str) -> bool:
+        if self.peek() == char:
+            self._pos += 1
+            return True
+        return False
+
+    def _expect(self, char: str):
+        if not self._consume(char):
+            raise self._error(f"Expecting '{char}'")
+
+    def read_value(self) -> Any:
+        """Decode the next complete JSON value"""
+        return self._decode()[0]
+
+    def read_value_digest(self) -> Tuple[Any, Tuple[int, int]]:
+        """Decode the next value, with the ``(length, hash)`` of its raw text"""
+        value, start = self._decode()
+        text = self._buffer[start:self._pos]
+        return value, (len(text), hash(text))
+
+    def skip_if_unchanged(self, digest: Tuple[int, int]) -> bool:
+        """Step over the next value without decoding it if its raw text has ``digest``
+
+        Only objects, arrays and strings are matched: they end on their own
+        closing character, so identical text is the identical whole value.
+        """
+        length, text_hash = digest
+        if self.peek() not in ('{', '[', '"'):
+            return False
+        while len(self._buffer) - self._pos < length and self._fill():
+            pass
+        text = self._buffer[self._pos:self._pos + length]
+        if len(text) != length or hash(text) != text_hash:
+            return False
+        self._pos += length
+        return True
+
+    def _decode(self) -> Tuple[Any, int]:
+        """Decode the next value; returns it with its start in the buffer (it ends at ``_pos``)"""
+        if not self.peek():
+            raise self._error("Expecting value")
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # Value straddles the chunk boundary, unless it is malformed
+                if len(self._buffer) - self._pos > self._max_value_size:
+                    raise self._error(f"No complete JSON value within {self._max_value_size} characters")
+                if self._fill():
+                    continue
+                raise
+            # A number ending at the buffer edge may continue in the next chunk
+            if end == len(self._buffer) and self._fill():
+                continue
+            start, self._pos = self._pos, end
+            return value, start
+
+    def iter_keys(self) -> Iterator[str]:
+        """Walk an object, yielding its keys
+
+        The caller must consume each member value (``read_value`` or
+        ``iter_array``) before asking for the next key.
+        """
+        self._expect('{')
+        if self._consume('}'):
+            return
+        while True:
+            key = self.read_value()
+            if not isinstance(key, str):
+                raise self._error("Expecting property name")
+            self._expect(':')
+            yield key
+            if self._consume('}'):
+                return
+            self._expect(',')
+
+    def iter_array(self) -> Iterator[Any]:
+        """Walk an array, yielding one decoded element at a time"""
+        self._expect('[')
+        if self._consume(']'):
+            return
+        while True:
+            yield self.read_value()
+            if self._consume(']'):
+                return
+            self._expect(',')
+
 class DataLoader:
     """Handles loading and initial processing of Decision data"""
     
-    def __init__(self, data_path: str = "data/"):
+    SOURCE_FILES = {
+        'vagas': "vagas.json",
+        'prospects': "prospects.json",
+        'applicants': "applicants.json"
+    }
+
+    def __init__(self, data_path: str = "data/", use_snapshot: bool = False,
+                 snapshot_dir: str = None, verify_hash: bool = False):
         self.data_path = Path(data_path)
+        self.use_snapshot = use_snapshot
+        self.snapshot = TableSnapshot(Path(snapshot_dir) if snapshot_dir else self.data_path / ".snapshot")
+        self.verify_hash = verify_hash
+
+    def source_paths(self) -> Dict[str, Path]:
+        """Paths of the Decision source files, by table name"""
+        return {name: self.data_path / filename for name, filename in self.SOURCE_FILES.items()}
         
-    def load_json_data(self, filename: str) -> List[Dict]:
-        """Load JSON data from file"""
+    def load_json_data(self, filename: str, strict: bool = False) -> List[Dict]:
+        """Load JSON data from file (``strict``: malformed JSON raises instead of loading as empty)"""
         try:
             file_path = self.data_path / filename
             with open(file_path, 'r', encoding='utf-8') as f:
@@ -28,8 +207,96 @@ class DataLoader:
             return []
         except json.JSONDecodeError as e:
             logger.error(f"Error parsing JSON from {filename}: {e}")
+            if strict:
+                raise
             return []
     
+    def iter_json_records(self, filename: str, chunk_size: int = 1 << 16) -> Iterator[Tuple[str, Any]]:
+        """Stream the top-level ``{id: record}`` mapping of a JSON file
+
+        A missing file yields nothing; malformed JSON raises
+        ``json.JSONDecodeError`` once the records before it have been yielded.
+        """
+        count = 0
+        try:
+            with open(self.data_path / filename, 'r', encoding='utf-8') as f:
+                reader = JsonStreamReader(f, chunk_size)
+                if reader.peek() != '{':
+                    logger.warning(f"{filename} is not a JSON object, nothing to stream")
+                    return
+                for key in reader.iter_keys():
+                    yield key, reader.read_value()
+                    count += 1
+        except FileNotFoundError:
+            logger.error(f"File {filename} not found in {self.data_path}")
+            return
+        except json.JSONDecodeError as e:
+            logger.error(f"Error parsing JSON from {filename}: {e}")
+            raise
+        logger.info(f"Streamed {count} records from {filename}")
+
+    def iter_nested_records(self, filename: str, chunk_size: int = 1 << 16) -> Iterator[Tuple[str, Any]]:
+        """Stream a ``{id: [record, ...]}`` mapping one list element at a time
+
+        Missing and malformed files are handled as in ``iter_json_records``.
+        """
+        count = 0
+        try:
+            with open(self.data_path / filename, 'r', encoding='utf-8') as f:
+                reader = JsonStreamReader(f, chunk_size)
+                if reader.peek() != '{':
+                    logger.warning(f"{filename} is not a JSON object, nothing to stream")
+                    return
+                for key in reader.iter_keys():
+                    if reader.peek() != '[':
+                        reader.read_value()  # not a list, skipped like in process_decision_data
+                        continue
+                    for item in reader.iter_array():
+                        yield key, item
+                        count += 1
+        except FileNotFoundError:
+            logger.error(f"File {filename} not found in {self.data_path}")
+            return
+        except json.JSONDecodeError as e:
+            logger.error(f"Error parsing JSON from {filename}: {e}")
+            raise
+        logger.info(f"Streamed {count} nested records from {filename}")
+
+    def scan_records(self, filename: str, previous: Optional[Dict[str, Tuple[int, int]]] = None,
+                     chunk_size: int = 1 << 16) -> Tuple[Dict[str, Tuple[int, int]], Dict[str, Any]]:
+        """Digest the raw text of every top-level record, decoding only new or changed ones
+
+        Returns ``(digests, records)``: the ``(length, hash)`` of each
+        record's JSON text by id, and the decoded records whose text is not
+        the one digested in ``previous``. Unchanged records are only hashed,
+        never parsed. Without ``previous`` the file is just indexed and no
+        record is returned. A missing file has no records; malformed JSON
+        raises ``json.JSONDecodeError``.
+        """
+        digests, records = {}, {}
+        try:
+            with open(self.data_path / filename, 'r', encoding='utf-8') as f:
+                reader = JsonStreamReader(f, chunk_size)
+                if reader.peek() != '{':
+                    logger.warning(f"{filename} is not a JSON object, nothing to scan")
+                    return digests, records
+                for key in reader.iter_keys():
+                    known = previous.get(key) if previous is not None else None
+                    if known is not None and reader.skip_if_unchanged(known):
+                        digests[key] = known
+                        continue
+                    value, digests[key] = reader.read_value_digest()
+                    if previous is not None:
+                        records[key] = value
+        except FileNotFoundError:
+            logger.error(f"File {filename} not found in {self.data_path}")
+            return digests, records
+        except json.JSONDecodeError as e:
+            logger.error(f"Error parsing JSON from {filename}: {e}")
+            raise
+        logger.info(f"Scanned {len(digests)} records from {filename}, {len(records)} decoded")
+        return digests, records
+
     def load_all_data(self) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
         """Load all Decision data files"""
         # Load raw data - usando os nomes corretos dos arquivos
@@ -155,73 +422,195 @@ class DataLoader:
             json.dump(sample_prospects, f, indent=2, ensure_ascii=False)
             
         logger.info("Sample data created successfully")
+
+    def create_synthetic_data(self, n_jobs: int = 1000, n_applicants: int = 10000, n_prospects: int = 50000,
+                              seed: int = 42) -> Dict[str, int]:
+        """Write seeded synthetic data at the given scale (see ``synthetic_data``)"""
+        from .synthetic_data import SyntheticDataGenerator
+        return SyntheticDataGenerator(n_jobs, n_applicants, n_prospects, seed=seed).write(self.data_path)
     
-    def process_decision_data(self) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
-        """Process Decision data into normalized DataFrames"""
-        # Load raw data with correct method
-        vagas_data = self.load_json_data("vagas.json")
-        prospects_data = self.load_json_data("prospects.json")
-        applicants_data = self.load_json_data("applicants.json")
-        
-        # Process vagas data (dictionary format)
-        vagas_list = []
-        if isinstance(vagas_data, dict):
-            for vaga_code, vaga_info in vagas_data.items():
-                vaga_info_copy = vaga_info.copy()
-                vaga_info_copy['job_id'] = vaga_code
-                vagas_list.append(vaga_info_copy)
-        vagas_df = pd.DataFrame(vagas_list)
-        
-        # Process applicants data (dictionary format)
-        applicants_list = []
-        if isinstance(applicants_data, dict):
-            for candidate_code, candidate_info in applicants_data.items():
-                candidate_info_copy = candidate_info.copy()
-                candidate_info_copy['candidate_id'] = candidate_code
-                applicants_list.append(candidate_info_copy)
-        applicants_df = pd.DataFrame(applicants_list)
-        
-        # Process prospects data (nested dictionary format)
-        prospects_list = []
-        if isinstance(prospects_data, dict):
-            for job_code, candidates_list in prospects_data.items():
-                if isinstance(candidates_list, list):
-                    for candidate in candidates_list:
-                        prospect_row = {
-                            'job_id': job_code,
-                            'candidate_id': candidate.get('codigo_candidato'),
-                            'candidate_name': candidate.get('nome_candidato'),
-                            'comment': candidate.get('comentario'),
-                            'status': candidate.get('situacao')
-                        }
-                        prospects_list.append(prospect_row)
-        prospects_df = pd.DataFrame(prospects_list)
+    def iter_jobs(self, items=None) -> Iterator[Dict]:
+        """Yield normalized vaga records (streamed from disk by default)"""
+        items = self.iter_json_records("vagas.json") if items is None else items
+        for vaga_code, vaga_info in items:
+            # Records are freshly parsed and owned here, so no copy is needed
+            vaga_info['job_id'] = vaga_code
+            yield vaga_info
+
+    def iter_candidates(self, items=None) -> Iterator[Dict]:
+        """Yield normalized applicant records (streamed from disk by default)"""
+        items = self.iter_json_records("applicants.json") if items is None else items
+        for candidate_code, candidate_info in items:
+            candidate_info['candidate_id'] = candidate_code
+            yield candidate_info
+
+    def iter_prospects(self, items=None) -> Iterator[Dict]:
+        """Yield flattened prospect rows (streamed from disk by default)"""
+        items = self.iter_nested_records("prospects.json") if items is None else items
+        for job_code, candidate in items:
+            yield {
+                'job_id': job_code,
+                'candidate_id': candidate.get('codigo_candidato'),
+                'candidate_name': candidate.get('nome_candidato'),
+                'comment': candidate.get('comentario'),
+                'status': candidate.get('situacao')
+            }
+
+    def iter_prospect_frames(self, chunk_size: int = FRAME_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+        """Stream prospect rows as DataFrames of at most ``chunk_size`` rows"""
+        return self._record_frames(self.iter_prospects(), chunk_size)
+
+    @staticmethod
+    def _record_frames(records: Iterable[Dict], chunk_size: int = FRAME_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+        chunk = []
+        for record in records:
+            chunk.append(record)
+            if len(chunk) >= chunk_size:
+                yield pd.DataFrame(chunk)
+                chunk = []
+        if chunk:
+            yield pd.DataFrame(chunk)
+
+    def process_decision_data(self, streaming: bool = False, use_snapshot: bool = None,
+                              strict: bool = False) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        """Process Decision data into normalized DataFrames
+
+        With ``streaming=True`` the sources are parsed one record at a time
+        instead of materializing each whole file with ``json.load`` first.
+        A malformed source loads as an empty table, or with ``strict=True``
+        raises ``json.JSONDecodeError`` (and no snapshot is written).
+        With snapshots enabled, a columnar snapshot of the tables is reused
+        while the source files are unchanged and rebuilt when they change.
+        """
+        use_snapshot = self.use_snapshot if use_snapshot is None else use_snapshot
+        if not use_snapshot:
+            return self._parse_decision_data(streaming, strict)
+
+        start = time.perf_counter()
+        sources = self.source_paths()
+        manifest = self.snapshot.read_manifest()
+        if manifest is not None and self.snapshot.is_fresh(manifest, sources, self.verify_hash):
+            try:
+                tables = self.snapshot.load(manifest)
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                logger.info(f"Loaded Decision snapshot in {elapsed_ms:.1f} ms (warm)")
+                return tables['vagas'], tables['prospects'], tables['applicants']
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Snapshot unreadable, rebuilding: {e}")
+
+        # Fingerprint before parsing so a concurrent write invalidates the snapshot
+        fingerprints = {name: source_fingerprint(path) for name, path in sources.items()}
+        vagas_df, prospects_df, applicants_df = self._parse_decision_data(streaming, strict)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        logger.info(f"Parsed Decision sources in {elapsed_ms:.1f} ms (cold)")
+
+        self.write_snapshot(vagas_df, prospects_df, applicants_df, fingerprints)
+        return vagas_df, prospects_df, applicants_df
+
+    def write_snapshot(self, vagas_df: pd.DataFrame, prospects_df: pd.DataFrame, applicants_df: pd.DataFrame,
+                       fingerprints: Dict[str, Optional[Dict]]):
+        """Save the tables as the snapshot of sources with ``fingerprints`` (failures are only logged)"""
+        try:
+            self.snapshot.save({'vagas': vagas_df, 'prospects': prospects_df, 'applicants': applicants_df},
+                               fingerprints)
+            logger.info(f"Snapshot written to {self.snapshot.snapshot_dir}")
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Could not write snapshot: {e}")
+
+    def _parse_decision_data(self, streaming: bool,
+                             strict: bool = False) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        """Parse the JSON sources into normalized DataFrames"""
+        if streaming:
+            vagas_df = self._streamed_frame(lambda: self._record_frames(self.iter_jobs()), strict)
+            applicants_df = self._streamed_frame(lambda: self._record_frames(self.iter_candidates()), strict)
+            prospects_df = self._streamed_frame(self.iter_prospect_frames, strict)
+        else:
+            vagas_df, prospects_df, applicants_df = self.tables_from_records(
+                self.load_json_data("vagas.json", strict),
+                self.load_json_data("prospects.json", strict),
+                self.load_json_data("applicants.json", strict)
+            )
         
         logger.info(f"Processed Decision data: vagas={len(vagas_df)}, applicants={len(applicants_df)}, prospects={len(prospects_df)}")
         
         return vagas_df, prospects_df, applicants_df
     
-    def get_job_candidate_pairs(self) -> List[Dict]:
-        """Get all job-candidate pairs for training"""
+    def tables_from_records(self, vagas_data: Any, prospects_data: Any,
+                            applicants_data: Any) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        """Normalized tables of decoded ``{id: record}`` sources (anything else counts as empty)"""
+        vagas_items = vagas_data.items() if isinstance(vagas_data, dict) else []
+        applicants_items = applicants_data.items() if isinstance(applicants_data, dict) else []
+        prospects_items = (
+            (job_code, candidate)
+            for job_code, candidates_list in (prospects_data.items() if isinstance(prospects_data, dict) else [])
+            if isinstance(candidates_list, list)
+            for candidate in candidates_list
+        )
+
+        vagas_df = pd.DataFrame(list(self.iter_jobs(vagas_items)))
+        applicants_df = pd.DataFrame(list(self.iter_candidates(applicants_items)))
+        prospects_df = pd.DataFrame(list(self.iter_prospects(prospects_items)))
+        return vagas_df, prospects_df, applicants_df
+
+    @staticmethod
+    def _streamed_frame(iter_frames: Callable[[], Iterator[pd.DataFrame]], strict: bool = False) -> pd.DataFrame:
+        """Concatenated chunks of streamed records; empty, like ``load_json_data``, when the file is malformed
+
+        Only one chunk of records is held as dicts at a time.
+        """
+        try:
+            frames = list(iter_frames())
+            return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        except json.JSONDecodeError:
+            if strict:
+                raise
+            return pd.DataFrame()
+
+    def get_job_candidate_pairs(self, as_columns: bool = False) -> Union[List[Dict], Dict[str, np.ndarray]]:
+        """Get all job-candidate pairs for training
+
+        Jobs and candidates are joined to the prospects through id -> row
+        position hash maps, in a single pass. With ``as_columns=True`` the
+        pairs come back as column arrays instead of per-pair dicts:
+        ``job_id``, ``candidate_id``, ``status``, ``comment`` and the
+        ``job_position``/``candidate_position`` of each pair's rows in the
+        vagas/applicants tables (-1 when the id is unknown).
+        """
         vagas_df, prospects_df, applicants_df = self.process_decision_data()
         
+        if prospects_df.empty:
+            return {} if as_columns else []
+        
+        job_ids = prospects_df['job_id'].to_numpy(dtype=object)
+        candidate_ids = prospects_df['candidate_id'].to_numpy(dtype=object)
+        job_positions = lookup_positions(build_position_index(vagas_df, 'job_id'), job_ids)
+        candidate_positions = lookup_positions(build_position_index(applicants_df, 'candidate_id'), candidate_ids)
+        
+        if as_columns:
+            return {
+                'job_id': job_ids,
+                'candidate_id': candidate_ids,
+                'status': prospects_df['status'].to_numpy(dtype=object),
+                'comment': prospects_df['comment'].to_numpy(dtype=object),
+                'job_position': job_positions,
+                'candidate_position': candidate_positions
+            }
+        
+        vagas_records = vagas_df.to_dict('records')
+        applicants_records = applicants_df.to_dict('records')
+        
         pairs = []
-        for _, prospect in prospects_df.iterrows():
-            job_id = prospect['job_id']
-            candidate_id = prospect['candidate_id']
-            
-            # Get job and candidate details
-            job_info = vagas_df[vagas_df['job_id'] == job_id].iloc[0].to_dict() if not vagas_df[vagas_df['job_id'] == job_id].empty else {}
-            candidate_info = applicants_df[applicants_df['candidate_id'] == candidate_id].iloc[0].to_dict() if not applicants_df[applicants_df['candidate_id'] == candidate_id].empty else {}
-            
+        for job_id, candidate_id, job_position, candidate_position, status, comment in zip(
+                job_ids.tolist(), candidate_ids.tolist(), job_positions.tolist(), candidate_positions.tolist(),
+                prospects_df['status'].tolist(), prospects_df['comment'].tolist()):
             pair = {
                 'job_id': job_id,
                 'candidate_id': candidate_id,
-                'job_info': job_info,
-                'candidate_info': candidate_info,
-                'status': prospect['status'],
-                'comment': prospect['comment']
+                'job_info': dict(vagas_records[job_position]) if job_position >= 0 else {},
+                'candidate_info': dict(applicants_records[candidate_position]) if candidate_position >= 0 else {},
+                'status': status,
+                'comment': comment
             }
             pairs.append(pair)
         
-        return pairs
\ No newline at end of file
+        return pairs
@@ -0,0 +1,129 @@
+"""
+Background refresh of the resident Decision data
+"""
+import json
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from .data_loader import DataLoader
+from .entity_store import EntityStore
+from .snapshot import source_fingerprint
+
+logger = logging.getLogger(__name__)
+
+
+class DataRefresher:
+    """Watches the Decision source files and publishes refreshed entity stores
+
+    Every source record is fingerprinted by the hash of its raw JSON text
+    (``DataLoader.scan_records``). When a source file's size or mtime
+    changes, the files are scanned again on this thread: records whose
+    text still matches are skipped without being parsed, and only the
+    added, changed and removed ones are applied with
+    ``EntityStore.patched`` (id maps and candidate encoding patched, new
+    data version). ``publish`` then swaps the new store in; requests never
+    wait for any of this. The fingerprints are taken once at construction.
+
+    Sources are parsed strictly: a file caught mid-write fails the refresh
+    instead of loading as an empty table, the current store stays
+    published and the next check tries again.
+    """
+
+    def __init__(self, data_loader: DataLoader, get_store: Callable[[], EntityStore],
+                 publish: Callable[[EntityStore], None], interval: float = 30.0):
+        self.data_loader = data_loader
+        self.get_store = get_store
+        self.publish = publish
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._seen = self._source_state()
+        # None until the sources could be scanned; the next refresh then rebuilds everything
+        self._digests: Optional[Dict[str, Dict]] = None
+        try:
+            self._digests = {name: data_loader.scan_records(filename)[0]
+                             for name, filename in data_loader.SOURCE_FILES.items()}
+        except json.JSONDecodeError as e:
+            logger.warning(f"Could not fingerprint the sources, the first refresh reloads them: {e}")
+
+    def _source_state(self) -> Dict[str, Optional[Dict]]:
+        return {name: source_fingerprint(path, with_hash=False)
+                for name, path in self.data_loader.source_paths().items()}
+
+    def check(self) -> bool:
+        """Refresh if a source file changed since the last check (errors propagate, nothing is marked seen)"""
+        state = self._source_state()
+        if state == self._seen:
+            return False
+        self.refresh()
+        self._seen = state
+        return True
+
+    def refresh(self) -> EntityStore:
+        """Apply the changed source records and publish the new store (if anything changed)"""
+        loader = self.data_loader
+        current = self.get_store()
+        previous = self._digests if current is not None else None
+        # Fingerprint before scanning so a concurrent write invalidates the snapshot
+        fingerprints = {name: source_fingerprint(path) for name, path in loader.source_paths().items()} \
+            if loader.use_snapshot else None
+
+        digests, records = {}, {}
+        for name, filename in loader.SOURCE_FILES.items():
+            digests[name], records[name] = loader.scan_records(filename, previous[name] if previous else {})
+
+        if previous is None:
+            vagas_df, prospects_df, applicants_df = loader.tables_from_records(
+                records['vagas'], records['prospects'], records['applicants']
+            )
+            store = EntityStore(vagas_df, applicants_df, prospects_df)
+        else:
+            store = current.patched(
+                self._updates(records['vagas'], previous['vagas'], digests['vagas'], loader.iter_jobs),
+                self._updates(records['applicants'], previous['applicants'], digests['applicants'],
+                              loader.iter_candidates),
+                self._prospect_updates(records['prospects'], previous['prospects'], digests['prospects'])
+            )
+        self._digests = digests
+
+        if store is not current:
+            self.publish(store)
+            logger.info(f"Published data version {store.data_version}")
+            if fingerprints is not None:
+                loader.write_snapshot(store.vagas_df, store.prospects_df, store.applicants_df, fingerprints)
+        return store
+
+    @staticmethod
+    def _updates(records: Dict[str, Any], previous: Dict, digests: Dict,
+                 normalize: Callable) -> Dict[str, Optional[Dict]]:
+        """Normalized rows of changed records by id, None for removed ones"""
+        updates: Dict[str, Optional[Dict]] = dict.fromkeys(previous.keys() - digests.keys())
+        for row, record_id in zip(normalize(records.items()), records):
+            updates[record_id] = row
+        return updates
+
+    def _prospect_updates(self, records: Dict[str, Any], previous: Dict, digests: Dict) -> Dict[str, list]:
+        """New prospect rows of every job whose list changed (empty when it was removed)"""
+        updates = {job_code: [] for job_code in previous.keys() - digests.keys()}
+        for job_code, candidates_list in records.items():
+            items = ((job_code, candidate) for candidate in candidates_list) \
+                if isinstance(candidates_list, list) else []
+            updates[job_code] = list(self.data_loader.iter_prospects(items))
+        return updates
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"Data refresh failed: {e}")
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="data-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
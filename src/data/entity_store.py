@@ -0,0 +1,183 @@
+"""
+Resident entity store for Decision AI jobs and candidates
+"""
+import pandas as pd
+import numpy as np
+import logging
+import threading
+import uuid
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+from .data_loader import DataLoader, build_position_index, lookup_positions
+
+logger = logging.getLogger(__name__)
+
+
+def _patch_table(df: pd.DataFrame, index: Dict[Hashable, int], id_column: str,
+                 updates: Dict[Hashable, Optional[Dict]]) -> Tuple[pd.DataFrame, Dict[Hashable, int], np.ndarray, bool]:
+    """Copy of ``df`` with the rows of ``updates`` (id -> row, None to remove) applied
+
+    Changed rows are overwritten where they are and new ones appended, so
+    every other row keeps its position and the index is patched, not
+    rebuilt; only a removal compacts the table and re-indexes it.
+    Returns ``(table, index, positions of new or changed rows, removed any)``.
+    """
+    rows = {record_id: row for record_id, row in updates.items() if row is not None}
+    removed = [index[record_id] for record_id, row in updates.items() if row is None and record_id in index]
+    changed = [record_id for record_id in rows if record_id in index]
+    added = [record_id for record_id in rows if record_id not in index]
+
+    table = df
+    if changed:
+        positions = np.array([index[record_id] for record_id in changed], dtype=np.int64)
+        new_rows = pd.DataFrame([rows[record_id] for record_id in changed])
+        table = df.copy()
+        for name in table.columns.union(new_rows.columns, sort=False):
+            column = table[name].to_numpy(dtype=object, copy=True) if name in table.columns \
+                else np.full(len(table), np.nan, dtype=object)
+            column[positions] = new_rows[name].to_numpy(dtype=object) if name in new_rows.columns else np.nan
+            table[name] = pd.Series(column, index=table.index).infer_objects()
+    if added:
+        table = pd.concat([table, pd.DataFrame([rows[record_id] for record_id in added])], ignore_index=True)
+    if removed:
+        table = table.drop(index=removed).reset_index(drop=True)
+        return table, build_position_index(table, id_column), np.array([], dtype=np.int64), True
+
+    index = dict(index)
+    index.update((record_id, len(df) + offset) for offset, record_id in enumerate(added))
+    patched = np.fromiter((index[record_id] for record_id in changed + added), dtype=np.int64,
+                          count=len(changed) + len(added))
+    return table, index, patched, False
+
+
+class EntityStore:
+    """Holds the normalized Decision tables in memory, indexed by id"""
+
+    def __init__(self, vagas_df: pd.DataFrame, applicants_df: pd.DataFrame,
+                 prospects_df: pd.DataFrame = None, data_version: str = None,
+                 job_index: Dict[Hashable, int] = None, candidate_index: Dict[Hashable, int] = None):
+        self.vagas_df = vagas_df.reset_index(drop=True)
+        self.applicants_df = applicants_df.reset_index(drop=True)
+        self.prospects_df = prospects_df.reset_index(drop=True) if prospects_df is not None else pd.DataFrame()
+        # Changes whenever the resident data changes, so derived caches can tell
+        self.data_version = data_version or uuid.uuid4().hex[:12]
+
+        # Hash maps id -> row position, so a lookup never scans the tables
+        self.job_index = job_index if job_index is not None else build_position_index(self.vagas_df, 'job_id')
+        self.candidate_index = candidate_index if candidate_index is not None \
+            else build_position_index(self.applicants_df, 'candidate_id')
+
+        # Candidate pool encoding for block scoring, built on first use
+        self._candidate_encoding: Optional[Dict[str, np.ndarray]] = None
+        self._encoding_owner = None
+        self._encoding_lock = threading.Lock()
+
+        logger.info(f"Entity store ready: {len(self.job_index)} jobs, {len(self.candidate_index)} candidates")
+
+    @classmethod
+    def from_loader(cls, data_loader: DataLoader) -> "EntityStore":
+        """Parse the Decision sources once and build the store"""
+        vagas_df, prospects_df, applicants_df = data_loader.process_decision_data()
+        return cls(vagas_df, applicants_df, prospects_df)
+
+    @property
+    def num_jobs(self) -> int:
+        return len(self.job_index)
+
+    @property
+    def num_candidates(self) -> int:
+        return len(self.candidate_index)
+
+    def has_job(self, job_id: str) -> bool:
+        return job_id in self.job_index
+
+    def has_candidate(self, candidate_id: str) -> bool:
+        return candidate_id in self.candidate_index
+
+    def get_job(self, job_id: str) -> Optional[pd.Series]:
+        """Get a job row by id, or None if unknown"""
+        position = self.job_index.get(job_id)
+        return self.vagas_df.iloc[position] if position is not None else None
+
+    def get_candidate(self, candidate_id: str) -> Optional[pd.Series]:
+        """Get a candidate row by id, or None if unknown"""
+        position = self.candidate_index.get(candidate_id)
+        return self.applicants_df.iloc[position] if position is not None else None
+
+    def get_job_frame(self, job_id: str) -> pd.DataFrame:
+        """Get a single-row DataFrame for a job (empty if unknown)"""
+        position = self.job_index.get(job_id)
+        if position is None:
+            return self.vagas_df.iloc[0:0]
+        return self.vagas_df.iloc[[position]]
+
+    def get_candidate_frame(self, candidate_id: str) -> pd.DataFrame:
+        """Get a single-row DataFrame for a candidate (empty if unknown)"""
+        position = self.candidate_index.get(candidate_id)
+        if position is None:
+            return self.applicants_df.iloc[0:0]
+        return self.applicants_df.iloc[[position]]
+
+    def pair_frames(self, candidate_ids: Iterable, job_ids: Iterable) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Job and candidate rows referenced by the given pairs (unknown ids skipped)
+        
+        ``create_features`` indexes whatever tables it is given, so scoring
+        a few pairs against these slices costs nothing per resident row.
+        """
+        job_positions = np.unique(lookup_positions(self.job_index, job_ids))
+        candidate_positions = np.unique(lookup_positions(self.candidate_index, candidate_ids))
+        return (self.vagas_df.iloc[job_positions[job_positions >= 0]],
+                self.applicants_df.iloc[candidate_positions[candidate_positions >= 0]])
+
+    def candidate_encoding(self, feature_engineer) -> Dict[str, np.ndarray]:
+        """Encoding of the whole candidate pool, cached per feature engineer"""
+        with self._encoding_lock:
+            if self._candidate_encoding is None or self._encoding_owner is not feature_engineer:
+                self._candidate_encoding = feature_engineer.encode_candidates(self.applicants_df)
+                self._encoding_owner = feature_engineer
+                logger.info(f"Encoded candidate pool: {len(self._candidate_encoding['ids'])} candidates")
+            return self._candidate_encoding
+
+    def patched(self, jobs: Dict[Hashable, Optional[Dict]], candidates: Dict[Hashable, Optional[Dict]],
+                prospects: Dict[Hashable, List[Dict]]) -> "EntityStore":
+        """A store with the given records replaced, added or removed
+
+        ``jobs`` and ``candidates`` map ids to their new normalized rows
+        (None removes the id); ``prospects`` maps job ids to the complete
+        new list of their prospect rows. Returns ``self`` when there is
+        nothing to apply. Otherwise the new store gets a new
+        ``data_version``, the id maps are patched rather than rebuilt and
+        the cached candidate encoding is carried over with only the given
+        candidates parsed again. This store is never modified, so readers
+        can keep using it meanwhile.
+        """
+        if not (jobs or candidates or prospects):
+            return self
+
+        vagas_df, job_index, _, _ = _patch_table(self.vagas_df, self.job_index, 'job_id', jobs)
+        applicants_df, candidate_index, patched_positions, removed_candidates = _patch_table(
+            self.applicants_df, self.candidate_index, 'candidate_id', candidates
+        )
+        prospects_df = self.prospects_df
+        if prospects:
+            if 'job_id' in prospects_df.columns:
+                prospects_df = prospects_df[~prospects_df['job_id'].isin(list(prospects))]
+            new_rows = [row for rows in prospects.values() for row in rows]
+            if new_rows:
+                prospects_df = pd.concat([prospects_df, pd.DataFrame(new_rows)], ignore_index=True)
+
+        store = EntityStore(vagas_df, applicants_df, prospects_df, job_index=job_index,
+                            candidate_index=candidate_index)
+        logger.info(f"Data patched: {len(jobs)} jobs, {len(candidates)} candidates, "
+                    f"{len(prospects)} prospect lists")
+
+        with self._encoding_lock:
+            previous, owner = self._candidate_encoding, self._encoding_owner
+        if previous is not None:
+            if removed_candidates:
+                unchanged = candidate_index.keys() - candidates.keys()
+                store._candidate_encoding = owner.reencode_candidates(previous, store.applicants_df, unchanged)
+            else:
+                store._candidate_encoding = owner.patch_candidates(previous, store.applicants_df, patched_positions)
+            store._encoding_owner = owner
+        return store
@@ -0,0 +1,232 @@
+"""
+Columnar on-disk snapshot of the normalized Decision tables
+"""
+import pandas as pd
+import numpy as np
+import hashlib
+import json
+import logging
+import os
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+
+# Null markers for object columns: JSON null vs. key missing from the record
+_VALUE, _NONE, _NAN = 0, 1, 2
+
+
+def file_sha256(path: Path, chunk_size: int = 1 << 20) -> str:
+    """Content hash of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_fingerprint(path: Path, with_hash: bool = True) -> Optional[Dict[str, Any]]:
+    """Size, mtime and (optionally) content hash of a source file"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    fingerprint = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    if with_hash:
+        fingerprint['sha256'] = file_sha256(path)
+    return fingerprint
+
+
+def _is_nan(value) -> bool:
+    return isinstance(value, float) and value != value
+
+
+def _encode_strings(values: List[str]) -> Dict[str, np.ndarray]:
+    """Dictionary-encode strings: unique values in one UTF-8 buffer plus codes"""
+    uniques: Dict[str, int] = {}
+    codes = np.fromiter((uniques.setdefault(value, len(uniques)) for value in values),
+                        dtype=np.int64, count=len(values))
+    offsets = np.zeros(len(uniques) + 1, dtype=np.int64)
+    if uniques:
+        np.cumsum([len(value) for value in uniques], out=offsets[1:])
+    data = np.frombuffer(''.join(uniques).encode('utf-8'), dtype=np.uint8)
+    return {'codes': codes, 'data': data, 'offsets': offsets}
+
+
+def _decode_strings(arrays: Dict[str, np.ndarray]) -> np.ndarray:
+    """Inverse of ``_encode_strings`` as an object array"""
+    text = arrays['data'].tobytes().decode('utf-8')
+    bounds = arrays['offsets'].tolist()
+    uniques = np.empty(len(bounds) - 1, dtype=object)
+    uniques[:] = [text[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+    return uniques[arrays['codes']]
+
+
+def _encode_column(series: pd.Series) -> Tuple[str, Dict[str, np.ndarray]]:
+    """Pick a columnar layout for one DataFrame column"""
+    if series.dtype.kind in 'biufcmM':
+        return 'numeric', {'values': series.to_numpy()}
+
+    values = series.tolist()
+    nulls = np.array([_NONE if value is None else _NAN if _is_nan(value) else _VALUE for value in values],
+                     dtype=np.int8)
+    present = [value for value, null in zip(values, nulls) if null == _VALUE]
+
+    if all(isinstance(value, str) for value in present):
+        arrays = _encode_strings([value if null == _VALUE else '' for value, null in zip(values, nulls)])
+        return 'str', dict(arrays, nulls=nulls)
+
+    if all(isinstance(value, list) and all(isinstance(item, str) for item in value) for value in present):
+        lists = [value if null == _VALUE else [] for value, null in zip(values, nulls)]
+        list_offsets = np.zeros(len(lists) + 1, dtype=np.int64)
+        if lists:
+            np.cumsum([len(value) for value in lists], out=list_offsets[1:])
+        arrays = _encode_strings([item for value in lists for item in value])
+        return 'str_list', dict(arrays, nulls=nulls, list_offsets=list_offsets)
+
+    # Mixed scalar types, nested objects, ...: one JSON document per cell
+    arrays = _encode_strings([json.dumps(value, ensure_ascii=False) if null == _VALUE else ''
+                              for value, null in zip(values, nulls)])
+    return 'json', dict(arrays, nulls=nulls)
+
+
+def _decode_column(kind: str, arrays: Dict[str, np.ndarray]):
+    if kind == 'numeric':
+        return arrays['values']
+
+    if kind == 'str':
+        values = _decode_strings(arrays)
+    elif kind == 'str_list':
+        items = _decode_strings(arrays).tolist()
+        bounds = arrays['list_offsets'].tolist()
+        values = np.empty(len(bounds) - 1, dtype=object)
+        values[:] = [items[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+    elif kind == 'json':
+        # Decoded per cell so mutable values are never shared between rows
+        values = np.empty(len(arrays['codes']), dtype=object)
+        values[:] = [json.loads(value) if value else None for value in _decode_strings(arrays).tolist()]
+    else:
+        raise ValueError(f"Unknown snapshot column kind: {kind}")
+
+    nulls = np.asarray(arrays['nulls'])
+    values[nulls == _NONE] = None
+    values[nulls == _NAN] = np.nan
+    return pd.Series(values, dtype=object)
+
+
+class TableSnapshot:
+    """Reads and writes the Decision tables as raw ``.npy`` column files
+
+    Every column is stored as plain arrays (no pickles), so numeric columns
+    can be memory-mapped and a warm load only has to rebuild the object
+    columns. A ``manifest.json`` written last records the source file
+    fingerprints the snapshot was built from.
+    """
+
+    def __init__(self, snapshot_dir: Path):
+        self.snapshot_dir = Path(snapshot_dir)
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.snapshot_dir / MANIFEST_FILE
+
+    def read_manifest(self) -> Optional[Dict]:
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if manifest.get('format_version') != SNAPSHOT_FORMAT_VERSION:
+            return None
+        return manifest
+
+    def _write_manifest(self, manifest: Dict):
+        tmp_path = self.manifest_path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.manifest_path)
+
+    def is_fresh(self, manifest: Dict, sources: Dict[str, Path], verify_hash: bool = False) -> bool:
+        """Check the snapshot against the current state of the source files"""
+        recorded = manifest.get('sources', {})
+        if set(recorded) != set(sources):
+            return False
+
+        refreshed = False
+        for name, path in sources.items():
+            current = source_fingerprint(path, with_hash=False)
+            previous = recorded[name]
+            if current is None or previous is None:
+                if current != previous:
+                    return False
+                continue
+            if current['size'] != previous['size']:
+                return False
+            if current['mtime_ns'] == previous['mtime_ns'] and not verify_hash:
+                continue
+            # Touched (or hash verification requested): compare the contents
+            if file_sha256(path) != previous.get('sha256'):
+                return False
+            if current['mtime_ns'] != previous['mtime_ns']:
+                previous['mtime_ns'] = current['mtime_ns']
+                refreshed = True
+
+        if refreshed:
+            self._write_manifest(manifest)
+        return True
+
+    def save(self, tables: Dict[str, pd.DataFrame], sources: Dict[str, Optional[Dict]]):
+        """Write a new snapshot generation and retire older ones
+
+        The generation being replaced stays on disk until the next save, so
+        a process that read its manifest just before the swap (another
+        worker, a training run) can still open its arrays.
+        """
+        self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+        generation = uuid.uuid4().hex[:12]
+        previous = self.read_manifest()
+
+        manifest = {
+            'format_version': SNAPSHOT_FORMAT_VERSION,
+            'generation': generation,
+            'sources': sources,
+            'tables': {}
+        }
+        for table_name, df in tables.items():
+            columns = []
+            for column_number, column in enumerate(df.columns):
+                kind, arrays = _encode_column(df[column])
+                files = {}
+                for part, array in arrays.items():
+                    filename = f"{generation}-{table_name}-{column_number}-{part}.npy"
+                    np.save(self.snapshot_dir / filename, array, allow_pickle=False)
+                    files[part] = filename
+                columns.append({'name': column, 'kind': kind, 'files': files})
+            manifest['tables'][table_name] = {'n_rows': len(df), 'columns': columns}
+
+        self._write_manifest(manifest)
+
+        keep = {generation, previous['generation'] if previous else generation}
+        for path in self.snapshot_dir.glob("*.npy"):
+            if path.name.split('-', 1)[0] not in keep:
+                path.unlink(missing_ok=True)
+
+    def load(self, manifest: Dict, mmap: bool = True) -> Dict[str, pd.DataFrame]:
+        """Rebuild the tables recorded in ``manifest``"""
+        mmap_mode = 'r' if mmap else None
+        tables = {}
+        for table_name, table in manifest['tables'].items():
+            if not table['columns']:
+                tables[table_name] = pd.DataFrame()
+                continue
+            data = {}
+            for column in table['columns']:
+                arrays = {part: np.load(self.snapshot_dir / filename, mmap_mode=mmap_mode, allow_pickle=False)
+                          for part, filename in column['files'].items()}
+                data[column['name']] = _decode_column(column['kind'], arrays)
+            tables[table_name] = pd.DataFrame(data, columns=[column['name'] for column in table['columns']])
+        return tables
@@ -0,0 +1,370 @@
+"""
+Seeded synthetic Decision data at configurable scale, for benchmarks
+
+    python src/data/synthetic_data.py --jobs 100000 --applicants 1000000 \\
+        --prospects 10000000 --output data/synthetic
+"""
+import numpy as np
+import argparse
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 10000
+
+GENERAL_SKILLS = [
+    "Python", "Java", "JavaScript", "SQL", "Git", "Docker", "Linux", "AWS", "React", "Node.js",
+    "TypeScript", "C#", ".NET", "Spring Boot", "Django", "Flask", "PostgreSQL", "MySQL", "Oracle",
+    "SQL Server", "MongoDB", "Kubernetes", "Azure", "GCP", "Angular", "Vue.js", "HTML", "CSS",
+    "PHP", "Go", "Scrum", "Kanban", "Jira", "Power BI", "Excel", "Tableau", "Spark", "Hadoop",
+    "Kafka", "Redis", "Terraform", "Jenkins", "CI/CD", "REST", "Microservices", "Selenium",
+    "Pandas", "Machine Learning", "ITIL", "COBOL"
+]
+
+SAP_SKILLS = [
+    "SAP ABAP", "SAP ECC", "SAP S/4HANA", "SAP FI", "SAP CO", "SAP FICO", "SAP MM", "SAP SD",
+    "SAP PP", "SAP HR", "SAP BW", "SAP Basis", "SAP PI/PO", "SAP Fiori", "SAP HANA", "SAP WM"
+]
+
+LOCATIONS = [
+    ("São Paulo - SP", 0.38), ("Rio de Janeiro - RJ", 0.14), ("Belo Horizonte - MG", 0.08),
+    ("Curitiba - PR", 0.06), ("Porto Alegre - RS", 0.05), ("Campinas - SP", 0.05),
+    ("Barueri - SP", 0.04), ("Recife - PE", 0.04), ("Brasília - DF", 0.04),
+    ("Florianópolis - SC", 0.03), ("Salvador - BA", 0.03), ("Fortaleza - CE", 0.02),
+    ("Remoto", 0.03), ("", 0.01)
+]
+
+PROFESSIONAL_LEVELS = [
+    ("Júnior", 0.12), ("Junior", 0.05), ("Pleno", 0.33), ("Sênior", 0.25), ("Senior", 0.08),
+    ("Especialista", 0.1), ("Lead", 0.04), ("Analista", 0.03)
+]
+
+LANGUAGE_LEVELS = [
+    ("Nenhum", 0.08), ("Não possui", 0.07), ("Básico", 0.25), ("Intermediário", 0.3),
+    ("Avançado", 0.2), ("Fluente", 0.08), ("", 0.02)
+]
+
+JOB_LANGUAGE_LEVELS = [
+    ("Não requerido", 0.3), ("Básico", 0.2), ("Intermediário", 0.25), ("Avançado", 0.18),
+    ("Fluente", 0.07)
+]
+
+ACADEMIC_LEVELS = [
+    ("Ensino Médio Completo", 0.08), ("Ensino Técnico Completo", 0.07), ("Superior Incompleto", 0.15),
+    ("Superior Completo", 0.45), ("Pós Graduação Completo", 0.17), ("Mestrado Completo", 0.04),
+    ("", 0.04)
+]
+
+PROSPECT_STATUSES = [
+    # (status, weight when the profile fits, weight when it does not)
+    ("Contratado", 0.10, 0.02), ("Aprovado", 0.06, 0.02), ("Em processo", 0.10, 0.08),
+    ("Prospect", 0.12, 0.12), ("Encaminhado ao Requisitante", 0.14, 0.10), ("Rejeitado", 0.25, 0.40),
+    ("Não aprovado", 0.10, 0.14), ("Desistiu", 0.09, 0.08), ("Cancelado", 0.04, 0.04)
+]
+
+FIRST_NAMES = [
+    "Ana", "Bruno", "Carla", "Daniel", "Eduarda", "Felipe", "Gabriela", "Henrique", "Isabela",
+    "João", "Larissa", "Marcos", "Natália", "Otávio", "Paula", "Rafael", "Sofia", "Thales",
+    "Vitória", "William", "Yasmin", "Lucas", "Mariana", "Pedro", "Juliana", "Gustavo"
+]
+
+LAST_NAMES = [
+    "Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves", "Pereira", "Lima",
+    "Gomes", "Costa", "Ribeiro", "Martins", "Carvalho", "Almeida", "Lopes", "Freitas", "Barbosa"
+]
+
+CLIENTS = [
+    "TechCorp", "Enterprise Solutions", "Banco Horizonte", "Varejo Brasil", "Seguradora Atlântica",
+    "Indústria Paulista", "Telecom Sul", "Logística Express", "Energia Nova", "Saúde Integrada"
+]
+
+
+def _split(pairs: List[Tuple[str, float]]) -> Tuple[List[str], np.ndarray]:
+    values, weights = zip(*pairs)
+    weights = np.asarray(weights, dtype=np.float64)
+    return list(values), weights / weights.sum()
+
+
+def _popularity(n: int) -> np.ndarray:
+    """Zipf-like weights: a few skills are everywhere, most are rare"""
+    weights = 1.0 / np.arange(1, n + 1) ** 0.8
+    return weights / weights.sum()
+
+
+def _pick_skills(draws: np.ndarray, count: int, vocabulary: List[str]) -> List[str]:
+    """First ``count`` distinct skills among the drawn indices"""
+    skills = []
+    if count <= 0:
+        return skills
+    for index in draws:
+        skill = vocabulary[index]
+        if skill not in skills:
+            skills.append(skill)
+            if len(skills) == count:
+                break
+    return skills
+
+
+class SyntheticDataGenerator:
+    """Writes Decision-shaped ``vagas.json``, ``applicants.json`` and ``prospects.json``
+
+    Output is a pure function of the scale and ``seed``. Records are
+    generated in chunks and written as they are produced, so the files can
+    be far larger than memory; only a few bytes per job and applicant are
+    kept (their SAP profile, used to make hiring outcomes depend on fit).
+    """
+
+    def __init__(self, n_jobs: int = 1000, n_applicants: int = 10000, n_prospects: int = 50000,
+                 seed: int = 42, sap_share: float = 0.25):
+        self.n_jobs = n_jobs
+        self.n_applicants = n_applicants
+        self.n_prospects = n_prospects
+        self.seed = seed
+        self.sap_share = sap_share
+
+        # Profiles shared by the record generators and the prospect generator
+        profile_rng = np.random.default_rng([seed, 0])
+        self.job_is_sap = profile_rng.random(n_jobs) < sap_share
+        self.applicant_is_sap = profile_rng.random(n_applicants) < sap_share
+
+    def _rng(self, stream: int) -> np.random.Generator:
+        return np.random.default_rng([self.seed, stream])
+
+    @staticmethod
+    def job_code(index: int) -> str:
+        return str(1000 + index)
+
+    @staticmethod
+    def candidate_code(index: int) -> str:
+        return str(100000 + index)
+
+    def iter_jobs(self) -> Iterator[Tuple[str, Dict]]:
+        """(codigo_vaga, vaga) records"""
+        rng = self._rng(1)
+        locations, location_p = _split(LOCATIONS)
+        levels, level_p = _split(PROFESSIONAL_LEVELS)
+        languages, language_p = _split(JOB_LANGUAGE_LEVELS)
+        general_p, sap_p = _popularity(len(GENERAL_SKILLS)), _popularity(len(SAP_SKILLS))
+
+        for start in range(0, self.n_jobs, CHUNK_SIZE):
+            n = min(CHUNK_SIZE, self.n_jobs - start)
+            location = rng.choice(len(locations), n, p=location_p)
+            level = rng.choice(len(levels), n, p=level_p)
+            english = rng.choice(len(languages), n, p=language_p)
+            spanish = rng.choice(len(languages), n, p=language_p)
+            n_skills = rng.integers(3, 9, n)
+            general_draws = rng.choice(len(GENERAL_SKILLS), (n, 16), p=general_p)
+            sap_draws = rng.choice(len(SAP_SKILLS), (n, 16), p=sap_p)
+            salary_min = rng.integers(30, 200, n) * 100
+            salary_spread = rng.integers(10, 80, n) * 100
+            salary_format = rng.random(n)
+            client = rng.integers(0, len(CLIENTS), n)
+
+            for i in range(n):
+                index = start + i
+                is_sap = bool(self.job_is_sap[index])
+                if is_sap:
+                    skills = _pick_skills(sap_draws[i], max(2, n_skills[i] - 2), SAP_SKILLS)
+                    skills += _pick_skills(general_draws[i], 2, GENERAL_SKILLS)
+                else:
+                    skills = _pick_skills(general_draws[i], n_skills[i], GENERAL_SKILLS)
+                low, high = int(salary_min[i]), int(salary_min[i] + salary_spread[i])
+                if salary_format[i] < 0.6:
+                    salary_range = f"{low}-{high}"
+                elif salary_format[i] < 0.8:
+                    salary_range = f"R$ {low:,} - R$ {high:,}"
+                elif salary_format[i] < 0.9:
+                    salary_range = str(low)
+                else:
+                    salary_range = ""
+                title = f"{'Consultor ' + skills[0] if is_sap else 'Desenvolvedor ' + skills[0]} {levels[level[i]]}"
+
+                yield self.job_code(index), {
+                    "codigo_vaga": self.job_code(index),
+                    "titulo": title,
+                    "cliente": CLIENTS[client[i]],
+                    "is_sap": is_sap,
+                    "nivel_profissional": levels[level[i]],
+                    "nivel_ingles": languages[english[i]],
+                    "nivel_espanhol": languages[spanish[i]],
+                    "principais_atividades": f"Atuação com {', '.join(skills[:3])}",
+                    "competencias_tecnicas": skills,
+                    "beneficios": ["Vale refeição", "Plano de saúde"],
+                    "localizacao": locations[location[i]],
+                    "salario_range": salary_range
+                }
+
+    def iter_applicants(self) -> Iterator[Tuple[str, Dict]]:
+        """(codigo_candidato, applicant) records"""
+        rng = self._rng(2)
+        locations, location_p = _split(LOCATIONS)
+        languages, language_p = _split(LANGUAGE_LEVELS)
+        academics, academic_p = _split(ACADEMIC_LEVELS)
+        general_p, sap_p = _popularity(len(GENERAL_SKILLS)), _popularity(len(SAP_SKILLS))
+
+        for start in range(0, self.n_applicants, CHUNK_SIZE):
+            n = min(CHUNK_SIZE, self.n_applicants - start)
+            location = rng.choice(len(locations), n, p=location_p)
+            english = rng.choice(len(languages), n, p=language_p)
+            spanish = rng.choice(len(languages), n, p=language_p)
+            academic = rng.choice(len(academics), n, p=academic_p)
+            n_skills = rng.integers(2, 13, n)
+            general_draws = rng.choice(len(GENERAL_SKILLS), (n, 24), p=general_p)
+            sap_draws = rng.choice(len(SAP_SKILLS), (n, 16), p=sap_p)
+            years = np.minimum(rng.gamma(2.0, 3.0, n).astype(np.int64), 35)
+            salary = (rng.lognormal(9.2, 0.5, n) // 100 * 100).astype(np.int64)
+            salary_format = rng.random(n)
+            first = rng.integers(0, len(FIRST_NAMES), n)
+            last = rng.integers(0, len(LAST_NAMES), n)
+
+            for i in range(n):
+                index = start + i
+                is_sap = bool(self.applicant_is_sap[index])
+                if is_sap:
+                    skills = _pick_skills(sap_draws[i], max(2, n_skills[i] // 2), SAP_SKILLS)
+                    skills += _pick_skills(general_draws[i], n_skills[i] - len(skills), GENERAL_SKILLS)
+                else:
+                    skills = _pick_skills(general_draws[i], n_skills[i], GENERAL_SKILLS)
+                if salary_format[i] < 0.55:
+                    expectation = str(salary[i])
+                elif salary_format[i] < 0.75:
+                    expectation = f"R$ {salary[i]:,}"
+                elif salary_format[i] < 0.85:
+                    expectation = f"{salary[i]:,}"
+                elif salary_format[i] < 0.95:
+                    expectation = ""
+                else:
+                    expectation = "A combinar"
+                name = f"{FIRST_NAMES[first[i]]} {LAST_NAMES[last[i]]}"
+                area = "Consultoria SAP" if is_sap else "Desenvolvimento de Software"
+
+                yield self.candidate_code(index), {
+                    "codigo_candidato": self.candidate_code(index),
+                    "nome": name,
+                    "nivel_academico": academics[academic[i]],
+                    "nivel_ingles": languages[english[i]],
+                    "nivel_espanhol": languages[spanish[i]],
+                    "conhecimentos_tecnicos": skills,
+                    "area_atuacao": area,
+                    "anos_experiencia": int(years[i]),
+                    "localizacao": locations[location[i]],
+                    "pretensao_salarial": expectation,
+                    "cv_resumo": f"{area} com {years[i]} anos de experiência em {', '.join(skills[:3])}"
+                }
+
+    def iter_prospects(self) -> Iterator[Tuple[str, Iterator[Dict]]]:
+        """(codigo_vaga, prospects of that job); outcomes favour SAP-compatible pairs
+
+        A popular job can hold most of the prospects, so each job's list is
+        itself generated lazily, ``CHUNK_SIZE`` prospects at a time. The
+        draws share one random stream: consume a job's prospects before
+        moving on to the next job.
+        """
+        rng = self._rng(3)
+        if self.n_jobs == 0 or self.n_applicants == 0:
+            return
+        statuses = [status for status, _, _ in PROSPECT_STATUSES]
+        fit_p = np.array([weight for _, weight, _ in PROSPECT_STATUSES])
+        misfit_p = np.array([weight for _, _, weight in PROSPECT_STATUSES])
+        fit_p, misfit_p = fit_p / fit_p.sum(), misfit_p / misfit_p.sum()
+
+        # Popular jobs get many more prospects than the long tail
+        per_job = rng.multinomial(self.n_prospects, rng.dirichlet(np.full(self.n_jobs, 0.5)))
+        sap_pool = np.flatnonzero(self.applicant_is_sap)
+        other_pool = np.flatnonzero(~self.applicant_is_sap)
+
+        def job_prospects(job_index: int, n_job: int) -> Iterator[Dict]:
+            preferred = sap_pool if self.job_is_sap[job_index] else other_pool
+            if len(preferred) == 0:
+                preferred = np.arange(self.n_applicants)
+            for start in range(0, n_job, CHUNK_SIZE):
+                n = min(CHUNK_SIZE, n_job - start)
+                from_preferred = rng.random(n) < 0.7
+                candidates = np.where(from_preferred,
+                                      preferred[rng.integers(0, len(preferred), n)],
+                                      rng.integers(0, self.n_applicants, n))
+                fits = self.applicant_is_sap[candidates] == self.job_is_sap[job_index]
+                fit_status = rng.choice(len(statuses), n, p=fit_p)
+                misfit_status = rng.choice(len(statuses), n, p=misfit_p)
+
+                for candidate, fit, fit_choice, misfit_choice in zip(candidates, fits, fit_status, misfit_status):
+                    status = statuses[fit_choice if fit else misfit_choice]
+                    yield {
+                        "codigo_candidato": self.candidate_code(int(candidate)),
+                        "nome_candidato": "",
+                        "comentario": f"Status atualizado para {status}",
+                        "situacao": status
+                    }
+
+        for job_index in range(self.n_jobs):
+            n = int(per_job[job_index])
+            if n == 0:
+                continue
+            yield self.job_code(job_index), job_prospects(job_index, n)
+
+    def write(self, data_path: Path) -> Dict[str, int]:
+        """Stream the three source files into ``data_path``; returns record counts"""
+        data_path = Path(data_path)
+        data_path.mkdir(parents=True, exist_ok=True)
+        counts = {
+            'vagas': _write_json_object(data_path / "vagas.json", self.iter_jobs()),
+            'applicants': _write_json_object(data_path / "applicants.json", self.iter_applicants()),
+            'prospect_jobs': _write_json_object(data_path / "prospects.json", self.iter_prospects())
+        }
+        logger.info(f"Synthetic data written to {data_path}: {self.n_jobs} jobs, "
+                    f"{self.n_applicants} applicants, {self.n_prospects} prospects")
+        return counts
+
+
+def _write_json_object(path: Path, items: Iterator[Tuple[str, object]]) -> int:
+    """Write ``items`` as one JSON object, a record at a time; replaces ``path`` atomically
+
+    A value that is an iterator is written as a JSON array, an element at a time.
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    count = 0
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write("{")
+        for key, value in items:
+            f.write(",\n" if count else "\n")
+            f.write(f"{json.dumps(key)}: ")
+            if isinstance(value, Iterator):
+                f.write("[")
+                for position, element in enumerate(value):
+                    f.write(", " if position else "")
+                    f.write(json.dumps(element, ensure_ascii=False))
+                f.write("]")
+            else:
+                f.write(json.dumps(value, ensure_ascii=False))
+            count += 1
+        f.write("\n}\n")
+    os.replace(tmp_path, path)
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic Decision data")
+    parser.add_argument("--jobs", type=int, default=1000)
+    parser.add_argument("--applicants", type=int, default=10000)
+    parser.add_argument("--prospects", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--sap-share", type=float, default=0.25)
+    parser.add_argument("--output", default="data/synthetic")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    generator = SyntheticDataGenerator(args.jobs, args.applicants, args.prospects,
+                                       seed=args.seed, sap_share=args.sap_share)
+    generator.write(Path(args.output))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,22 +3,264 @@ Feature engineering for candidate-job matching
 """
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Tuple
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.preprocessing import StandardScaler, LabelEncoder
+from typing import List, Dict, Tuple, Union
 import logging
 
+from data.data_loader import build_position_index, lookup_positions
+from .skill_matrix import LocalVocabulary, SkillIncidence, SkillVocabulary, jaccard_pairs
+
 logger = logging.getLogger(__name__)
 
+# Model input columns, in training order
+FEATURE_COLUMNS = [
+    'skill_match', 'experience_match', 'salary_match', 
+    'location_match', 'english_match', 'spanish_match',
+    'sap_match', 'academic_match', 'candidate_experience_years',
+    'num_candidate_skills', 'num_job_skills', 'is_sap_job'
+]
+
+EXPERIENCE_LEVELS = {
+    'junior': (0, 2),
+    'pleno': (2, 5),
+    'mid': (2, 5), 
+    'senior': (5, 10),
+    'sênior': (5, 10),
+    'lead': (8, 15),
+    'especialista': (6, 12)
+}
+
+LANGUAGE_LEVELS = {
+    'não possui': 0,
+    'básico': 1,
+    'intermediário': 2,
+    'avançado': 3,
+    'fluente': 4,
+    'nativo': 5,
+    'não requerido': -1  # Special case for not required
+}
+
+SAP_KEYWORDS = ['sap', 'abap', 'hana', 's/4hana', 'ecc', 'fico', 'mm', 'sd', 'pp', 'hr']
+
+# Batch engine helpers. Each parser mirrors the input handling of the
+# matching ``FeatureEngineer.calculate_*`` method for a single entity and
+# raises wherever that method would, so irregular entities can be detected
+# up front and scored by the scalar path instead.
+
+def _column(df: pd.DataFrame, name: str, default, positions: np.ndarray) -> np.ndarray:
+    """Values of ``name`` at ``positions``, like ``row.get(name, default)``"""
+    if name in df.columns:
+        return df[name].to_numpy(dtype=object)[positions]
+    values = np.empty(len(positions), dtype=object)
+    values[:] = [default] * len(positions)
+    return values
+
+
+def _skill_list(skills):
+    if isinstance(skills, str):
+        skills = [skill.strip() for skill in skills.split(',')]
+    return skills
+
+
+def _skill_set(skills) -> frozenset:
+    skills = _skill_list(skills)
+    if not skills:
+        return frozenset()
+    return frozenset(skill.lower().strip() for skill in skills if skill)
+
+
+def _has_sap_skills(skills) -> bool:
+    skills_lower = [skill.lower() for skill in _skill_list(skills) if skill]
+    return any(any(keyword in skill for keyword in SAP_KEYWORDS) for skill in skills_lower)
+
+
+def _parse_years(value) -> int:
+    try:
+        years = int(value) if value else 0
+    except (ValueError, TypeError):
+        years = 0
+    if abs(years) >= 2 ** 53:
+        raise OverflowError("experience out of exact float range")
+    return years
+
+
+def _parse_level(level):
+    level_clean = level.lower().strip() if level else 'pleno'
+    return EXPERIENCE_LEVELS.get(level_clean)
+
+
+def _parse_salary_expectation(value):
+    """Candidate expectation as float, or None for a neutral (0.5) score"""
+    try:
+        if isinstance(value, str):
+            return float(value.replace(',', '').replace('R$', '').strip())
+        elif value is None:
+            return None
+        return float(value)
+    except (ValueError, AttributeError, TypeError):
+        return None
+
+
+def _parse_salary_range(job_range):
+    """Job range as (min, max), or None for a neutral (0.5) score"""
+    if not job_range:
+        return None
+    try:
+        job_range = str(job_range).replace('R$', '').replace(',', '').strip()
+        if '-' in job_range:
+            min_sal, max_sal = map(float, job_range.split('-'))
+        else:
+            min_sal = max_sal = float(job_range)
+    except (ValueError, AttributeError, TypeError):
+        return None
+    return min_sal, max_sal
+
+
+def _clean_location(location):
+    return location.lower().strip() if location else None
+
+
+def _language_code(level) -> float:
+    """Proficiency code, NaN when no level is given"""
+    if not level:
+        return np.nan
+    return LANGUAGE_LEVELS.get(level.lower().strip(), 0)
+
+
+def _object_array(values: List) -> np.ndarray:
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def _empty_encoding(n: int) -> Dict[str, np.ndarray]:
+    return {
+        'regular': np.ones(n, dtype=bool),
+        'skill_set': _object_array([frozenset()] * n),
+        'num_skills': np.zeros(n, dtype=np.int64),
+        'salary_min': np.zeros(n, dtype=np.float64),
+        'salary_max': np.zeros(n, dtype=np.float64),
+        'salary_neutral': np.zeros(n, dtype=bool),
+        'location': np.full(n, -1, dtype=np.int64),
+        'location_sp': np.zeros(n, dtype=bool),
+        'location_rj': np.zeros(n, dtype=bool),
+        'english': np.full(n, np.nan),
+        'spanish': np.full(n, np.nan)
+    }
+
+
+def _encode_common(encoded: Dict[str, np.ndarray], i: int, skills, salary_value, salary_bounds,
+                   location, english, spanish, locations: Union[SkillVocabulary, LocalVocabulary]):
+    """Fill the per-entity fields shared by candidates and jobs
+    
+    Cleaned locations are stored as their id in ``locations`` (-1 = none),
+    so pairs compare integers.
+    """
+    encoded['skill_set'][i] = _skill_set(skills)
+    encoded['num_skills'][i] = len(skills) if isinstance(skills, list) else 0
+    if salary_bounds is not None:
+        encoded['salary_min'][i], encoded['salary_max'][i] = salary_bounds
+    elif salary_value is not None:
+        encoded['salary_min'][i] = encoded['salary_max'][i] = salary_value
+    else:
+        encoded['salary_neutral'][i] = True
+    location_clean = _clean_location(location)
+    if location_clean is not None:
+        encoded['location'][i] = locations.add(location_clean)
+        encoded['location_sp'][i] = any(city in location_clean for city in ['são paulo', 'sp'])
+        encoded['location_rj'][i] = any(city in location_clean for city in ['rio de janeiro', 'rj'])
+    encoded['english'][i] = _language_code(english)
+    encoded['spanish'][i] = _language_code(spanish)
+
+
+def _take_encoding(encoded: Dict, rows: np.ndarray) -> Dict:
+    """Rows of a per-entity encoding"""
+    return {name: values.take(rows) if isinstance(values, SkillIncidence) else values[rows]
+            for name, values in encoded.items()}
+
+
+def _concat_encodings(parts: List[Dict]) -> Dict:
+    """Stack per-entity encodings with the same fields"""
+    return {name: SkillIncidence.concat([part[name] for part in parts])
+            if isinstance(parts[0][name], SkillIncidence) else np.concatenate([part[name] for part in parts])
+            for name in parts[0]}
+
+
+def _max0(values: np.ndarray) -> np.ndarray:
+    """Elementwise ``max(0.0, value)`` with Python semantics (NaN -> 0.0)"""
+    return np.where(values > 0.0, values, 0.0)
+
+
+def _range_score(values: np.ndarray, low: np.ndarray, high: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized in-range/below/above score used for experience and salary
+
+    Also returns the mask of rows where the scalar version divides by zero.
+    """
+    in_range = (low <= values) & (values <= high)
+    below = ~in_range & (values < low)
+    above = ~in_range & ~below
+    score = np.where(in_range, 1.0,
+                     np.where(below, _max0(1.0 - (low - values) / low), _max0(1.0 - (values - high) / high)))
+    zero_division = (below & (low == 0)) | (above & (high == 0))
+    return score, zero_division
+
+
+def _language_score(candidate: np.ndarray, required: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized ``calculate_language_match`` over proficiency codes"""
+    neutral = np.isnan(candidate) | np.isnan(required)
+    meets = candidate >= required
+    missing = (candidate == 0) & (required > 0)
+    score = np.where(required == -1, 1.0,
+                     np.where(meets, 1.0, np.where(missing, 0.0, _max0(candidate / required))))
+    zero_division = ~neutral & (required != -1) & ~meets & ~missing & (required == 0)
+    return np.where(neutral, 0.5, score), zero_division
+
+
+class ArrayScaler:
+    """Standard scaling from stored mean/scale vectors
+
+    Applies a fitted ``StandardScaler`` without sklearn: same arithmetic,
+    same float64 results.
+    """
+    
+    def __init__(self, mean: np.ndarray, scale: np.ndarray):
+        self.mean_ = mean
+        self.scale_ = scale
+    
+    @classmethod
+    def from_scaler(cls, scaler) -> "ArrayScaler":
+        return cls(np.asarray(scaler.mean_, dtype=np.float64), np.asarray(scaler.scale_, dtype=np.float64))
+    
+    def transform(self, X) -> np.ndarray:
+        X = np.array(X, dtype=np.float64)
+        X -= self.mean_
+        X /= self.scale_
+        return X
+
+
 class FeatureEngineer:
     """Creates features for candidate-job matching model"""
     
-    def __init__(self):
-        self.skill_vectorizer = TfidfVectorizer(max_features=100)
-        self.scaler = StandardScaler()
-        self.location_encoder = LabelEncoder()
-        self.culture_encoder = LabelEncoder()
-        self.fitted = False
+    def __init__(self, scaler=None):
+        if scaler is None:
+            # sklearn is only needed to fit a new scaler
+            from sklearn.preprocessing import StandardScaler
+            scaler = StandardScaler()
+        self.scaler = scaler
+        self.skill_vocabulary = SkillVocabulary()
+        self.location_vocabulary = SkillVocabulary()
+        self.fitted = isinstance(scaler, ArrayScaler)
+    
+    def _skill_vocabulary(self) -> SkillVocabulary:
+        """Shared skill vocabulary (created on demand for older pickles)"""
+        if getattr(self, 'skill_vocabulary', None) is None:
+            self.skill_vocabulary = SkillVocabulary()
+        return self.skill_vocabulary
+    
+    def _vocabularies(self) -> Dict[str, SkillVocabulary]:
+        """Shared id tables of the entity encodings: skills and cleaned locations"""
+        if getattr(self, 'location_vocabulary', None) is None:
+            self.location_vocabulary = SkillVocabulary()
+        return {'skills': self._skill_vocabulary(), 'locations': self.location_vocabulary}
         
     def calculate_skill_match(self, candidate_skills, job_skills) -> float:
         """Calculate skill match percentage between candidate and job"""
@@ -181,9 +423,69 @@ class FeatureEngineer:
         
         return 1.0 if has_sap_skills else 0.2  # Low score if SAP job but no SAP skills
     
-    def create_features(self, vagas_df: pd.DataFrame, applicants_df: pd.DataFrame, 
-                       prospects_df: pd.DataFrame) -> pd.DataFrame:
-        """Create feature matrix for training with Decision data structure"""
+    def _pair_features(self, candidate: pd.Series, vaga: pd.Series) -> Dict:
+        """Compute the feature values of one candidate/job pair"""
+        # Calculate feature scores
+        skill_match = self.calculate_skill_match(
+            candidate.get('conhecimentos_tecnicos', []), 
+            vaga.get('competencias_tecnicas', [])
+        )
+        
+        experience_match = self.calculate_experience_match(
+            candidate.get('anos_experiencia', 0),
+            vaga.get('nivel_profissional', 'Pleno')
+        )
+        
+        salary_match = self.calculate_salary_match(
+            candidate.get('pretensao_salarial', 0),
+            vaga.get('salario_range', '0-0')
+        )
+        
+        location_match = self.calculate_location_match(
+            candidate.get('localizacao', ''),
+            vaga.get('localizacao', '')
+        )
+        
+        # Language matches
+        english_match = self.calculate_language_match(
+            candidate.get('nivel_ingles', ''),
+            vaga.get('nivel_ingles', ''),
+            'inglês'
+        )
+        
+        spanish_match = self.calculate_language_match(
+            candidate.get('nivel_espanhol', ''),
+            vaga.get('nivel_espanhol', ''),
+            'espanhol'
+        )
+        
+        # SAP match
+        sap_match = self.calculate_sap_match(
+            candidate.get('conhecimentos_tecnicos', []),
+            vaga.get('is_sap', False)
+        )
+        
+        # Academic level match (simplified)
+        academic_match = 1.0 if candidate.get('nivel_academico') else 0.5
+        
+        return {
+            'skill_match': skill_match,
+            'experience_match': experience_match,
+            'salary_match': salary_match,
+            'location_match': location_match,
+            'english_match': english_match,
+            'spanish_match': spanish_match,
+            'sap_match': sap_match,
+            'academic_match': academic_match,
+            'candidate_experience_years': candidate.get('anos_experiencia', 0),
+            'num_candidate_skills': len(candidate.get('conhecimentos_tecnicos', [])) if isinstance(candidate.get('conhecimentos_tecnicos'), list) else 0,
+            'num_job_skills': len(vaga.get('competencias_tecnicas', [])) if isinstance(vaga.get('competencias_tecnicas'), list) else 0,
+            'is_sap_job': 1 if vaga.get('is_sap', False) else 0
+        }
+    
+    def create_features_rowwise(self, vagas_df: pd.DataFrame, applicants_df: pd.DataFrame,
+                                prospects_df: pd.DataFrame) -> pd.DataFrame:
+        """Reference implementation of ``create_features``, one pair at a time"""
         features = []
         
         for _, prospect in prospects_df.iterrows():
@@ -200,67 +502,10 @@ class FeatureEngineer:
             candidate = applicants_df[candidate_mask].iloc[0]
             vaga = vagas_df[vaga_mask].iloc[0]
             
-            # Calculate feature scores
-            skill_match = self.calculate_skill_match(
-                candidate.get('conhecimentos_tecnicos', []), 
-                vaga.get('competencias_tecnicas', [])
-            )
-            
-            experience_match = self.calculate_experience_match(
-                candidate.get('anos_experiencia', 0),
-                vaga.get('nivel_profissional', 'Pleno')
-            )
-            
-            salary_match = self.calculate_salary_match(
-                candidate.get('pretensao_salarial', 0),
-                vaga.get('salario_range', '0-0')
-            )
-            
-            location_match = self.calculate_location_match(
-                candidate.get('localizacao', ''),
-                vaga.get('localizacao', '')
-            )
-            
-            # Language matches
-            english_match = self.calculate_language_match(
-                candidate.get('nivel_ingles', ''),
-                vaga.get('nivel_ingles', ''),
-                'inglês'
-            )
-            
-            spanish_match = self.calculate_language_match(
-                candidate.get('nivel_espanhol', ''),
-                vaga.get('nivel_espanhol', ''),
-                'espanhol'
-            )
-            
-            # SAP match
-            sap_match = self.calculate_sap_match(
-                candidate.get('conhecimentos_tecnicos', []),
-                vaga.get('is_sap', False)
-            )
-            
-            # Academic level match (simplified)
-            academic_match = 1.0 if candidate.get('nivel_academico') else 0.5
-            
             # Create feature vector
-            feature_row = {
-                'candidate_id': candidate_id,
-                'job_id': job_id,
-                'skill_match': skill_match,
-                'experience_match': experience_match,
-                'salary_match': salary_match,
-                'location_match': location_match,
-                'english_match': english_match,
-                'spanish_match': spanish_match,
-                'sap_match': sap_match,
-                'academic_match': academic_match,
-                'candidate_experience_years': candidate.get('anos_experiencia', 0),
-                'num_candidate_skills': len(candidate.get('conhecimentos_tecnicos', [])) if isinstance(candidate.get('conhecimentos_tecnicos'), list) else 0,
-                'num_job_skills': len(vaga.get('competencias_tecnicas', [])) if isinstance(vaga.get('competencias_tecnicas'), list) else 0,
-                'is_sap_job': 1 if vaga.get('is_sap', False) else 0,
-                'status': prospect.get('status', 'applied')
-            }
+            feature_row = {'candidate_id': candidate_id, 'job_id': job_id}
+            feature_row.update(self._pair_features(candidate, vaga))
+            feature_row['status'] = prospect.get('status', 'applied')
             
             features.append(feature_row)
         
@@ -269,6 +514,315 @@ class FeatureEngineer:
         
         return features_df
     
+    def create_features(self, vagas_df: pd.DataFrame, applicants_df: pd.DataFrame, 
+                       prospects_df: pd.DataFrame) -> pd.DataFrame:
+        """Create feature matrix for training with Decision data structure
+
+        Batch engine: every candidate and job referenced by the prospects is
+        parsed once into per-entity arrays, then all feature columns are
+        computed for the whole prospect table with array operations.
+        Results are identical to ``create_features_rowwise``; pairs whose
+        inputs fall outside the regular value space (unparseable entities,
+        zero-width ranges) are routed through the scalar functions.
+        """
+        if prospects_df.empty:
+            features_df = pd.DataFrame()
+            logger.info(f"Created {len(features_df)} feature rows")
+            return features_df
+        
+        # Hash join prospects -> first matching candidate/job row
+        candidate_ids = prospects_df['candidate_id'].to_numpy(dtype=object)
+        job_ids = prospects_df['job_id'].to_numpy(dtype=object)
+        candidate_rows = lookup_positions(build_position_index(applicants_df, 'candidate_id'), candidate_ids)
+        job_rows = lookup_positions(build_position_index(vagas_df, 'job_id'), job_ids)
+        
+        keep = (candidate_rows >= 0) & (job_rows >= 0)
+        if not keep.any():
+            features_df = pd.DataFrame()
+            logger.info(f"Created {len(features_df)} feature rows")
+            return features_df
+        
+        candidate_rows = candidate_rows[keep]
+        job_rows = job_rows[keep]
+        
+        # Parse each referenced entity once; skills and locations outside the
+        # shared vocabularies (request payloads) only get ids local to this call
+        candidate_positions, candidate_idx = np.unique(candidate_rows, return_inverse=True)
+        job_positions, job_idx = np.unique(job_rows, return_inverse=True)
+        vocabularies = {name: LocalVocabulary(vocabulary) for name, vocabulary in self._vocabularies().items()}
+        candidates = self._encode_candidates(applicants_df, candidate_positions, vocabularies)
+        jobs = self._encode_jobs(vagas_df, job_positions, vocabularies)
+        
+        columns, fallback = self._batch_pair_features(candidates, candidate_idx, jobs, job_idx)
+        self._apply_scalar_fallback(columns, fallback, applicants_df, candidate_rows, vagas_df, job_rows)
+        
+        if 'status' in prospects_df.columns:
+            status = prospects_df['status'].to_numpy(dtype=object)[keep].tolist()
+        else:
+            status = ['applied'] * len(candidate_rows)
+        
+        features_df = pd.DataFrame({
+            'candidate_id': candidate_ids[keep].tolist(),
+            'job_id': job_ids[keep].tolist(),
+            **{name: columns[name] for name in FEATURE_COLUMNS},
+            'status': status
+        })
+        logger.info(f"Created {len(features_df)} feature rows")
+        
+        return features_df
+    
+    def encode_candidates(self, applicants_df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Encode every distinct candidate once, for repeated block scoring"""
+        index = build_position_index(applicants_df, 'candidate_id')
+        positions = np.fromiter(index.values(), dtype=np.int64, count=len(index))
+        encoded = self._encode_candidates(applicants_df, positions)
+        encoded['ids'] = _object_array(list(index))
+        encoded['positions'] = positions
+        return encoded
+    
+    def reencode_candidates(self, previous: Dict[str, np.ndarray], applicants_df: pd.DataFrame,
+                            unchanged_ids: set) -> Dict[str, np.ndarray]:
+        """``encode_candidates`` for an updated table, reusing ``previous`` rows
+        
+        Only candidates that are new or not in ``unchanged_ids`` are parsed
+        again; ``previous`` must come from this feature engineer (its skill
+        ids refer to this vocabulary).
+        """
+        index = build_position_index(applicants_df, 'candidate_id')
+        ids = list(index)
+        positions = np.fromiter(index.values(), dtype=np.int64, count=len(index))
+        previous_rows = {candidate_id: row for row, candidate_id in enumerate(previous['ids'].tolist())}
+        reused = np.array([previous_rows.get(candidate_id, -1) if candidate_id in unchanged_ids else -1
+                           for candidate_id in ids], dtype=np.int64)
+        
+        fresh = np.flatnonzero(reused < 0)
+        kept = np.flatnonzero(reused >= 0)
+        fields = [name for name in previous if name not in ('ids', 'positions')]
+        parts = [
+            _take_encoding({name: previous[name] for name in fields}, reused[kept]),
+            self._encode_candidates(applicants_df, positions[fresh])
+        ]
+        # Stacked as [kept, fresh]; put the rows back in table order
+        order = np.argsort(np.concatenate([kept, fresh]), kind='stable')
+        encoded = _take_encoding(_concat_encodings(parts), order)
+        encoded['ids'] = _object_array(ids)
+        encoded['positions'] = positions
+        logger.info(f"Re-encoded {len(fresh)} of {len(ids)} candidates")
+        return encoded
+    
+    def patch_candidates(self, previous: Dict[str, np.ndarray], applicants_df: pd.DataFrame,
+                         positions: np.ndarray) -> Dict[str, np.ndarray]:
+        """``encode_candidates`` for a table whose rows at ``positions`` were overwritten or appended
+        
+        Every other row must have kept its position, so only the given rows
+        are parsed and the rest of ``previous`` is copied over as is.
+        ``previous`` must come from this feature engineer.
+        """
+        positions = np.unique(np.asarray(positions, dtype=np.int64))
+        n_previous = len(previous['positions'])
+        rows = np.searchsorted(previous['positions'], positions)
+        replaced = rows < n_previous
+        replaced[replaced] = previous['positions'][rows[replaced]] == positions[replaced]
+        
+        fields = [name for name in previous if name not in ('ids', 'positions')]
+        fresh = self._encode_candidates(applicants_df, positions)
+        # Stacked as [previous, fresh]: replaced rows point into fresh, appended ones follow
+        order = np.arange(n_previous + int((~replaced).sum()), dtype=np.int64)
+        order[rows[replaced]] = n_previous + np.flatnonzero(replaced)
+        order[n_previous:] = n_previous + np.flatnonzero(~replaced)
+        encoded = _take_encoding(_concat_encodings([{name: previous[name] for name in fields}, fresh]), order)
+        
+        appended = positions[~replaced]
+        ids = applicants_df['candidate_id'].to_numpy(dtype=object)[appended]
+        encoded['ids'] = np.concatenate([previous['ids'], _object_array(ids.tolist())])
+        encoded['positions'] = np.concatenate([previous['positions'], appended])
+        logger.info(f"Re-encoded {len(positions)} of {len(encoded['ids'])} candidates")
+        return encoded
+    
+    def encode_jobs(self, vagas_df: pd.DataFrame, job_ids: List[str]) -> Dict[str, np.ndarray]:
+        """Encode the given jobs, in order, for block scoring"""
+        index = build_position_index(vagas_df, 'job_id')
+        missing = [job_id for job_id in job_ids if job_id not in index]
+        if missing:
+            raise ValueError(f"Unknown job ids: {missing}")
+        positions = np.array([index[job_id] for job_id in job_ids], dtype=np.int64)
+        encoded = self._encode_jobs(vagas_df, positions)
+        encoded['ids'] = _object_array(list(job_ids))
+        encoded['positions'] = positions
+        return encoded
+    
+    def block_features(self, candidates: Dict[str, np.ndarray], candidate_idx: np.ndarray,
+                       jobs: Dict[str, np.ndarray], job_idx: np.ndarray,
+                       applicants_df: pd.DataFrame, vagas_df: pd.DataFrame) -> pd.DataFrame:
+        """Feature rows for pairs of pre-encoded candidates and jobs
+
+        ``candidate_idx``/``job_idx`` index the encodings returned by
+        ``encode_candidates``/``encode_jobs``; the source tables are only
+        read for pairs that need the scalar fallback.
+        """
+        columns, fallback = self._batch_pair_features(candidates, candidate_idx, jobs, job_idx)
+        self._apply_scalar_fallback(columns, fallback, applicants_df, candidates['positions'][candidate_idx],
+                                    vagas_df, jobs['positions'][job_idx])
+        return pd.DataFrame({name: columns[name] for name in FEATURE_COLUMNS})
+    
+    def transform_features(self, features_df: pd.DataFrame) -> pd.DataFrame:
+        """Scale model input columns with the fitted scaler"""
+        X = features_df[FEATURE_COLUMNS]
+        return pd.DataFrame(self.scaler.transform(X), columns=X.columns)
+    
+    def job_block(self, candidates: Dict[str, np.ndarray], jobs: Dict[str, np.ndarray], job_number: int,
+                  start: int, stop: int, applicants_df: pd.DataFrame, vagas_df: pd.DataFrame) -> pd.DataFrame:
+        """Scaled model inputs for one job against candidates ``start:stop``"""
+        candidate_idx = np.arange(start, stop)
+        job_idx = np.full(stop - start, job_number)
+        features_df = self.block_features(candidates, candidate_idx, jobs, job_idx, applicants_df, vagas_df)
+        return self.transform_features(features_df)
+    
+    def _apply_scalar_fallback(self, columns: Dict, fallback: np.ndarray, applicants_df: pd.DataFrame,
+                               candidate_rows: np.ndarray, vagas_df: pd.DataFrame, job_rows: np.ndarray):
+        """Recompute flagged pairs with the scalar functions, in place"""
+        for row in np.flatnonzero(fallback).tolist():
+            values = self._pair_features(applicants_df.iloc[candidate_rows[row]], vagas_df.iloc[job_rows[row]])
+            for name, value in values.items():
+                columns[name][row] = value
+    
+    def _encode_candidates(self, applicants_df: pd.DataFrame, positions: np.ndarray,
+                           vocabularies: Dict = None) -> Dict[str, np.ndarray]:
+        """Parse candidate rows into the per-entity arrays of the batch engine
+        
+        Skill and location ids come from ``vocabularies`` (as returned by
+        ``_vocabularies``), the shared ones by default.
+        """
+        vocabularies = vocabularies if vocabularies is not None else self._vocabularies()
+        skills = _column(applicants_df, 'conhecimentos_tecnicos', [], positions)
+        years = _column(applicants_df, 'anos_experiencia', 0, positions)
+        salaries = _column(applicants_df, 'pretensao_salarial', 0, positions)
+        locations = _column(applicants_df, 'localizacao', '', positions)
+        english = _column(applicants_df, 'nivel_ingles', '', positions)
+        spanish = _column(applicants_df, 'nivel_espanhol', '', positions)
+        academic = _column(applicants_df, 'nivel_academico', None, positions)
+        
+        n = len(positions)
+        encoded = _empty_encoding(n)
+        encoded['years'] = np.zeros(n, dtype=np.int64)
+        encoded['has_sap'] = np.zeros(n, dtype=bool)
+        encoded['academic_match'] = np.zeros(n, dtype=np.float64)
+        encoded['raw_years'] = years
+        
+        for i in range(n):
+            try:
+                _encode_common(encoded, i, skills[i], salary_value=_parse_salary_expectation(salaries[i]),
+                               salary_bounds=None, location=locations[i], english=english[i], spanish=spanish[i],
+                               locations=vocabularies['locations'])
+                encoded['years'][i] = _parse_years(years[i])
+                encoded['has_sap'][i] = _has_sap_skills(skills[i])
+                encoded['academic_match'][i] = 1.0 if academic[i] else 0.5
+            except Exception:
+                encoded['regular'][i] = False
+        
+        encoded['skills'] = SkillIncidence.from_sets(encoded.pop('skill_set'), vocabularies['skills'])
+        return encoded
+    
+    def _encode_jobs(self, vagas_df: pd.DataFrame, positions: np.ndarray,
+                     vocabularies: Dict = None) -> Dict[str, np.ndarray]:
+        """Parse job rows into the per-entity arrays of the batch engine (ids as ``_encode_candidates``)"""
+        vocabularies = vocabularies if vocabularies is not None else self._vocabularies()
+        skills = _column(vagas_df, 'competencias_tecnicas', [], positions)
+        levels = _column(vagas_df, 'nivel_profissional', 'Pleno', positions)
+        salary_ranges = _column(vagas_df, 'salario_range', '0-0', positions)
+        locations = _column(vagas_df, 'localizacao', '', positions)
+        english = _column(vagas_df, 'nivel_ingles', '', positions)
+        spanish = _column(vagas_df, 'nivel_espanhol', '', positions)
+        is_sap = _column(vagas_df, 'is_sap', False, positions)
+        
+        n = len(positions)
+        encoded = _empty_encoding(n)
+        encoded['level_min'] = np.zeros(n, dtype=np.int64)
+        encoded['level_max'] = np.zeros(n, dtype=np.int64)
+        encoded['level_known'] = np.zeros(n, dtype=bool)
+        encoded['salary_max'] = np.zeros(n, dtype=np.float64)
+        encoded['is_sap'] = np.zeros(n, dtype=bool)
+        
+        for i in range(n):
+            try:
+                _encode_common(encoded, i, skills[i], salary_value=None,
+                               salary_bounds=_parse_salary_range(salary_ranges[i]), location=locations[i],
+                               english=english[i], spanish=spanish[i], locations=vocabularies['locations'])
+                bounds = _parse_level(levels[i])
+                if bounds is not None:
+                    encoded['level_min'][i], encoded['level_max'][i] = bounds
+                    encoded['level_known'][i] = True
+                encoded['is_sap'][i] = bool(is_sap[i])
+            except Exception:
+                encoded['regular'][i] = False
+        
+        encoded['skills'] = SkillIncidence.from_sets(encoded.pop('skill_set'), vocabularies['skills'])
+        return encoded
+    
+    def _batch_pair_features(self, candidates: Dict[str, np.ndarray], candidate_idx: np.ndarray,
+                             jobs: Dict[str, np.ndarray], job_idx: np.ndarray) -> Tuple[Dict, np.ndarray]:
+        """Gather per-entity arrays by pair index and compute every feature column
+
+        Returns the feature columns and a mask of the pairs that must be
+        recomputed with the scalar functions.
+        """
+        def gather(name):
+            return candidates[name][candidate_idx], jobs[name][job_idx]
+        
+        fallback = ~(candidates['regular'][candidate_idx] & jobs['regular'][job_idx])
+        
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            # Skills: Jaccard from sparse skill incidence rows
+            skill_match = jaccard_pairs(candidates['skills'], jobs['skills'], candidate_idx, job_idx)
+            
+            # Experience: years against the level band
+            years = candidates['years'][candidate_idx]
+            level_min, level_max = jobs['level_min'][job_idx], jobs['level_max'][job_idx]
+            experience_match, zero_division = _range_score(years, level_min, level_max)
+            experience_match = np.where(jobs['level_known'][job_idx], experience_match, 0.5)
+            fallback |= jobs['level_known'][job_idx] & zero_division
+            
+            # Salary: expectation against the job range
+            salary = candidates['salary_min'][candidate_idx]
+            salary_min, salary_max = jobs['salary_min'][job_idx], jobs['salary_max'][job_idx]
+            salary_neutral = candidates['salary_neutral'][candidate_idx] | jobs['salary_neutral'][job_idx]
+            salary_match, zero_division = _range_score(salary, salary_min, salary_max)
+            salary_match = np.where(salary_neutral, 0.5, salary_match)
+            fallback |= ~salary_neutral & zero_division
+            
+            # Location: same place or same metro area
+            candidate_location, job_location = gather('location')
+            candidate_sp, job_sp = gather('location_sp')
+            candidate_rj, job_rj = gather('location_rj')
+            location_match = np.where(
+                (candidate_location == job_location) | (candidate_sp & job_sp) | (candidate_rj & job_rj), 1.0, 0.3)
+            location_match = np.where((candidate_location < 0) | (job_location < 0), 0.5, location_match)
+            
+            # Languages: proficiency codes
+            english_match, zero_division = _language_score(*gather('english'))
+            fallback |= zero_division
+            spanish_match, zero_division = _language_score(*gather('spanish'))
+            fallback |= zero_division
+            
+            sap_match = np.where(jobs['is_sap'][job_idx],
+                                 np.where(candidates['has_sap'][candidate_idx], 1.0, 0.2), 1.0)
+        
+        columns = {
+            'skill_match': skill_match,
+            'experience_match': experience_match,
+            'salary_match': salary_match,
+            'location_match': location_match,
+            'english_match': english_match,
+            'spanish_match': spanish_match,
+            'sap_match': sap_match,
+            'academic_match': candidates['academic_match'][candidate_idx],
+            'candidate_experience_years': candidates['raw_years'][candidate_idx].tolist(),
+            'num_candidate_skills': candidates['num_skills'][candidate_idx],
+            'num_job_skills': jobs['num_skills'][job_idx],
+            'is_sap_job': jobs['is_sap'][job_idx].astype(np.int64)
+        }
+        return columns, fallback
+    
     def create_target_variable(self, features_df: pd.DataFrame) -> pd.Series:
         """Create target variable based on application status"""
         # Map status to binary target (1 = successful match, 0 = unsuccessful)
@@ -308,12 +862,7 @@ class FeatureEngineer:
         target = self.create_target_variable(features_df)
         
         # Select feature columns for training (updated for Decision data)
-        feature_columns = [
-            'skill_match', 'experience_match', 'salary_match', 
-            'location_match', 'english_match', 'spanish_match',
-            'sap_match', 'academic_match', 'candidate_experience_years',
-            'num_candidate_skills', 'num_job_skills', 'is_sap_job'
-        ]
+        feature_columns = FEATURE_COLUMNS
         
         # Ensure all feature columns exist
         available_columns = [col for col in feature_columns if col in features_df.columns]
@@ -0,0 +1,145 @@
+"""
+Sparse skill incidence matrices for batched skill matching
+"""
+import numpy as np
+import threading
+from scipy import sparse
+from typing import Dict, Iterable, Optional, Sequence, Union
+
+
+class SkillVocabulary:
+    """Maps every normalized skill (or other string, such as a cleaned location) to a stable integer id"""
+
+    def __init__(self):
+        self.index: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __getstate__(self):
+        return {'index': self.index}
+
+    def __setstate__(self, state):
+        self.index = state['index']
+        self._lock = threading.Lock()
+
+    def add(self, skill: str) -> int:
+        """Get the id of a skill, assigning a new one if unseen"""
+        skill_id = self.index.get(skill)
+        if skill_id is None:
+            with self._lock:
+                skill_id = self.index.setdefault(skill, len(self.index))
+        return skill_id
+
+    def lookup(self, skill: str) -> Optional[int]:
+        return self.index.get(skill)
+
+
+class LocalVocabulary:
+    """Read-only view of a shared vocabulary, with private ids for the skills it lacks
+
+    For transient input (request payloads): the shared vocabulary never
+    grows, and unknown skills get ids past the shared ones that existed
+    when the view was created, consistent across every matrix built
+    through the same view. Matrices built through different views must
+    not be compared with each other.
+    """
+
+    def __init__(self, shared: SkillVocabulary):
+        self.shared = shared
+        self.offset = len(shared)
+        self.local: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return self.offset + len(self.local)
+
+    def add(self, skill: str) -> int:
+        """Shared id of a known skill, or an id private to this view"""
+        skill_id = self.shared.lookup(skill)
+        # Ids assigned to the shared vocabulary after this view was created are not ours
+        if skill_id is not None and skill_id < self.offset:
+            return skill_id
+        skill_id = self.local.get(skill)
+        if skill_id is None:
+            skill_id = self.local[skill] = self.offset + len(self.local)
+        return skill_id
+
+
+class SkillIncidence:
+    """Binary entity x skill matrix in CSR layout
+
+    Row ``i`` holds the skill ids of entity ``i``; ``sizes`` keeps the number
+    of distinct skills per row, which is the set size used by the Jaccard
+    similarity.
+    """
+
+    def __init__(self, matrix: sparse.csr_matrix):
+        self.matrix = matrix
+        self.sizes = np.diff(matrix.indptr).astype(np.int64)
+
+    @classmethod
+    def from_sets(cls, skill_sets: Sequence[Iterable[str]],
+                  vocabulary: Union[SkillVocabulary, LocalVocabulary]) -> "SkillIncidence":
+        """Build the matrix from normalized skill sets, growing the vocabulary"""
+        indptr = np.zeros(len(skill_sets) + 1, dtype=np.int64)
+        indices = []
+        for row, skills in enumerate(skill_sets):
+            ids = sorted(vocabulary.add(skill) for skill in skills)
+            indices.extend(ids)
+            indptr[row + 1] = len(indices)
+        indices = np.asarray(indices, dtype=np.int32)
+        data = np.ones(len(indices), dtype=np.int32)
+        matrix = sparse.csr_matrix((data, indices, indptr), shape=(len(skill_sets), len(vocabulary)))
+        return cls(matrix)
+
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
+
+    def take(self, rows: np.ndarray) -> "SkillIncidence":
+        """The given rows, in order"""
+        return SkillIncidence(self.matrix[rows])
+
+    @classmethod
+    def concat(cls, parts: Sequence["SkillIncidence"]) -> "SkillIncidence":
+        """Rows of every part, stacked (parts must share a vocabulary)"""
+        width = max(part.matrix.shape[1] for part in parts)
+        return cls(sparse.vstack([part.with_width(width) for part in parts], format='csr'))
+
+    def with_width(self, width: int) -> sparse.csr_matrix:
+        """The matrix padded to ``width`` skill columns (no copy of the data)"""
+        if self.matrix.shape[1] == width:
+            return self.matrix
+        return sparse.csr_matrix((self.matrix.data, self.matrix.indices, self.matrix.indptr),
+                                 shape=(self.matrix.shape[0], width))
+
+
+def _aligned(left: SkillIncidence, right: SkillIncidence):
+    width = max(left.matrix.shape[1], right.matrix.shape[1])
+    return left.with_width(width), right.with_width(width)
+
+
+def _jaccard(intersections: np.ndarray, left_sizes: np.ndarray, right_sizes: np.ndarray) -> np.ndarray:
+    """|A & B| / |A | B|, 0.0 when either set is empty"""
+    unions = left_sizes + right_sizes - intersections
+    empty = (left_sizes == 0) | (right_sizes == 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        similarity = intersections / unions
+    return np.where(empty, 0.0, similarity)
+
+
+def pair_intersections(left: SkillIncidence, right: SkillIncidence,
+                       left_idx: np.ndarray, right_idx: np.ndarray) -> np.ndarray:
+    """Shared skill counts for the row pairs ``(left_idx[k], right_idx[k])``"""
+    left_matrix, right_matrix = _aligned(left, right)
+    if len(left_idx) == 0:
+        return np.zeros(0, dtype=np.int64)
+    shared = left_matrix[left_idx].multiply(right_matrix[right_idx])
+    return np.asarray(shared.sum(axis=1), dtype=np.int64).ravel()
+
+
+def jaccard_pairs(left: SkillIncidence, right: SkillIncidence,
+                  left_idx: np.ndarray, right_idx: np.ndarray) -> np.ndarray:
+    """Jaccard similarity for a batch of row pairs"""
+    intersections = pair_intersections(left, right, left_idx, right_idx)
+    return _jaccard(intersections, left.sizes[left_idx], right.sizes[right_idx])
@@ -0,0 +1,122 @@
+"""
+Pickle-free model artifact: manifest plus raw NumPy arrays
+"""
+import numpy as np
+import json
+import logging
+import os
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from features.feature_engineering import ArrayScaler, FeatureEngineer
+from .candidate_job_matcher import CandidateJobMatcher
+from .compiled_forest import CompiledForest
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+DEFAULT_ARTIFACT_DIR = "models/matcher_artifact"
+
+
+def read_manifest(artifact_dir: Path) -> Optional[Dict]:
+    """Manifest of an artifact directory, or None if there is no usable artifact"""
+    try:
+        with open(Path(artifact_dir) / MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if manifest.get('format_version') != ARTIFACT_FORMAT_VERSION:
+        logger.warning(f"Unsupported model artifact format: {manifest.get('format_version')}")
+        return None
+    return manifest
+
+
+def save_artifact(artifact_dir: Path, matcher: CandidateJobMatcher, feature_engineer: FeatureEngineer) -> Dict:
+    """Write the trained matcher and fitted scaler as a new artifact generation
+
+    Arrays are written first and the manifest last (atomically), so readers
+    only ever see complete generations. The generation being replaced is
+    kept on disk, since serving processes may still have it memory-mapped
+    or be about to open it until their watcher notices the new one; older
+    generations are removed.
+    """
+    if not matcher.is_trained:
+        raise ValueError("Cannot save untrained model")
+
+    artifact_dir = Path(artifact_dir)
+    artifact_dir.mkdir(parents=True, exist_ok=True)
+    generation = uuid.uuid4().hex[:12]
+    previous = read_manifest(artifact_dir)
+
+    compiled = matcher.compile()
+    arrays = dict(compiled.to_arrays())
+    importance = matcher.get_feature_importance().set_index('feature')['importance']
+    arrays['feature_importances'] = importance.reindex(matcher.feature_names).to_numpy(dtype=np.float64)
+    arrays['classes'] = np.asarray(matcher.model.classes_ if matcher.model is not None else matcher.classes)
+    scaler = ArrayScaler.from_scaler(feature_engineer.scaler)
+    arrays['scaler_mean'] = scaler.mean_
+    arrays['scaler_scale'] = scaler.scale_
+
+    files = {}
+    for name, array in arrays.items():
+        filename = f"{generation}-{name}.npy"
+        np.save(artifact_dir / filename, np.ascontiguousarray(array), allow_pickle=False)
+        files[name] = filename
+
+    manifest = {
+        'format_version': ARTIFACT_FORMAT_VERSION,
+        'model_version': generation,
+        'created_at': datetime.now().isoformat(),
+        'feature_names': list(matcher.feature_names),
+        'n_trees': compiled.n_trees,
+        'max_depth': compiled.max_depth,
+        'files': files
+    }
+    tmp_path = artifact_dir / f"{MANIFEST_FILE}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, artifact_dir / MANIFEST_FILE)
+
+    keep = {generation, previous['model_version'] if previous else generation}
+    for path in artifact_dir.glob("*.npy"):
+        if path.name.split('-', 1)[0] not in keep:
+            path.unlink(missing_ok=True)
+
+    logger.info(f"Model artifact {generation} saved to {artifact_dir}")
+    return manifest
+
+
+def load_artifact(artifact_dir: Path, mmap: bool = True) -> Tuple[CandidateJobMatcher, FeatureEngineer]:
+    """Load a matcher and feature engineer from an artifact directory
+
+    With ``mmap`` the arrays are memory-mapped read-only, so loading is
+    near-instant and processes serving the same artifact share its pages.
+    Nothing here imports sklearn.
+    """
+    artifact_dir = Path(artifact_dir)
+    manifest = read_manifest(artifact_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"No model artifact in {artifact_dir}")
+
+    mmap_mode = 'r' if mmap else None
+    arrays = {name: np.load(artifact_dir / filename, mmap_mode=mmap_mode, allow_pickle=False)
+              for name, filename in manifest['files'].items()}
+
+    compiled = CompiledForest(
+        **{name: arrays[name] for name in CompiledForest.ARRAY_NAMES},
+        max_depth=manifest['max_depth'],
+        feature_names=manifest['feature_names']
+    )
+    matcher = CandidateJobMatcher.from_compiled(
+        compiled,
+        classes=np.asarray(arrays['classes']),
+        feature_importances=np.asarray(arrays['feature_importances']),
+        model_version=manifest['model_version']
+    )
+    feature_engineer = FeatureEngineer(scaler=ArrayScaler(arrays['scaler_mean'], arrays['scaler_scale']))
+
+    logger.info(f"Model artifact {manifest['model_version']} loaded from {artifact_dir}")
+    return matcher, feature_engineer
@@ -3,21 +3,94 @@ Candidate-Job Matching Model
 """
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split, cross_val_score
-from sklearn.metrics import classification_report, roc_auc_score, precision_recall_curve
 import joblib
+import hashlib
 import logging
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Tuple, Any
+from typing import Dict, List, Tuple, Any
+
+from monitoring.metrics import stage_timer
+from .compiled_forest import CompiledForest
 
 logger = logging.getLogger(__name__)
 
+# Inputs up to this many rows are scored with the compiled forest; sklearn's
+# Cython traversal wins on larger ones
+COMPILED_MAX_ROWS = 1024
+
+# Features reported as the key factors of a prediction
+N_KEY_FACTORS = 3
+
+# Recommendation buckets, lowest match first
+RECOMMENDATIONS = np.array(["low_match", "medium_match", "high_match"], dtype=object)
+
+# Early-exit scoring: trees per step, and the bound deciding when a bucket is settled.
+# "exact" never changes a bucket; "normal" stops sooner but assumes the trees come in random order
+EARLY_EXIT_CHUNK_SIZE = 8
+EARLY_EXIT_BOUND = "exact"
+EARLY_EXIT_DELTA = 0.001
+
+
+def top_k_order(scores: np.ndarray, k: int) -> np.ndarray:
+    """Positions of the ``k`` highest scores, best first
+    
+    Uses a partial selection instead of sorting every score; ties are
+    ranked by position so the result equals a full stable sort.
+    """
+    k = max(0, min(k, len(scores)))
+    if k == 0:
+        return np.zeros(0, dtype=np.int64)
+    if k < len(scores):
+        threshold = scores[np.argpartition(-scores, k - 1)[k - 1]]
+        above = np.flatnonzero(scores > threshold)
+        ties = np.flatnonzero(scores == threshold)[:k - len(above)]
+        selected = np.concatenate([above, ties])
+    else:
+        selected = np.arange(len(scores))
+    return selected[np.lexsort((selected, -scores[selected]))]
+
+
+def recommendation_levels(match_scores: np.ndarray) -> np.ndarray:
+    """Position in ``RECOMMENDATIONS`` of every match score's bucket
+    
+    Non-decreasing in the match score, so two scores in the same bucket
+    have every score between them in that bucket too.
+    """
+    match_scores = np.asarray(match_scores, dtype=np.float64)
+    # Confidence based on how far the probability is from 0.5
+    confidence = np.abs(match_scores - 0.5) * 2
+    high = (match_scores >= 0.7) & (confidence >= 0.4)
+    medium = (match_scores >= 0.5) & (confidence >= 0.2)
+    return np.where(high, 2, medium.astype(np.int64))
+
+
+def interpret_match_scores(match_scores: np.ndarray) -> Dict[str, np.ndarray]:
+    """Confidence and recommendation bucket of every match score, as arrays
+    
+    Elementwise identical to ``CandidateJobMatcher._interpret_match_score``.
+    """
+    match_scores = np.asarray(match_scores, dtype=np.float64)
+    confidence = np.abs(match_scores - 0.5) * 2
+    recommendation = RECOMMENDATIONS[recommendation_levels(match_scores)]
+    return {'match_score': match_scores, 'confidence': confidence, 'recommendation': recommendation}
+
+
+def same_recommendation(lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
+    """Whether every score in ``[lower, upper]`` gets the same recommendation"""
+    return recommendation_levels(lower) == recommendation_levels(upper)
+
+
 class CandidateJobMatcher:
     """Machine Learning model for candidate-job matching"""
     
     def __init__(self, model_params: Dict = None):
         """Initialize the matcher with model parameters"""
+        # Imported here so serving from a model artifact never loads sklearn
+        from sklearn.ensemble import RandomForestClassifier
+        
         default_params = {
             'n_estimators': 100,
             'max_depth': 10,
@@ -30,12 +103,42 @@ class CandidateJobMatcher:
         if model_params:
             default_params.update(model_params)
             
-        self.model = RandomForestClassifier(**default_params)
+        self._init_state(RandomForestClassifier(**default_params))
+    
+    def _init_state(self, model):
+        self.model = model
         self.feature_names = None
         self.is_trained = False
+        # Identifies the fitted model, e.g. to key cached predictions
+        self.model_version = None
+        # Array-compiled copy of the forest for low-latency scoring of small inputs
+        self.compiled_forest = None
+        self.compiled_max_rows = COMPILED_MAX_ROWS
+        # Kept alongside the compiled forest when there is no sklearn model
+        self.classes = None
+        self.feature_importances = None
+        # Importance ranking of the current model, built on first use
+        self._importance_ranking = None
+    
+    @classmethod
+    def from_compiled(cls, compiled_forest: CompiledForest, classes: np.ndarray,
+                      feature_importances: np.ndarray, model_version: str) -> "CandidateJobMatcher":
+        """A trained matcher that scores with a compiled forest only (no sklearn)"""
+        matcher = cls.__new__(cls)
+        matcher._init_state(None)
+        matcher.compiled_forest = compiled_forest
+        matcher.feature_names = list(compiled_forest.feature_names)
+        matcher.classes = classes
+        matcher.feature_importances = feature_importances
+        matcher.model_version = model_version
+        matcher.is_trained = True
+        return matcher
         
     def train(self, X: pd.DataFrame, y: pd.Series) -> Dict[str, float]:
         """Train the matching model"""
+        from sklearn.model_selection import train_test_split, cross_val_score
+        from sklearn.metrics import classification_report, roc_auc_score
+        
         logger.info("Starting model training...")
         
         # Store feature names
@@ -90,7 +193,7 @@ class CandidateJobMatcher:
         # Feature importance
         feature_importance = pd.DataFrame({
             'feature': self.feature_names,
-            'importance': self.model.feature_importances_
+            'importance': self.model.feature_importances_ if self.model is not None else self.feature_importances
         }).sort_values('importance', ascending=False)
         
         logger.info(f"Model training completed. Test AUC: {roc_auc:.3f}")
@@ -103,36 +206,115 @@ class CandidateJobMatcher:
         logger.info(f"\n{classification_report(y_test, y_pred)}")
         
         self.is_trained = True
+        self.model_version = f"trained-{uuid.uuid4().hex[:12]}"
+        self._importance_ranking = None
+        self.compile()
         return metrics
     
     def predict(self, X: pd.DataFrame) -> np.ndarray:
         """Make predictions on new data"""
         if not self.is_trained:
             raise ValueError("Model must be trained before making predictions")
-            
+        
+        if self.model is None:
+            return self.classes[np.argmax(self.predict_proba(X), axis=1)]
         return self.model.predict(X)
     
     def predict_proba(self, X: pd.DataFrame) -> np.ndarray:
         """Get prediction probabilities"""
         if not self.is_trained:
             raise ValueError("Model must be trained before making predictions")
-            
+        
+        # Same probabilities either way; the compiled forest skips sklearn's per-call overhead
+        if self.model is None or (self.compiled_forest is not None and len(X) <= self.compiled_max_rows):
+            return self.compiled_forest.predict_proba(X)
         return self.model.predict_proba(X)
     
+    def compile(self) -> CompiledForest:
+        """Export the trained forest into flat arrays for fast inference"""
+        if not self.is_trained:
+            raise ValueError("Model must be trained first")
+        if self.model is None:
+            return self.compiled_forest
+        
+        self.compiled_forest = CompiledForest.from_sklearn(self.model, self.feature_names)
+        return self.compiled_forest
+    
     def get_match_score(self, X: pd.DataFrame) -> float:
         """Get match score (probability of positive class)"""
         probabilities = self.predict_proba(X)
         return probabilities[0, 1] if len(probabilities) > 0 else 0.0
     
+    def score_candidates(self, feature_engineer, vagas_df: pd.DataFrame, applicants_df: pd.DataFrame,
+                         job_ids: List[str], block_size: int = 4096, n_workers: int = None,
+                         candidates: Dict[str, np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Score every candidate against each job in ``job_ids``
+
+        Pairs are built and scored in blocks of ``block_size`` candidates
+        spread over a thread pool (``n_workers``, default: all cores), so
+        memory stays bounded by the block size. ``candidates`` can be a
+        cached ``FeatureEngineer.encode_candidates`` result.
+
+        Returns a ``(len(job_ids), n_candidates)`` matrix of match scores
+        and the candidate ids of its columns.
+        """
+        if not self.is_trained:
+            raise ValueError("Model must be trained before making predictions")
+        
+        candidates = candidates if candidates is not None else feature_engineer.encode_candidates(applicants_df)
+        jobs = feature_engineer.encode_jobs(vagas_df, job_ids)
+        n_candidates = len(candidates['positions'])
+        scores = np.empty((len(job_ids), n_candidates), dtype=np.float64)
+        
+        def score_block(task):
+            job_number, start, stop = task
+            X = feature_engineer.job_block(candidates, jobs, job_number, start, stop, applicants_df, vagas_df)
+            scores[job_number, start:stop] = self.predict_proba(X[self.feature_names])[:, 1]
+        
+        tasks = [(job_number, start, min(start + block_size, n_candidates))
+                 for job_number in range(len(job_ids))
+                 for start in range(0, n_candidates, block_size)]
+        with ThreadPoolExecutor(max_workers=n_workers or os.cpu_count()) as executor:
+            list(executor.map(score_block, tasks))
+        
+        return scores, candidates['ids']
+    
+    def top_candidates(self, feature_engineer, vagas_df: pd.DataFrame, applicants_df: pd.DataFrame,
+                       job_id: str, k: int = 50, offset: int = 0, block_size: int = 4096,
+                       n_workers: int = None, candidates: Dict[str, np.ndarray] = None) -> Tuple[List[Tuple[str, float]], int]:
+        """Best candidates for a job, ranked by match score
+        
+        Scores the whole candidate pool and returns ranks ``offset`` to
+        ``offset + k`` as ``(candidate_id, score)`` tuples, together with the
+        size of the pool.
+        """
+        scores, candidate_ids = self.score_candidates(
+            feature_engineer, vagas_df, applicants_df, [job_id],
+            block_size=block_size, n_workers=n_workers, candidates=candidates
+        )
+        scores = scores[0]
+        order = top_k_order(scores, offset + k)[offset:]
+        return [(candidate_ids[i], float(scores[i])) for i in order.tolist()], len(scores)
+    
     def get_feature_importance(self) -> pd.DataFrame:
         """Get feature importance rankings"""
+        return self._feature_ranking().copy()
+    
+    def key_factors(self, n: int = 3) -> List[str]:
+        """Names of the ``n`` most important features"""
+        return self._feature_ranking()['feature'].iloc[:n].tolist()
+    
+    def _feature_ranking(self) -> pd.DataFrame:
+        """Importance ranking, computed once per trained or loaded model"""
         if not self.is_trained:
             raise ValueError("Model must be trained first")
-            
-        return pd.DataFrame({
-            'feature': self.feature_names,
-            'importance': self.model.feature_importances_
-        }).sort_values('importance', ascending=False)
+        
+        if self._importance_ranking is None:
+            self._importance_ranking = pd.DataFrame({
+                'feature': self.feature_names,
+                'importance': self.model.feature_importances_ if self.model is not None else self.feature_importances
+            }).sort_values('importance', ascending=False)
+        return self._importance_ranking
     
     def save_model(self, filepath: str):
         """Save trained model to disk"""
@@ -156,7 +338,11 @@ class CandidateJobMatcher:
             self.model = model_data['model']
             self.feature_names = model_data['feature_names']
             self.is_trained = model_data['is_trained']
-            logger.info(f"Model loaded from {filepath}")
+            self._importance_ranking = None
+            with open(filepath, 'rb') as f:
+                self.model_version = hashlib.sha256(f.read()).hexdigest()[:12]
+            self.compile()
+            logger.info(f"Model loaded from {filepath} (version {self.model_version})")
         except FileNotFoundError:
             logger.error(f"Model file not found: {filepath}")
             raise
@@ -169,9 +355,91 @@ class CandidateJobMatcher:
         if not self.is_trained:
             raise ValueError("Model must be trained first")
             
-        probabilities = self.predict_proba(X)
-        match_score = probabilities[0, 1]
+        # Only the first row is interpreted
+        return self.evaluate_batch_confidence(X[:1])[0]
+    
+    def evaluate_confidence_arrays(self, X: pd.DataFrame, explain: bool = True,
+                                   early_exit: bool = False) -> Dict[str, np.ndarray]:
+        """Match score, confidence and recommendation of every row of ``X``, as arrays
         
+        With ``explain`` (and a compiled forest) the per-row feature
+        contributions to the match score are computed in the same pass:
+        ``contributions`` is ``(n_rows, n_features)`` in ``feature_names``
+        order and ``key_factor_indices`` holds, per row, the features with
+        the largest absolute contribution.
+        
+        With ``early_exit`` only the recommendation is reliable: each row
+        stops at the first chunk of trees after which its bucket is settled
+        (see ``CompiledForest.predict_proba_early_exit``), ``match_score``
+        is the mean over those trees and ``trees_used`` says how many there
+        were. Nothing is explained in this mode.
+        """
+        if not self.is_trained:
+            raise ValueError("Model must be trained first")
+        
+        if early_exit:
+            forest = self.compiled_forest if self.compiled_forest is not None else self.compile()
+            with stage_timer("predict_proba_early_exit"):
+                match_scores, trees_used = forest.predict_proba_early_exit(
+                    X, same_recommendation, chunk_size=EARLY_EXIT_CHUNK_SIZE,
+                    bound=EARLY_EXIT_BOUND, delta=EARLY_EXIT_DELTA
+                )
+            evaluation = interpret_match_scores(match_scores)
+            evaluation['trees_used'] = trees_used
+            return evaluation
+        
+        if explain and self.compiled_forest is not None:
+            with stage_timer("predict_proba"):
+                probabilities, bias, contributions = self.compiled_forest.predict_proba_with_contributions(X)
+            evaluation = interpret_match_scores(probabilities[:, 1])
+            evaluation['bias'] = bias
+            evaluation['contributions'] = contributions
+            evaluation['key_factor_indices'] = np.argsort(
+                -np.abs(contributions), axis=1, kind='stable'
+            )[:, :N_KEY_FACTORS]
+            return evaluation
+        
+        with stage_timer("predict_proba"):
+            probabilities = self.predict_proba(X)
+        return interpret_match_scores(probabilities[:, 1])
+    
+    def evaluate_batch_confidence(self, X: pd.DataFrame, explain: bool = True,
+                                  early_exit: bool = False) -> List[Dict[str, Any]]:
+        """Evaluate every row of ``X`` with a single model pass
+        
+        ``key_factors`` are the row's own most influential features when
+        ``explain`` is set, the model's global top features otherwise.
+        ``early_exit`` results also carry ``trees_used``.
+        """
+        evaluation = self.evaluate_confidence_arrays(X, explain=explain, early_exit=early_exit)
+        results = [
+            {'match_score': match_score, 'confidence': confidence, 'recommendation': recommendation}
+            for match_score, confidence, recommendation in zip(
+                evaluation['match_score'].tolist(), evaluation['confidence'].tolist(),
+                evaluation['recommendation'].tolist()
+            )
+        ]
+        
+        if 'contributions' in evaluation:
+            feature_names = self.feature_names
+            rows = np.arange(len(results))[:, None]
+            indices = evaluation['key_factor_indices']
+            values = evaluation['contributions'][rows, indices].tolist()
+            for result, row_indices, row_values in zip(results, indices.tolist(), values):
+                result['key_factors'] = [feature_names[i] for i in row_indices]
+                result['factor_contributions'] = dict(zip(result['key_factors'], row_values))
+        else:
+            key_factors = self.key_factors(N_KEY_FACTORS)
+            for result in results:
+                result['key_factors'] = list(key_factors)
+        
+        if 'trees_used' in evaluation:
+            for result, trees_used in zip(results, evaluation['trees_used'].tolist()):
+                result['trees_used'] = trees_used
+        return results
+    
+    def _interpret_match_score(self, match_score: float) -> Dict[str, Any]:
+        """Confidence and recommendation bucket for a match score"""
         # Confidence based on how far the probability is from 0.5
         confidence = abs(match_score - 0.5) * 2
         
@@ -183,13 +451,8 @@ class CandidateJobMatcher:
         else:
             recommendation = "low_match"
         
-        # Get top contributing features
-        feature_importance = self.get_feature_importance()
-        key_factors = feature_importance.head(3)['feature'].tolist()
-        
         return {
             'match_score': float(match_score),
             'confidence': float(confidence),
-            'recommendation': recommendation,
-            'key_factors': key_factors
-        }
\ No newline at end of file
+            'recommendation': recommendation
+        }
@@ -0,0 +1,254 @@
+"""
+Array-compiled RandomForest inference
+"""
+import numpy as np
+import pandas as pd
+import logging
+from statistics import NormalDist
+from typing import Callable, Dict, List, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+
+class CompiledForest:
+    """A fitted forest flattened into NumPy arrays
+
+    All trees share one node table (``feature``, ``threshold``, ``left``,
+    ``right``, ``missing_go_to_left``, ``leaf_proba``); ``roots`` holds the
+    offset of each tree. Leaves point to themselves, so every row can step
+    ``max_depth`` times through all trees at once without branching.
+
+    Probabilities are bit-identical to ``RandomForestClassifier.predict_proba``:
+    inputs are compared as float32 like sklearn does, and per-tree leaf
+    probabilities are summed in tree order before dividing by the number of
+    trees.
+    """
+
+    def __init__(self, feature: np.ndarray, threshold: np.ndarray, left: np.ndarray, right: np.ndarray,
+                 missing_go_to_left: np.ndarray, leaf_proba: np.ndarray, roots: np.ndarray,
+                 max_depth: int, feature_names: List[str]):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.missing_go_to_left = missing_go_to_left
+        self.leaf_proba = leaf_proba
+        self.roots = roots
+        self.max_depth = max_depth
+        self.feature_names = list(feature_names)
+
+        # Traversal works on slots 2n (left) / 2n + 1 (right): a step is then
+        # slot -> children[slot + go_right], with no multiply or select per level
+        self._children = 2 * np.stack([left, right], axis=1).ravel()
+        self._feature = np.repeat(feature, 2)
+        self._threshold = np.repeat(threshold, 2)
+        self._missing_go_to_left = np.repeat(missing_go_to_left, 2)
+        # Per-class change of the node value along each slot's edge, for explanations
+        self._slot_deltas: Dict[int, np.ndarray] = {}
+
+    ARRAY_NAMES = ('feature', 'threshold', 'left', 'right', 'missing_go_to_left', 'leaf_proba', 'roots')
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """The node table as plain arrays, for storage"""
+        return {name: getattr(self, name) for name in self.ARRAY_NAMES}
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def n_classes(self) -> int:
+        return self.leaf_proba.shape[1]
+
+    @classmethod
+    def from_sklearn(cls, forest, feature_names: Sequence[str] = None) -> "CompiledForest":
+        """Flatten a fitted single-output ``RandomForestClassifier``"""
+        if feature_names is None:
+            feature_names = list(getattr(forest, 'feature_names_in_', range(forest.n_features_in_)))
+        n_classes = int(forest.n_classes_)
+
+        features, thresholds, lefts, rights, missing, probas, roots = [], [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            n_nodes = tree.node_count
+            node_ids = np.arange(n_nodes, dtype=np.int64)
+            is_leaf = tree.children_left == -1
+
+            roots.append(offset)
+            features.append(np.where(is_leaf, 0, tree.feature).astype(np.int64))
+            thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left) + offset)
+            rights.append(np.where(is_leaf, node_ids, tree.children_right) + offset)
+            missing.append(np.asarray(getattr(tree, 'missing_go_to_left', np.zeros(n_nodes)), dtype=bool))
+
+            value = tree.value[:, 0, :n_classes].astype(np.float64)
+            totals = value.sum(axis=1)
+            if np.any(totals > 1.0 + 1e-9):
+                # Older sklearn keeps class counts in tree_.value and normalizes at predict time
+                totals[totals == 0.0] = 1.0
+                value = value / totals[:, None]
+            probas.append(value)
+
+            max_depth = max(max_depth, int(tree.max_depth))
+            offset += n_nodes
+
+        return cls(
+            feature=np.concatenate(features),
+            threshold=np.concatenate(thresholds),
+            left=np.concatenate(lefts),
+            right=np.concatenate(rights),
+            missing_go_to_left=np.concatenate(missing),
+            leaf_proba=np.concatenate(probas),
+            roots=np.asarray(roots, dtype=np.int64),
+            max_depth=max_depth,
+            feature_names=feature_names
+        )
+
+    def _as_array(self, X: Union[pd.DataFrame, np.ndarray]) -> np.ndarray:
+        if isinstance(X, pd.DataFrame):
+            if list(X.columns) != self.feature_names:
+                X = X[self.feature_names]
+            X = X.to_numpy()
+        # sklearn evaluates splits on float32 inputs
+        return np.ascontiguousarray(X, dtype=np.float32)
+
+    def apply(self, X: Union[pd.DataFrame, np.ndarray]) -> np.ndarray:
+        """Leaf node (in the flat node table) reached by each row in each tree"""
+        return self._apply_roots(self._as_array(X), self.roots)
+
+    def _apply_roots(self, X: np.ndarray, roots: np.ndarray) -> np.ndarray:
+        """Leaf reached by each row of a float32 array in the trees starting at ``roots``"""
+        n_rows, n_features = X.shape
+        values_flat = X.ravel()
+        check_missing = bool(np.isnan(values_flat).any())
+
+        slots = np.repeat(2 * roots[None, :], n_rows, axis=0)
+        row_offsets = 0 if n_rows == 1 else (np.arange(n_rows, dtype=np.int64) * n_features)[:, None]
+        for _ in range(self.max_depth):
+            values = values_flat.take(row_offsets + self._feature.take(slots))
+            go_right = values > self._threshold.take(slots)
+            if check_missing:
+                # NaN compares False both ways: send it where the split learned to
+                go_right |= np.isnan(values) & ~self._missing_go_to_left.take(slots)
+            slots = self._children.take(slots + go_right)
+        return slots // 2
+
+    def predict_proba(self, X: Union[pd.DataFrame, np.ndarray]) -> np.ndarray:
+        """Class probabilities, identical to the source forest's ``predict_proba``"""
+        return self._proba_from_leaves(self.apply(X))
+
+    def _proba_from_leaves(self, leaves: np.ndarray) -> np.ndarray:
+        per_tree = self.leaf_proba[leaves]
+        # Sequential sum in tree order, as sklearn accumulates it
+        total = np.cumsum(per_tree, axis=1)[:, -1, :]
+        return total / self.n_trees
+
+    def predict_proba_early_exit(self, X: Union[pd.DataFrame, np.ndarray],
+                                 is_settled: Callable[[np.ndarray, np.ndarray], np.ndarray],
+                                 class_index: int = 1, chunk_size: int = 8, bound: str = "normal",
+                                 delta: float = 0.001) -> Tuple[np.ndarray, np.ndarray]:
+        """Anytime probability of one class: trees are evaluated ``chunk_size`` at a time
+        
+        After each chunk, ``is_settled(lower, upper)`` gets an interval for
+        the full-forest probability of every row still being scored and
+        returns which of them can stop. ``bound="exact"`` is the interval
+        reachable whatever the remaining trees say, so a settled row is
+        settled for certain; ``bound="normal"`` narrows it to a ``1 - delta``
+        normal confidence interval around the running mean (trees of a
+        random forest are exchangeable, the remaining ones behave like a
+        sample of the same population). Its variance is floored at
+        ``p(1 - p)`` of the mean with one pseudo-count per class, so a chunk
+        of unanimous trees is not taken for a zero-width interval.
+        
+        Returns the running mean at exit (the exact ``predict_proba`` value
+        for rows that used every tree) and the number of trees used per row.
+        """
+        if bound not in ("exact", "normal"):
+            raise ValueError(f"Unknown bound {bound!r}")
+        X = self._as_array(X)
+        n_rows, n_trees = X.shape[0], self.n_trees
+        totals = np.zeros(n_rows, dtype=np.float64)
+        squares = np.zeros(n_rows, dtype=np.float64)
+        trees_used = np.zeros(n_rows, dtype=np.int64)
+        active = np.arange(n_rows)
+        z = NormalDist().inv_cdf(1.0 - delta / 2.0)
+
+        for start in range(0, n_trees, chunk_size):
+            stop = min(start + chunk_size, n_trees)
+            per_tree = self.leaf_proba[self._apply_roots(X[active], self.roots[start:stop]), class_index]
+            running = totals[active]
+            # Tree by tree, so rows that use every tree sum exactly like predict_proba
+            for column in range(stop - start):
+                running += per_tree[:, column]
+            totals[active] = running
+            trees_used[active] = stop
+            if bound == "normal":
+                squares[active] += np.square(per_tree).sum(axis=1)
+            if stop == n_trees:
+                break
+
+            lower = running / n_trees
+            upper = (running + (n_trees - stop)) / n_trees
+            if bound == "normal" and stop > 1:
+                mean = running / stop
+                variance = np.maximum(squares[active] / stop - mean * mean, 0.0) * stop / (stop - 1)
+                smoothed = (running + 1.0) / (stop + 2.0)
+                variance = np.maximum(variance, smoothed * (1.0 - smoothed))
+                # Finite population correction: only n_trees - stop values are still unknown
+                epsilon = z * np.sqrt(variance / stop * (1.0 - stop / n_trees))
+                lower = np.maximum(lower, mean - epsilon)
+                upper = np.minimum(upper, mean + epsilon)
+            active = active[~is_settled(lower, upper)]
+            if len(active) == 0:
+                break
+
+        return totals / trees_used, trees_used
+
+    def _slot_delta(self, class_index: int) -> np.ndarray:
+        delta = self._slot_deltas.get(class_index)
+        if delta is None:
+            value = self.leaf_proba[:, class_index]
+            # Leaves loop onto themselves, so their steps add nothing
+            delta = value.take(self._children // 2) - np.repeat(value, 2)
+            self._slot_deltas[class_index] = delta
+        return delta
+
+    def predict_proba_with_contributions(self, X: Union[pd.DataFrame, np.ndarray],
+                                         class_index: int = 1) -> Tuple[np.ndarray, float, np.ndarray]:
+        """Probabilities plus a per-row, per-feature decomposition of one class
+        
+        Path-based (Saabas) decomposition: every split on a row's path moves
+        the node value by ``value[child] - value[node]``, credited to the
+        split feature. Averaged over the trees, ``bias + contributions.sum(1)``
+        equals the class probability (up to rounding). Computed in the same
+        traversal as the probabilities, which stay identical to
+        ``predict_proba``.
+        
+        Returns ``(probabilities, bias, contributions)``, contributions
+        shaped ``(n_rows, n_features)``.
+        """
+        X = self._as_array(X)
+        n_rows, n_features = X.shape
+        values_flat = X.ravel()
+        check_missing = bool(np.isnan(values_flat).any())
+        delta = self._slot_delta(class_index)
+
+        slots = np.repeat(2 * self.roots[None, :], n_rows, axis=0)
+        row_offsets = (np.arange(n_rows, dtype=np.int64) * n_features)[:, None]
+        contributions = np.zeros(n_rows * n_features, dtype=np.float64)
+        for _ in range(self.max_depth):
+            cells = row_offsets + self._feature.take(slots)
+            values = values_flat.take(cells)
+            go_right = values > self._threshold.take(slots)
+            if check_missing:
+                go_right |= np.isnan(values) & ~self._missing_go_to_left.take(slots)
+            steps = slots + go_right
+            contributions += np.bincount(cells.ravel(), weights=delta.take(steps).ravel(),
+                                         minlength=n_rows * n_features)
+            slots = self._children.take(steps)
+
+        bias = float(self.leaf_proba[self.roots, class_index].mean())
+        contributions = contributions.reshape(n_rows, n_features) / self.n_trees
+        return self._proba_from_leaves(slots // 2), bias, contributions
@@ -0,0 +1,269 @@
+"""
+In-process metrics for Decision AI, rendered in the Prometheus text format
+"""
+import bisect
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Seconds; from sub-millisecond model calls up to a full training stage
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    return repr(float(value))
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(label_names: Sequence[str], label_values: Tuple, extra: Dict[str, str] = None) -> str:
+    pairs = list(zip(label_names, label_values)) + list((extra or {}).items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class _Metric:
+    """Base for labelled metrics; one value (or bucket set) per label combination"""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} expects labels {self.label_names}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def _samples(self) -> List[Tuple[str, Tuple, Dict[str, str], float]]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        for suffix, label_values, extra, value in self._samples():
+            lines.append(f"{self.name}{suffix}{_format_labels(self.label_names, label_values, extra)} "
+                         f"{_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        super().__init__(name, documentation, label_names)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self):
+        with self._lock:
+            return [("", key, None, value) for key, value in sorted(self._values.items())]
+
+
+class Gauge(_Metric):
+    """Value that goes up and down, or is read from a callback at render time"""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        super().__init__(name, documentation, label_names)
+        self._values: Dict[Tuple, float] = {}
+        self._function: Optional[Callable[[], Dict[Tuple, float]]] = None
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def set_function(self, function: Callable[[], Dict[Tuple, float]]):
+        """Read the values from ``function`` (label tuple -> value) when rendering"""
+        self._function = function
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self):
+        if self._function is not None:
+            values = self._function()
+        else:
+            with self._lock:
+                values = dict(self._values)
+        return [("", tuple(str(label) for label in key), None, value) for key, value in sorted(values.items())]
+
+
+class Histogram(_Metric):
+    """Observations counted in cumulative buckets, with sum and count
+
+    Quantiles (p50/p95/p99) are estimated from the buckets, the way
+    Prometheus' ``histogram_quantile`` does, so no samples are kept.
+    """
+
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._counts: Dict[Tuple, List[int]] = {}
+        self._sums: Dict[Tuple, float] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        position = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * len(self.buckets)
+                self._sums[key] = 0.0
+            counts[position] += 1
+            self._sums[key] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall time of the ``with`` block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels) -> int:
+        return sum(self._counts.get(self._key(labels), ()))
+
+    def quantile(self, q: float, **labels) -> float:
+        """Estimated ``q`` quantile, interpolated linearly within its bucket"""
+        with self._lock:
+            counts = list(self._counts.get(self._key(labels), ()))
+        total = sum(counts)
+        if total == 0:
+            return math.nan
+        rank = q * total
+        cumulative = 0
+        for position, count in enumerate(counts):
+            if cumulative + count >= rank and count > 0:
+                upper = self.buckets[position]
+                lower = self.buckets[position - 1] if position > 0 else 0.0
+                if upper == math.inf:
+                    return lower
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-2]
+
+    def summary(self, **labels) -> Dict[str, float]:
+        """Count, mean and p50/p95/p99 for one label combination"""
+        key = self._key(labels)
+        count = self.count(**labels)
+        return {
+            'count': count,
+            'mean': self._sums.get(key, 0.0) / count if count else math.nan,
+            'p50': self.quantile(0.5, **labels),
+            'p95': self.quantile(0.95, **labels),
+            'p99': self.quantile(0.99, **labels)
+        }
+
+    def label_sets(self) -> List[Dict[str, str]]:
+        with self._lock:
+            keys = sorted(self._counts)
+        return [dict(zip(self.label_names, key)) for key in keys]
+
+    def _samples(self):
+        samples = []
+        with self._lock:
+            for key in sorted(self._counts):
+                cumulative = 0
+                for upper, count in zip(self.buckets, self._counts[key]):
+                    cumulative += count
+                    samples.append(("_bucket", key, {'le': _format_value(upper)}, cumulative))
+                samples.append(("_sum", key, None, self._sums[key]))
+                samples.append(("_count", key, None, cumulative))
+        return samples
+
+
+class MetricsRegistry:
+    """Named metrics of one process
+
+    Under the prefork server every worker has its own registry, so
+    ``/metrics`` reports the worker that answered the scrape.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} already registered as {metric.type_name}")
+            return metric
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, label_names)
+
+    def gauge(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, label_names)
+
+    def histogram(self, name: str, documentation: str, label_names: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, label_names, buckets)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "decision_stage_seconds", "Time spent in each stage of a pipeline", ("pipeline", "stage")
+)
+
+
+def stage_timer(stage: str, pipeline: str = "api"):
+    """Context manager recording the duration of ``stage`` in ``decision_stage_seconds``"""
+    return STAGE_SECONDS.time(pipeline=pipeline, stage=stage)
+
+
+def stage_summaries(pipeline: str) -> Dict[str, Dict[str, float]]:
+    """p50/p95/p99 of every recorded stage of ``pipeline``"""
+    return {labels['stage']: STAGE_SECONDS.summary(**labels)
+            for labels in STAGE_SECONDS.label_sets() if labels['pipeline'] == pipeline}
@@ -0,0 +1,150 @@
+"""
+Sampled in-process profiling of API requests (cProfile / tracemalloc)
+"""
+import cProfile
+import io
+import logging
+import os
+import pstats
+import random
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ("cprofile", "tracemalloc", "both")
+
+
+class RequestProfiler:
+    """Runs a sampled fraction of requests under cProfile and/or tracemalloc
+
+    Disabled (``sample_rate=0``) the only cost per request is one
+    comparison. Profiles are aggregated in memory for the admin endpoint
+    and, with ``output_dir``, each one is also written there, keeping the
+    newest ``max_files``. One request is profiled at a time; requests
+    sampled while another is being profiled simply run unprofiled.
+    """
+
+    def __init__(self, sample_rate: float = 0.0, mode: str = "cprofile", output_dir: Optional[Path] = None,
+                 max_files: int = 50, top_allocations: int = 25, rng: Callable[[], float] = random.random):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode {mode!r}, expected one of {PROFILE_MODES}")
+        self.sample_rate = sample_rate
+        self.mode = mode
+        self.output_dir = Path(output_dir) if output_dir else None
+        self.max_files = max_files
+        self.top_allocations = top_allocations
+        self._rng = rng
+        self._busy = threading.Lock()
+        self._lock = threading.Lock()
+
+        self.profiled = 0
+        self._stats: Optional[pstats.Stats] = None
+        self._allocations: Dict[str, List[float]] = {}  # site -> [size, count]
+
+    @classmethod
+    def from_env(cls) -> "RequestProfiler":
+        """Profiler configured by PROFILE_SAMPLE_RATE, PROFILE_MODE, PROFILE_DIR and PROFILE_MAX_FILES"""
+        return cls(
+            sample_rate=float(os.environ.get("PROFILE_SAMPLE_RATE", 0.0)),
+            mode=os.environ.get("PROFILE_MODE", "cprofile"),
+            output_dir=os.environ.get("PROFILE_DIR") or None,
+            max_files=int(os.environ.get("PROFILE_MAX_FILES", 50))
+        )
+
+    def should_profile(self, forced: bool = False) -> bool:
+        """Whether to profile the current request"""
+        return forced or (self.sample_rate > 0 and self._rng() < self.sample_rate)
+
+    def run(self, name: str, func: Callable, *args) -> Any:
+        """``func(*args)`` under the profiler, recorded as ``name``"""
+        if not self._busy.acquire(blocking=False):
+            return func(*args)
+        try:
+            use_cprofile = self.mode in ("cprofile", "both")
+            use_tracemalloc = self.mode in ("tracemalloc", "both") and not tracemalloc.is_tracing()
+            profile = cProfile.Profile() if use_cprofile else None
+            if use_tracemalloc:
+                tracemalloc.start()
+            if profile is not None:
+                profile.enable()
+            try:
+                return func(*args)
+            finally:
+                if profile is not None:
+                    profile.disable()
+                snapshot = None
+                if use_tracemalloc:
+                    snapshot = tracemalloc.take_snapshot()
+                    tracemalloc.stop()
+                self._record(name, profile, snapshot)
+        finally:
+            self._busy.release()
+
+    def _record(self, name: str, profile: Optional[cProfile.Profile], snapshot):
+        allocations = []
+        if snapshot is not None:
+            snapshot = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+            allocations = snapshot.statistics('lineno')[:self.top_allocations]
+
+        with self._lock:
+            self.profiled += 1
+            if profile is not None:
+                if self._stats is None:
+                    self._stats = pstats.Stats(profile)
+                else:
+                    self._stats.add(profile)
+            for statistic in allocations:
+                site = str(statistic.traceback)
+                totals = self._allocations.setdefault(site, [0, 0])
+                totals[0] += statistic.size
+                totals[1] += statistic.count
+
+        if self.output_dir is not None:
+            try:
+                self._write(name, profile, allocations)
+            except OSError as e:
+                logger.warning(f"Could not write profile: {e}")
+
+    def _write(self, name: str, profile: Optional[cProfile.Profile], allocations: List):
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stem = f"{time.time_ns()}-{name}"
+        if profile is not None:
+            profile.dump_stats(self.output_dir / f"{stem}.prof")
+        if allocations:
+            with open(self.output_dir / f"{stem}.malloc.txt", 'w', encoding='utf-8') as f:
+                f.writelines(f"{statistic}\n" for statistic in allocations)
+
+        # Rotate: keep the newest files only
+        files = sorted(list(self.output_dir.glob("*.prof")) + list(self.output_dir.glob("*.malloc.txt")),
+                       key=lambda path: path.name)
+        for path in files[:max(0, len(files) - self.max_files)]:
+            path.unlink(missing_ok=True)
+
+    def report(self, limit: int = 30, sort_by: str = "cumulative") -> Dict[str, Any]:
+        """Aggregated profile of every request profiled so far"""
+        with self._lock:
+            text = ""
+            if self._stats is not None:
+                stream = io.StringIO()
+                self._stats.stream = stream
+                self._stats.sort_stats(sort_by).print_stats(limit)
+                text = stream.getvalue()
+            allocations = sorted(self._allocations.items(), key=lambda item: item[1][0], reverse=True)[:limit]
+            return {
+                'requests_profiled': self.profiled,
+                'sample_rate': self.sample_rate,
+                'mode': self.mode,
+                'cprofile': text,
+                'tracemalloc': [{'site': site, 'size_bytes': int(size), 'count': int(count)}
+                                for site, (size, count) in allocations]
+            }
+
+    def reset(self):
+        with self._lock:
+            self.profiled = 0
+            self._stats = None
+            self._allocations = {}
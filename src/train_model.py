@@ -11,6 +11,8 @@ sys.path.append(str(Path(__file__).parent))
 from data.data_loader import DataLoader
 from features.feature_engineering import FeatureEngineer
 from models.candidate_job_matcher import CandidateJobMatcher
+from models.artifact import DEFAULT_ARTIFACT_DIR, save_artifact
+from monitoring.metrics import stage_summaries, stage_timer
 
 # Configure logging
 logging.basicConfig(
@@ -25,23 +27,25 @@ def main():
     
     try:
         # Initialize components
-        data_loader = DataLoader("data/")
+        data_loader = DataLoader("data/", use_snapshot=True)
         feature_engineer = FeatureEngineer()
         matcher = CandidateJobMatcher()
         
         # Load data
         logger.info("Loading data...")
-        vagas_df, prospects_df, applicants_df = data_loader.process_decision_data()
-        
-        # Check if data exists, create sample if not
-        if vagas_df.empty or prospects_df.empty or applicants_df.empty:
-            logger.warning("No data found, creating sample data for demonstration")
-            data_loader.create_sample_data()
+        with stage_timer("load_data", pipeline="train"):
             vagas_df, prospects_df, applicants_df = data_loader.process_decision_data()
+            
+            # Check if data exists, create sample if not
+            if vagas_df.empty or prospects_df.empty or applicants_df.empty:
+                logger.warning("No data found, creating sample data for demonstration")
+                data_loader.create_sample_data()
+                vagas_df, prospects_df, applicants_df = data_loader.process_decision_data()
         
         # Prepare training data
         logger.info("Engineering features...")
-        X, y = feature_engineer.prepare_training_data(vagas_df, applicants_df, prospects_df)
+        with stage_timer("prepare_training_data", pipeline="train"):
+            X, y = feature_engineer.prepare_training_data(vagas_df, applicants_df, prospects_df)
         
         if len(X) == 0:
             logger.error("No training data available")
@@ -49,23 +53,30 @@ def main():
         
         # Train model
         logger.info("Training model...")
-        metrics = matcher.train(X, y)
+        with stage_timer("train", pipeline="train"):
+            metrics = matcher.train(X, y)
         
         # Log training results
         logger.info("Training completed successfully!")
         logger.info(f"Model metrics: {metrics}")
         
         # Save model and feature engineer
-        models_dir = Path("models")
-        models_dir.mkdir(exist_ok=True)
-        
-        matcher.save_model("models/candidate_job_matcher.joblib")
-        
-        # Save feature engineer (for consistent preprocessing)
-        import joblib
-        joblib.dump(feature_engineer, "models/feature_engineer.joblib")
+        with stage_timer("save", pipeline="train"):
+            models_dir = Path("models")
+            models_dir.mkdir(exist_ok=True)
+            
+            matcher.save_model("models/candidate_job_matcher.joblib")
+            
+            # Save feature engineer (for consistent preprocessing)
+            import joblib
+            joblib.dump(feature_engineer, "models/feature_engineer.joblib")
+            
+            # Pickle-free artifact the API serves from
+            save_artifact(DEFAULT_ARTIFACT_DIR, matcher, feature_engineer)
         
         logger.info("Model and feature engineer saved successfully")
+        for stage, summary in stage_summaries("train").items():
+            logger.info(f"Stage {stage}: {summary['mean'] * 1000:.1f} ms")
         
         # Model validation check
         if metrics['roc_auc'] >= 0.7:
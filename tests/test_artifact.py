@@ -0,0 +1,98 @@
+"""
+Tests for the pickle-free model artifact
+"""
+import pytest
+import pandas as pd
+import numpy as np
+import json
+import subprocess
+import tempfile
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from data.data_loader import DataLoader
+from features.feature_engineering import FeatureEngineer
+from models.candidate_job_matcher import CandidateJobMatcher
+from models.artifact import load_artifact, read_manifest, save_artifact
+
+class TestModelArtifact:
+    
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        loader = DataLoader(self.temp_dir.name)
+        loader.create_sample_data()
+        self.vagas_df, self.prospects_df, self.applicants_df = loader.process_decision_data()
+        
+        self.feature_engineer = FeatureEngineer()
+        X, y = self.feature_engineer.prepare_training_data(self.vagas_df, self.applicants_df, self.prospects_df)
+        self.matcher = CandidateJobMatcher({'n_estimators': 10})
+        self.matcher.train(X, y)
+        
+        self.artifact_dir = Path(self.temp_dir.name) / "artifact"
+        
+        rng = np.random.default_rng(3)
+        self.features_df = pd.DataFrame(rng.uniform(0, 5, size=(20, len(X.columns))), columns=X.columns)
+    
+    def teardown_method(self):
+        self.temp_dir.cleanup()
+    
+    def test_round_trip_scores_identically(self):
+        """Test a loaded artifact gives the same scaled inputs and probabilities"""
+        save_artifact(self.artifact_dir, self.matcher, self.feature_engineer)
+        
+        matcher, feature_engineer = load_artifact(self.artifact_dir)
+        
+        X_expected = self.feature_engineer.transform_features(self.features_df)
+        X_loaded = feature_engineer.transform_features(self.features_df)
+        assert np.array_equal(X_loaded.to_numpy(), X_expected.to_numpy())
+        assert np.array_equal(matcher.predict_proba(X_loaded), self.matcher.model.predict_proba(X_expected))
+        assert np.array_equal(matcher.predict(X_loaded), self.matcher.model.predict(X_expected))
+        assert matcher.get_feature_importance().equals(self.matcher.get_feature_importance())
+    
+    def test_manifest_and_generations(self):
+        """Test saving again keeps the replaced generation's files and removes older ones"""
+        first = save_artifact(self.artifact_dir, self.matcher, self.feature_engineer)
+        second = save_artifact(self.artifact_dir, self.matcher, self.feature_engineer)
+        
+        assert read_manifest(self.artifact_dir)['model_version'] == second['model_version']
+        assert first['model_version'] != second['model_version']
+        # Still on disk for processes that have not switched yet
+        assert all((self.artifact_dir / filename).exists() for filename in first['files'].values())
+        assert load_artifact(self.artifact_dir)[0].model_version == second['model_version']
+        
+        third = save_artifact(self.artifact_dir, self.matcher, self.feature_engineer)
+        generations = {path.name.split('-', 1)[0] for path in self.artifact_dir.glob("*.npy")}
+        assert generations == {second['model_version'], third['model_version']}
+    
+    def test_missing_artifact(self):
+        """Test loading from a directory without an artifact"""
+        assert read_manifest(self.artifact_dir) is None
+        with pytest.raises(FileNotFoundError):
+            load_artifact(self.artifact_dir)
+    
+    def test_loads_without_sklearn(self):
+        """Test the artifact loads and scores in a process where sklearn cannot be imported"""
+        save_artifact(self.artifact_dir, self.matcher, self.feature_engineer)
+        expected = self.matcher.model.predict_proba(self.feature_engineer.transform_features(self.features_df))
+        features_path = Path(self.temp_dir.name) / "features.npy"
+        np.save(features_path, self.features_df.to_numpy())
+        
+        script = f"""
+import sys, json
+sys.modules['sklearn'] = None
+sys.path.insert(0, {str(Path(__file__).parent.parent / "src")!r})
+import numpy as np
+import pandas as pd
+from models.artifact import load_artifact
+matcher, feature_engineer = load_artifact({str(self.artifact_dir)!r})
+features_df = pd.DataFrame(np.load({str(features_path)!r}), columns={list(self.features_df.columns)!r})
+X = feature_engineer.transform_features(features_df)
+print(json.dumps(matcher.predict_proba(X).tolist()))
+"""
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+        
+        assert np.array_equal(np.array(json.loads(result.stdout)), expected)
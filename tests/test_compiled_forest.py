@@ -0,0 +1,130 @@
+"""
+Tests for the array-compiled forest
+"""
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from sklearn.ensemble import RandomForestClassifier
+from models.candidate_job_matcher import CandidateJobMatcher
+from models.compiled_forest import CompiledForest
+
+class TestCompiledForest:
+    
+    def setup_method(self):
+        """Setup test fixtures"""
+        rng = np.random.default_rng(7)
+        n_samples = 300
+        
+        self.X = pd.DataFrame(rng.normal(size=(n_samples, 5)).round(2), columns=list("abcde"))
+        self.y = (self.X['a'] + rng.normal(size=n_samples) > 0).astype(int)
+        self.forest = RandomForestClassifier(
+            n_estimators=20, max_depth=6, min_samples_leaf=2, class_weight='balanced', random_state=0
+        ).fit(self.X, self.y)
+        self.compiled = CompiledForest.from_sklearn(self.forest)
+    
+    def test_identical_probabilities(self):
+        """Test compiled scoring reproduces sklearn bit for bit"""
+        X_test = pd.DataFrame(np.random.default_rng(1).normal(size=(500, 5)), columns=list("abcde"))
+        
+        assert np.array_equal(self.compiled.predict_proba(X_test), self.forest.predict_proba(X_test))
+        assert np.array_equal(self.compiled.predict_proba(X_test[:1]), self.forest.predict_proba(X_test[:1]))
+    
+    def test_threshold_ties_and_missing_values(self):
+        """Test values equal to thresholds and NaNs follow sklearn's routing"""
+        X_test = self.X[:50].copy()
+        X_test.iloc[::3, 2] = np.nan
+        
+        assert np.array_equal(self.compiled.predict_proba(X_test), self.forest.predict_proba(X_test))
+    
+    def test_columns_selected_by_name(self):
+        """Test DataFrame inputs are aligned to the training feature order"""
+        X_test = self.X[:10]
+        
+        assert np.array_equal(self.compiled.predict_proba(X_test[list("edcba")]),
+                              self.compiled.predict_proba(X_test))
+    
+    def test_leaves_match_sklearn(self):
+        """Test apply lands in the same leaf as sklearn in every tree"""
+        leaves = self.compiled.apply(self.X[:20]) - self.compiled.roots
+        
+        assert np.array_equal(leaves, self.forest.apply(self.X[:20]))
+    
+    def test_contributions_decompose_probability(self):
+        """Test bias plus contributions rebuild the probability, with probabilities unchanged"""
+        X_test = self.X[:40].copy()
+        X_test.iloc[::4, 1] = np.nan
+        
+        probabilities, bias, contributions = self.compiled.predict_proba_with_contributions(X_test)
+        
+        assert np.array_equal(probabilities, self.forest.predict_proba(X_test))
+        assert contributions.shape == (40, 5)
+        np.testing.assert_allclose(bias + contributions.sum(axis=1), probabilities[:, 1], atol=1e-12)
+    
+    def test_contributions_follow_decision_paths(self):
+        """Test contributions equal a per-tree walk of sklearn's decision paths"""
+        row = self.X[3:4]
+        expected = np.zeros(5)
+        for estimator in self.forest.estimators_:
+            tree = estimator.tree_
+            value = tree.value[:, 0, 1]
+            path = estimator.decision_path(row.to_numpy(dtype=np.float32)).indices
+            for node, child in zip(path[:-1], path[1:]):
+                expected[tree.feature[node]] += value[child] - value[node]
+        
+        _, _, contributions = self.compiled.predict_proba_with_contributions(row)
+        
+        np.testing.assert_allclose(contributions[0], expected / len(self.forest.estimators_), atol=1e-12)
+    
+    def test_early_exit_exact_bound_keeps_decision(self):
+        """Test the exact bound only stops rows whose side of the threshold is certain"""
+        X_test = pd.DataFrame(np.random.default_rng(2).normal(size=(300, 5)), columns=list("abcde"))
+        expected = self.forest.predict_proba(X_test)[:, 1]
+        settled = lambda lower, upper: (lower >= 0.5) == (upper >= 0.5)
+        
+        scores, trees_used = self.compiled.predict_proba_early_exit(X_test, settled, chunk_size=4, bound="exact")
+        
+        assert np.array_equal(scores >= 0.5, expected >= 0.5)
+        assert trees_used.min() >= 4 and trees_used.max() <= 20
+        assert trees_used.min() < 20
+        # Rows scored by every tree get the exact probability
+        full = trees_used == 20
+        assert np.array_equal(scores[full], expected[full])
+    
+    def test_early_exit_never_settled_uses_every_tree(self):
+        """Test rows that never settle are scored by the whole forest, identically"""
+        X_test = self.X[:30]
+        
+        for bound in ("exact", "normal"):
+            scores, trees_used = self.compiled.predict_proba_early_exit(
+                X_test, lambda lower, upper: np.zeros(len(lower), dtype=bool), chunk_size=3, bound=bound
+            )
+            assert np.all(trees_used == 20)
+            assert np.array_equal(scores, self.forest.predict_proba(X_test)[:, 1])
+        
+        with pytest.raises(ValueError):
+            self.compiled.predict_proba_early_exit(X_test, lambda lower, upper: lower == upper, bound="hoeffding")
+    
+    def test_early_exit_normal_bound_unanimous_chunk(self):
+        """Test a chunk of identical tree outputs does not give a zero-width normal interval"""
+        compiled = CompiledForest.from_sklearn(self.forest)
+        compiled.leaf_proba[:compiled.roots[4]] = [0.0, 1.0]
+        X_test = self.X[:30]
+        settled = lambda lower, upper: (lower >= 0.5) == (upper >= 0.5)
+        
+        _, trees_used = compiled.predict_proba_early_exit(X_test, settled, chunk_size=4, bound="normal")
+        
+        assert np.all(trees_used > 4)
+    
+    def test_matcher_uses_compiled_forest(self):
+        """Test the matcher compiles after training and scores identically"""
+        matcher = CandidateJobMatcher({'n_estimators': 10})
+        matcher.train(self.X, self.y)
+        
+        assert matcher.compiled_forest is not None
+        assert np.array_equal(matcher.predict_proba(self.X[:5]), matcher.model.predict_proba(self.X[:5]))
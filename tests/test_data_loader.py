@@ -3,6 +3,7 @@ Tests for data loading functionality
 """
 import pytest
 import pandas as pd
+import io
 import json
 import tempfile
 from pathlib import Path
@@ -11,7 +12,7 @@ import sys
 # Add src to path
 sys.path.append(str(Path(__file__).parent.parent / "src"))
 
-from data.data_loader import DataLoader
+from data.data_loader import DataLoader, JsonStreamReader
 
 class TestDataLoader:
     
@@ -65,4 +66,134 @@ class TestDataLoader:
             
             assert vagas_df.empty
             assert prospects_df.empty
-            assert applicants_df.empty
\ No newline at end of file
+            assert applicants_df.empty
+    
+    def test_stream_reader_matches_json_load(self):
+        """Test streaming across tiny chunks yields the same records"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            test_data = {
+                "1": {"nome": "Ana", "anos_experiencia": 12345, "skills": ["SAP", "ABAP"]},
+                "2": {"nome": "João \"Jr\"", "ativo": True, "salario": None},
+                "3": {}
+            }
+            with open(Path(temp_dir) / "test.json", 'w', encoding='utf-8') as f:
+                json.dump(test_data, f, indent=2, ensure_ascii=False)
+
+            loader = DataLoader(temp_dir)
+            streamed = dict(loader.iter_json_records("test.json", chunk_size=3))
+
+            assert streamed == test_data
+
+    def test_stream_nested_records(self):
+        """Test streaming nested prospect lists one element at a time"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            test_data = {"10": [{"codigo_candidato": "1"}, {"codigo_candidato": "2"}], "11": [], "12": "x"}
+            with open(Path(temp_dir) / "prospects.json", 'w') as f:
+                json.dump(test_data, f)
+
+            loader = DataLoader(temp_dir)
+            items = list(loader.iter_nested_records("prospects.json", chunk_size=4))
+
+            assert items == [("10", {"codigo_candidato": "1"}), ("10", {"codigo_candidato": "2"})]
+
+    def test_truncated_file_discarded_like_eager_parse(self):
+        """Test a file cut mid-write gives the same empty table streamed or not"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            loader = DataLoader(temp_dir)
+            loader.create_sample_data()
+            applicants_file = Path(temp_dir) / "applicants.json"
+            text = applicants_file.read_text(encoding='utf-8')
+            applicants_file.write_text(text[:int(len(text) * 0.8)], encoding='utf-8')
+
+            with pytest.raises(json.JSONDecodeError):
+                list(loader.iter_json_records("applicants.json"))
+
+            eager = loader.process_decision_data()
+            streamed = loader.process_decision_data(streaming=True)
+
+            assert eager[2].empty
+            assert streamed[2].empty
+            assert len(streamed[0]) == len(eager[0]) == 2
+
+    def test_stream_reader_bounds_malformed_value(self):
+        """Test a malformed record fails without buffering the rest of the file"""
+        text = '{"1": {"nome": "Ana",, "x": 1}, ' + ', '.join(f'"{i}": {{"nome": "{i}"}}' for i in range(2, 2000)) + '}'
+        f = io.StringIO(text)
+        reader = JsonStreamReader(f, chunk_size=64, max_value_size=1024)
+        
+        with pytest.raises(json.JSONDecodeError):
+            for key in reader.iter_keys():
+                reader.read_value()
+        assert f.tell() < len(text) // 4
+
+    def test_streamed_tables_built_in_chunks(self):
+        """Test tables concatenated from small chunks of records equal the eager ones"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            loader = DataLoader(temp_dir)
+            loader.create_synthetic_data(n_jobs=5, n_applicants=9, n_prospects=11, seed=3)
+            vagas_df, prospects_df, applicants_df = loader.process_decision_data()
+            
+            chunked = {
+                'vagas': loader._streamed_frame(lambda: loader._record_frames(loader.iter_jobs(), 2)),
+                'applicants': loader._streamed_frame(lambda: loader._record_frames(loader.iter_candidates(), 2)),
+                'prospects': loader._streamed_frame(lambda: loader.iter_prospect_frames(chunk_size=2))
+            }
+            
+            pd.testing.assert_frame_equal(chunked['vagas'], vagas_df)
+            pd.testing.assert_frame_equal(chunked['applicants'], applicants_df)
+            pd.testing.assert_frame_equal(chunked['prospects'], prospects_df)
+
+    def test_stream_missing_file(self):
+        """Test streaming a missing file yields nothing"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            loader = DataLoader(temp_dir)
+            assert list(loader.iter_json_records("nonexistent.json")) == []
+
+    def test_process_decision_data_streaming(self):
+        """Test streaming mode builds the same tables as the default mode"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            loader = DataLoader(temp_dir)
+            loader.create_sample_data()
+
+            expected = loader.process_decision_data()
+            streamed = loader.process_decision_data(streaming=True)
+
+            for expected_df, streamed_df in zip(expected, streamed):
+                pd.testing.assert_frame_equal(expected_df, streamed_df)
+
+            frames = list(loader.iter_prospect_frames(chunk_size=3))
+            assert [len(frame) for frame in frames] == [3, 1]
+
+    def test_get_job_candidate_pairs(self):
+        """Test pairs are joined with their job and candidate records"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            loader = DataLoader(temp_dir)
+            loader.create_sample_data()
+
+            pairs = loader.get_job_candidate_pairs()
+
+            assert len(pairs) == 4
+            first = pairs[0]
+            assert first['job_id'] == "10976"
+            assert first['candidate_id'] == "41496"
+            assert first['job_info']['titulo'] == "Desenvolvedor Python Sênior"
+            assert first['candidate_info']['nome'] == "Sr. Thales Freitas"
+            assert first['status'] == "Contratado"
+
+    def test_get_job_candidate_pairs_unknown_ids(self):
+        """Test pairs referencing unknown ids get empty details"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            loader = DataLoader(temp_dir)
+            loader.create_sample_data()
+            with open(Path(temp_dir) / "prospects.json", 'w') as f:
+                json.dump({"10976": [{"codigo_candidato": "00000", "situacao": "Rejeitado"}],
+                           "99999": [{"codigo_candidato": "41496", "situacao": "Rejeitado"}]}, f)
+
+            pairs = loader.get_job_candidate_pairs()
+            columns = loader.get_job_candidate_pairs(as_columns=True)
+
+            assert pairs[0]['candidate_info'] == {}
+            assert pairs[1]['job_info'] == {}
+            assert columns['job_position'].tolist() == [0, -1]
+            assert columns['candidate_position'].tolist() == [-1, 0]
+            assert columns['status'].tolist() == ["Rejeitado", "Rejeitado"]
@@ -0,0 +1,239 @@
+"""
+Tests for the resident entity store
+"""
+import pytest
+import json
+import pandas as pd
+import tempfile
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from data.data_loader import DataLoader
+from data.data_refresher import DataRefresher
+from data.entity_store import EntityStore, build_position_index
+from features.feature_engineering import FeatureEngineer
+from features.skill_matrix import SkillIncidence
+
+class TestEntityStore:
+
+    def test_build_position_index_first_occurrence(self):
+        """Test that duplicated ids resolve to their first row"""
+        df = pd.DataFrame({'job_id': ['a', 'b', 'a', None]})
+
+        index = build_position_index(df, 'job_id')
+
+        assert index == {'a': 0, 'b': 1}
+
+    def test_build_position_index_missing_column(self):
+        """Test indexing a frame without the id column"""
+        assert build_position_index(pd.DataFrame(), 'job_id') == {}
+
+    def test_lookup_from_sample_data(self):
+        """Test O(1) lookups against the sample data"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            loader = DataLoader(temp_dir)
+            loader.create_sample_data()
+
+            store = EntityStore.from_loader(loader)
+
+            assert store.num_jobs == 2
+            assert store.num_candidates == 2
+            assert store.get_job("10977")['titulo'] == "Analista SAP ABAP"
+            assert store.get_candidate("41496")['nome'] == "Sr. Thales Freitas"
+
+            candidate_frame = store.get_candidate_frame("41497")
+            assert len(candidate_frame) == 1
+            assert candidate_frame.iloc[0]['candidate_id'] == "41497"
+
+    def test_unknown_ids(self):
+        """Test lookups of ids that are not in the store"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            loader = DataLoader(temp_dir)
+            loader.create_sample_data()
+            store = EntityStore.from_loader(loader)
+
+            assert store.get_job("missing") is None
+            assert store.get_candidate("missing") is None
+            assert store.get_job_frame("missing").empty
+            assert store.get_candidate_frame("missing").empty
+
+    def test_pair_frames_slice_referenced_rows(self):
+        """Test pair frames hold only the referenced rows and score like the full tables"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            loader = DataLoader(temp_dir)
+            loader.create_sample_data()
+            store = EntityStore.from_loader(loader)
+            prospects = pd.DataFrame({'candidate_id': ["41497", "missing"], 'job_id': ["10976", "10976"]})
+
+            vagas_df, applicants_df = store.pair_frames(prospects['candidate_id'], prospects['job_id'])
+
+            assert vagas_df['job_id'].tolist() == ["10976"]
+            assert applicants_df['candidate_id'].tolist() == ["41497"]
+            feature_engineer = FeatureEngineer()
+            pd.testing.assert_frame_equal(
+                feature_engineer.create_features(vagas_df, applicants_df, prospects),
+                feature_engineer.create_features(store.vagas_df, store.applicants_df, prospects)
+            )
+
+    def test_candidate_encoding_cached(self):
+        """Test the candidate pool is encoded once per feature engineer"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            loader = DataLoader(temp_dir)
+            loader.create_sample_data()
+            store = EntityStore.from_loader(loader)
+
+            feature_engineer = FeatureEngineer()
+            encoding = store.candidate_encoding(feature_engineer)
+
+            assert list(encoding['ids']) == ["41496", "41497"]
+            assert store.candidate_encoding(feature_engineer) is encoding
+            assert store.candidate_encoding(FeatureEngineer()) is not encoding
+
+    def test_patched_nothing_returns_same_store(self):
+        """Test patching with no changes keeps the store and its version"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            loader = DataLoader(temp_dir)
+            loader.create_sample_data()
+            store = EntityStore.from_loader(loader)
+
+            assert store.patched({}, {}, {}) is store
+
+    def test_patched_reuses_candidate_encoding(self):
+        """Test a patched store re-encodes only new or changed candidates"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            loader = DataLoader(temp_dir)
+            loader.create_sample_data()
+            store = EntityStore.from_loader(loader)
+            feature_engineer = FeatureEngineer()
+            store.candidate_encoding(feature_engineer)
+
+            changed = dict(store.get_candidate("41496"), localizacao='Rio de Janeiro - RJ')
+            new_candidate = dict(store.get_candidate("41497"), candidate_id='50000', codigo_candidato='50000',
+                                 conhecimentos_tecnicos=['Rust', 'Python'])
+
+            patched = store.patched({}, {'41496': changed, '50000': new_candidate}, {})
+
+            assert patched is not store
+            assert patched.data_version != store.data_version
+            assert patched.has_candidate('50000')
+            assert not store.has_candidate('50000')
+            assert patched.get_candidate('41496')['localizacao'] == 'Rio de Janeiro - RJ'
+            assert store.get_candidate('41496')['localizacao'] == 'São Paulo - SP'
+            assert patched.candidate_index == build_position_index(patched.applicants_df, 'candidate_id')
+
+            encoding = patched.candidate_encoding(feature_engineer)
+            expected = feature_engineer.encode_candidates(patched.applicants_df)
+            assert list(encoding['ids']) == ['41496', '41497', '50000']
+            for name, values in expected.items():
+                if isinstance(values, SkillIncidence):
+                    width = max(values.matrix.shape[1], encoding[name].matrix.shape[1])
+                    assert (values.with_width(width) != encoding[name].with_width(width)).nnz == 0
+                else:
+                    assert list(encoding[name]) == list(values), name
+
+    def test_patched_removes_records(self):
+        """Test removed ids leave the tables, the id maps and the candidate encoding"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            loader = DataLoader(temp_dir)
+            loader.create_sample_data()
+            store = EntityStore.from_loader(loader)
+            feature_engineer = FeatureEngineer()
+            store.candidate_encoding(feature_engineer)
+
+            patched = store.patched({'10977': None}, {'41496': None}, {'10977': []})
+
+            assert not patched.has_job('10977') and patched.has_job('10976')
+            assert patched.get_candidate('41497')['nome'] == "Sra. Ana Costa"
+            assert patched.num_candidates == 1
+            assert set(patched.prospects_df['job_id']) == {'10976'}
+            assert list(patched.candidate_encoding(feature_engineer)['ids']) == ['41497']
+
+    def test_data_refresher_publishes_on_change(self):
+        """Test the refresher publishes a new store only when a source changes"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            loader = DataLoader(temp_dir)
+            loader.create_sample_data()
+            stores = [EntityStore.from_loader(loader)]
+            refresher = DataRefresher(loader, lambda: stores[-1], stores.append)
+
+            assert not refresher.check()
+
+            applicants_path = loader.source_paths()['applicants']
+            content = applicants_path.read_text(encoding='utf-8')
+            applicants_path.write_text(content.replace('Sr. Thales Freitas', 'Thales Freitas'), encoding='utf-8')
+
+            assert refresher.check()
+            assert len(stores) == 2
+            assert stores[-1].get_candidate("41496")['nome'] == "Thales Freitas"
+            assert not refresher.check()
+
+    def test_data_refresher_parses_only_changed_records(self):
+        """Test a refresh decodes only changed records and matches a full reload"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            loader = DataLoader(temp_dir)
+            loader.create_synthetic_data(n_jobs=10, n_applicants=50, n_prospects=80, seed=4)
+            stores = [EntityStore.from_loader(loader)]
+            feature_engineer = FeatureEngineer()
+            stores[0].candidate_encoding(feature_engineer)
+            refresher = DataRefresher(loader, lambda: stores[-1], stores.append)
+
+            applicants_path = loader.source_paths()['applicants']
+            applicants = json.loads(applicants_path.read_text(encoding='utf-8'))
+            codes = list(applicants)
+            applicants[codes[3]]['nome'] = "Nome Alterado"
+            del applicants[codes[7]]
+            applicants['999999'] = dict(applicants[codes[0]], codigo_candidato='999999')
+            applicants_path.write_text(json.dumps(applicants, ensure_ascii=False), encoding='utf-8')
+
+            digests, records = loader.scan_records("applicants.json", refresher._digests['applicants'])
+            assert set(records) == {codes[3], '999999'}
+
+            assert refresher.check()
+            store = stores[-1]
+            assert store.get_candidate(codes[3])['nome'] == "Nome Alterado"
+            assert not store.has_candidate(codes[7])
+            assert store.has_candidate('999999')
+
+            reloaded = EntityStore.from_loader(loader)
+            columns = list(reloaded.applicants_df.columns)
+            pd.testing.assert_frame_equal(
+                store.applicants_df[columns].sort_values('candidate_id').reset_index(drop=True),
+                reloaded.applicants_df.sort_values('candidate_id').reset_index(drop=True)
+            )
+            assert sorted(store.candidate_encoding(feature_engineer)['ids']) == sorted(reloaded.candidate_index)
+
+    def test_data_refresher_skips_truncated_source(self):
+        """Test a source caught mid-write is not published, and is picked up once complete"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            loader = DataLoader(temp_dir, use_snapshot=True)
+            loader.create_sample_data()
+            stores = [EntityStore.from_loader(loader)]
+            refresher = DataRefresher(loader, lambda: stores[-1], stores.append)
+
+            applicants_path = loader.source_paths()['applicants']
+            content = applicants_path.read_text(encoding='utf-8')
+            applicants_path.write_text(content[:len(content) // 2], encoding='utf-8')
+
+            with pytest.raises(json.JSONDecodeError):
+                refresher.check()
+            assert len(stores) == 1
+            assert stores[-1].num_candidates == 2
+
+            applicants_path.write_text(content.replace('Sr. Thales Freitas', 'Thales Freitas'), encoding='utf-8')
+
+            assert refresher.check()
+            assert stores[-1].num_candidates == 2
+            assert stores[-1].get_candidate("41496")['nome'] == "Thales Freitas"
+            assert EntityStore.from_loader(loader).num_candidates == 2
+
+    def test_empty_store(self):
+        """Test building a store when no data exists"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = EntityStore.from_loader(DataLoader(temp_dir))
+
+            assert store.num_jobs == 0
+            assert store.num_candidates == 0
+            assert store.get_job_frame("10976").empty
@@ -136,4 +136,82 @@ class TestFeatureEngineer:
         assert len(target) == 4
         assert target.iloc[0] == 1  # Contratado
         assert target.iloc[1] == 0  # Rejeitado
-        assert target.iloc[3] == 1  # Aprovado
\ No newline at end of file
+        assert target.iloc[3] == 1  # Aprovado    
+    def _sample_tables(self):
+        """Small Decision-shaped tables with a mix of edge cases"""
+        applicants_df = pd.DataFrame([
+            {'candidate_id': 'c1', 'conhecimentos_tecnicos': ['Python', 'Django', 'SQL'], 'anos_experiencia': 6,
+             'pretensao_salarial': '15000', 'localizacao': 'São Paulo - SP', 'nivel_ingles': 'Intermediário',
+             'nivel_espanhol': 'Básico', 'nivel_academico': 'Superior Completo'},
+            {'candidate_id': 'c2', 'conhecimentos_tecnicos': 'SAP ABAP, SAP ECC', 'anos_experiencia': '4',
+             'pretensao_salarial': 'R$ 10,000', 'localizacao': 'Rio de Janeiro - RJ', 'nivel_ingles': 'Avançado',
+             'nivel_espanhol': 'Não possui', 'nivel_academico': ''},
+            {'candidate_id': 'c3', 'conhecimentos_tecnicos': [], 'anos_experiencia': None,
+             'pretensao_salarial': 'a combinar', 'localizacao': '', 'nivel_ingles': '',
+             'nivel_espanhol': 'Fluente', 'nivel_academico': None}
+        ])
+        vagas_df = pd.DataFrame([
+            {'job_id': 'j1', 'competencias_tecnicas': ['Python', 'Django', 'AWS'], 'nivel_profissional': 'Sênior',
+             'salario_range': '12000-18000', 'localizacao': 'São Paulo', 'nivel_ingles': 'Intermediário',
+             'nivel_espanhol': 'Não requerido', 'is_sap': False},
+            {'job_id': 'j2', 'competencias_tecnicas': ['SAP ABAP', 'SQL'], 'nivel_profissional': 'Junior',
+             'salario_range': '0-0', 'localizacao': 'Recife', 'nivel_ingles': 'Avançado',
+             'nivel_espanhol': 'Básico', 'is_sap': True}
+        ])
+        prospects_df = pd.DataFrame([
+            {'candidate_id': c, 'job_id': j, 'status': 'Rejeitado'}
+            for c in ['c1', 'c2', 'c3', 'missing'] for j in ['j1', 'j2', 'missing']
+        ])
+        return vagas_df, applicants_df, prospects_df
+    
+    def test_create_features_matches_rowwise(self):
+        """Test the batch engine reproduces the scalar path exactly"""
+        vagas_df, applicants_df, prospects_df = self._sample_tables()
+        # '0-0' salary ranges divide by zero in the scalar path; keep them out here
+        vagas_df.loc[1, 'salario_range'] = '8000-12000'
+        
+        expected = self.feature_engineer.create_features_rowwise(vagas_df, applicants_df, prospects_df)
+        result = self.feature_engineer.create_features(vagas_df, applicants_df, prospects_df)
+        
+        assert len(result) == 6
+        pd.testing.assert_frame_equal(result, expected, check_exact=True)
+    
+    def test_create_features_scalar_fallback(self):
+        """Test pairs outside the vectorized value space behave like the scalar path"""
+        vagas_df, applicants_df, prospects_df = self._sample_tables()
+        
+        with pytest.raises(ZeroDivisionError):
+            self.feature_engineer.create_features_rowwise(vagas_df, applicants_df, prospects_df)
+        with pytest.raises(ZeroDivisionError):
+            self.feature_engineer.create_features(vagas_df, applicants_df, prospects_df)
+        
+        # Zero salary expectation lands inside the '0-0' range
+        applicants_df['pretensao_salarial'] = '0'
+        # No skill list at all is only scored by the scalar path (fine for non-SAP jobs)
+        applicants_df.at[0, 'conhecimentos_tecnicos'] = None
+        prospects_df = prospects_df[(prospects_df['candidate_id'] != 'c3') &
+                                    ~((prospects_df['candidate_id'] == 'c1') & (prospects_df['job_id'] == 'j2'))]
+        expected = self.feature_engineer.create_features_rowwise(vagas_df, applicants_df, prospects_df)
+        result = self.feature_engineer.create_features(vagas_df, applicants_df, prospects_df)
+        pd.testing.assert_frame_equal(result, expected, check_exact=True)
+    
+    def test_location_codes_encoded_once(self):
+        """Test locations are integer ids shared by pool and job encodings, and block scoring matches"""
+        vagas_df, applicants_df, _ = self._sample_tables()
+        vagas_df.loc[1, 'salario_range'] = '8000-12000'
+        vagas_df.loc[1, 'localizacao'] = 'rio de janeiro - rj'
+        
+        candidates = self.feature_engineer.encode_candidates(applicants_df)
+        jobs = self.feature_engineer.encode_jobs(vagas_df, ['j1', 'j2'])
+        
+        assert candidates['location'].dtype == np.int64
+        assert candidates['location'][2] == -1
+        assert candidates['location'][1] == jobs['location'][1]
+        assert len(self.feature_engineer.location_vocabulary) == 3
+        
+        candidate_idx = np.repeat(np.arange(3), 2)
+        job_idx = np.tile(np.arange(2), 3)
+        block = self.feature_engineer.block_features(candidates, candidate_idx, jobs, job_idx, applicants_df, vagas_df)
+        prospects_df = pd.DataFrame({'candidate_id': np.repeat(['c1', 'c2', 'c3'], 2), 'job_id': ['j1', 'j2'] * 3})
+        expected = FeatureEngineer().create_features(vagas_df, applicants_df, prospects_df)
+        assert block['location_match'].tolist() == expected['location_match'].tolist()
@@ -0,0 +1,67 @@
+"""
+Tests for the in-process metrics registry
+"""
+import pytest
+import math
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from monitoring.metrics import MetricsRegistry
+
+class TestMetrics:
+    
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.registry = MetricsRegistry()
+    
+    def test_counter_and_gauge(self):
+        """Test counters accumulate and gauges move both ways"""
+        counter = self.registry.counter("requests_total", "Requests", ("endpoint",))
+        gauge = self.registry.gauge("in_flight", "In flight")
+        
+        counter.inc(endpoint="/predict")
+        counter.inc(2, endpoint="/predict")
+        gauge.inc()
+        gauge.inc()
+        gauge.dec()
+        
+        assert counter.value(endpoint="/predict") == 3
+        assert gauge.value() == 1
+        with pytest.raises(ValueError):
+            counter.inc(path="/predict")
+    
+    def test_histogram_quantiles(self):
+        """Test quantiles are interpolated within their bucket"""
+        histogram = self.registry.histogram("latency_seconds", "Latency", buckets=(0.1, 0.2, 0.4))
+        for value in [0.05] * 50 + [0.15] * 45 + [0.3] * 5:
+            histogram.observe(value)
+        
+        assert histogram.count() == 100
+        assert histogram.quantile(0.5) == pytest.approx(0.1)
+        assert histogram.quantile(0.95) == pytest.approx(0.2)
+        assert 0.2 < histogram.quantile(0.99) < 0.4
+        assert math.isnan(self.registry.histogram("empty_seconds", "Empty").quantile(0.5))
+    
+    def test_render_prometheus_text(self):
+        """Test the exposition format of every metric type"""
+        histogram = self.registry.histogram("stage_seconds", "Stage time", ("stage",), buckets=(0.1, 1.0))
+        histogram.observe(0.5, stage="train")
+        self.registry.gauge("info", "Versions", ("model_version",)).set_function(lambda: {("abc",): 1})
+        
+        text = self.registry.render()
+        
+        assert "# TYPE stage_seconds histogram" in text
+        assert 'stage_seconds_bucket{stage="train",le="0.1"} 0' in text
+        assert 'stage_seconds_bucket{stage="train",le="1.0"} 1' in text
+        assert 'stage_seconds_bucket{stage="train",le="+Inf"} 1' in text
+        assert 'stage_seconds_count{stage="train"} 1' in text
+        assert 'info{model_version="abc"} 1.0' in text
+    
+    def test_same_name_returns_same_metric(self):
+        """Test metrics are registered once per name"""
+        assert self.registry.counter("a_total", "A") is self.registry.counter("a_total", "A")
+        with pytest.raises(ValueError):
+            self.registry.gauge("a_total", "A")
@@ -0,0 +1,79 @@
+"""
+Tests for request micro-batching
+"""
+import pytest
+import asyncio
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from api.micro_batcher import MicroBatcher
+
+class TestMicroBatcher:
+    
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.calls = []
+    
+    def double(self, items):
+        self.calls.append(list(items))
+        if any(item < 0 for item in items):
+            raise ValueError("negative item")
+        return [item * 2 for item in items]
+    
+    def test_coalesces_concurrent_items(self):
+        """Test items submitted together are processed in one call"""
+        batcher = MicroBatcher(self.double, window_ms=5, max_items=100)
+        
+        async def main():
+            return await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+        
+        assert asyncio.run(main()) == [i * 2 for i in range(10)]
+        assert self.calls == [list(range(10))]
+        assert batcher.mean_batch_size == 10
+    
+    def test_flushes_at_max_items(self):
+        """Test a full batch is flushed without waiting for the window"""
+        batcher = MicroBatcher(self.double, window_ms=10000, max_items=4)
+        
+        async def main():
+            return await asyncio.wait_for(asyncio.gather(*(batcher.submit(i) for i in range(8))), timeout=5)
+        
+        assert asyncio.run(main()) == [i * 2 for i in range(8)]
+        assert self.calls == [[0, 1, 2, 3], [4, 5, 6, 7]]
+    
+    def test_failure_isolated_to_item(self):
+        """Test a failing item does not fail the rest of its batch"""
+        batcher = MicroBatcher(self.double, window_ms=5, max_items=100)
+        
+        async def main():
+            return await asyncio.gather(*(batcher.submit(i) for i in [1, -1, 2]), return_exceptions=True)
+        
+        results = asyncio.run(main())
+        
+        assert results[0] == 2
+        assert isinstance(results[1], ValueError)
+        assert results[2] == 4
+    
+    def test_overload_fails_batch_without_retry(self):
+        """Test a fail-fast error fails every item without per-item retries"""
+        runs = []
+        
+        async def busy(func, *args):
+            runs.append(args)
+            raise OverflowError("pool full")
+        
+        batcher = MicroBatcher(self.double, busy, window_ms=5, max_items=100, fail_fast=(OverflowError,))
+        
+        async def main():
+            results = await asyncio.gather(*(batcher.submit(i) for i in range(3)), return_exceptions=True)
+            await asyncio.sleep(0)
+            return results, len(batcher._tasks)
+        
+        results, tasks_left = asyncio.run(main())
+        
+        assert all(isinstance(result, OverflowError) for result in results)
+        assert len(runs) == 1
+        assert tasks_left == 0
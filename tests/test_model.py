@@ -11,7 +11,11 @@ import sys
 # Add src to path
 sys.path.append(str(Path(__file__).parent.parent / "src"))
 
-from models.candidate_job_matcher import CandidateJobMatcher
+from models.candidate_job_matcher import (
+    CandidateJobMatcher, EARLY_EXIT_CHUNK_SIZE, interpret_match_scores, top_k_order
+)
+from features.feature_engineering import FeatureEngineer
+from data.data_loader import DataLoader
 
 class TestCandidateJobMatcher:
     
@@ -108,7 +112,95 @@ class TestCandidateJobMatcher:
         assert 0 <= result['confidence'] <= 1
         assert result['recommendation'] in ['high_match', 'medium_match', 'low_match']
         assert isinstance(result['key_factors'], list)
+
+    def test_batch_confidence_matches_single_rows(self):
+        """Test batch evaluation equals evaluating each row on its own"""
+        self.matcher.train(self.X_train, self.y_train)
+
+        results = self.matcher.evaluate_batch_confidence(self.X_train[:10])
+
+        assert len(results) == 10
+        for i, result in enumerate(results):
+            assert result == self.matcher.evaluate_model_confidence(self.X_train[i:i + 1])
+
+    def test_interpret_match_scores_matches_scalar(self):
+        """Test the vectorized buckets equal the per-score interpretation, edges included"""
+        scores = np.concatenate([np.linspace(0, 1, 1001), [0.2, 0.3, 0.6, 0.7, 0.8, 0.5 + 1e-12]])
+        
+        arrays = interpret_match_scores(scores)
+        
+        for i, score in enumerate(scores):
+            expected = self.matcher._interpret_match_score(score)
+            assert arrays['match_score'][i] == expected['match_score']
+            assert arrays['confidence'][i] == expected['confidence']
+            assert arrays['recommendation'][i] == expected['recommendation']
+
+    def test_feature_ranking_computed_once(self):
+        """Test key factors are ranked once per model and reset by retraining"""
+        self.matcher.train(self.X_train, self.y_train)
+        
+        ranking = self.matcher._feature_ranking()
+        self.matcher.evaluate_batch_confidence(self.X_train[:5])
+        assert self.matcher._feature_ranking() is ranking
+        assert self.matcher.key_factors() == ranking['feature'].head(3).tolist()
+        
+        importance = self.matcher.get_feature_importance()
+        importance.loc[importance.index[0], 'importance'] = -1.0
+        assert self.matcher._feature_ranking()['importance'].iloc[0] != -1.0
+        
+        self.matcher.train(self.X_train, self.y_train)
+        assert self.matcher._feature_ranking() is not ranking
+
+    def test_per_row_key_factors(self):
+        """Test key factors come from each row's own contributions"""
+        self.matcher.train(self.X_train, self.y_train)
+        
+        results = self.matcher.evaluate_batch_confidence(self.X_train[:20])
+        evaluation = self.matcher.evaluate_confidence_arrays(self.X_train[:20])
+        
+        for row, result in enumerate(results):
+            contributions = dict(zip(self.matcher.feature_names, evaluation['contributions'][row]))
+            ranked = sorted(contributions, key=lambda name: -abs(contributions[name]))
+            assert [abs(contributions[name]) for name in result['key_factors']] == \
+                [abs(contributions[name]) for name in ranked[:3]]
+            assert result['factor_contributions'] == {name: contributions[name] for name in result['key_factors']}
+        
+        static = self.matcher.evaluate_batch_confidence(self.X_train[:2], explain=False)
+        assert static[0]['key_factors'] == self.matcher.key_factors()
+        assert 'factor_contributions' not in static[0]
+
+    def test_early_exit_recommendations(self):
+        """Test bucket-mode scoring reports trees used and keeps the full-forest buckets"""
+        self.matcher.train(self.X_train, self.y_train)
+        n_trees = self.matcher.compiled_forest.n_trees
+        
+        full = self.matcher.evaluate_confidence_arrays(self.X_train)
+        early = self.matcher.evaluate_confidence_arrays(self.X_train, early_exit=True)
+        
+        assert np.all((early['trees_used'] >= 1) & (early['trees_used'] <= n_trees))
+        assert early['trees_used'].mean() < n_trees
+        assert np.array_equal(early['recommendation'], full['recommendation'])
+        
+        results = self.matcher.evaluate_batch_confidence(self.X_train[:5], early_exit=True)
+        assert [result['trees_used'] for result in results] == early['trees_used'][:5].tolist()
+        assert results[0]['key_factors'] == self.matcher.key_factors()
     
+    def test_early_exit_unanimous_first_chunk(self):
+        """Test agreeing first trees do not settle a bucket the rest of the forest overturns"""
+        self.matcher.train(self.X_train, self.y_train)
+        forest = self.matcher.compiled_forest
+        # Every leaf of the first chunk says match, every later leaf says no match
+        boundary = forest.roots[EARLY_EXIT_CHUNK_SIZE]
+        forest.leaf_proba[:boundary] = [0.0, 1.0]
+        forest.leaf_proba[boundary:] = [1.0, 0.0]
+        
+        full = self.matcher.evaluate_confidence_arrays(self.X_train[:10])
+        early = self.matcher.evaluate_confidence_arrays(self.X_train[:10], early_exit=True)
+        
+        assert np.all(full['recommendation'] == "low_match")
+        assert np.array_equal(early['recommendation'], full['recommendation'])
+        assert np.all(early['trees_used'] > EARLY_EXIT_CHUNK_SIZE)
+
     def test_save_and_load_model(self):
         """Test model saving and loading"""
         # Train model
@@ -127,6 +219,7 @@ class TestCandidateJobMatcher:
             # Test loaded model
             assert new_matcher.is_trained
             assert new_matcher.feature_names == self.matcher.feature_names
+            assert new_matcher.model_version is not None
             
             new_prediction = new_matcher.predict(self.X_train[:1])
             assert np.array_equal(original_prediction, new_prediction)
@@ -139,4 +232,72 @@ class TestCandidateJobMatcher:
     def test_load_nonexistent_model(self):
         """Test loading nonexistent model raises error"""
         with pytest.raises(FileNotFoundError):
-            self.matcher.load_model("nonexistent_model.joblib")
\ No newline at end of file
+            self.matcher.load_model("nonexistent_model.joblib")
+    
+    def test_score_candidates_matches_pairwise(self):
+        """Test block scoring equals scoring each pair on its own"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            loader = DataLoader(temp_dir)
+            loader.create_sample_data()
+            vagas_df, prospects_df, applicants_df = loader.process_decision_data()
+        
+        feature_engineer = FeatureEngineer()
+        X, y = feature_engineer.prepare_training_data(vagas_df, applicants_df, prospects_df)
+        self.matcher.train(X, y)
+        
+        job_ids = ["10977", "10976"]
+        scores, candidate_ids = self.matcher.score_candidates(
+            feature_engineer, vagas_df, applicants_df, job_ids, block_size=1, n_workers=2
+        )
+        
+        assert scores.shape == (2, 2)
+        assert list(candidate_ids) == ["41496", "41497"]
+        for j, job_id in enumerate(job_ids):
+            for c, candidate_id in enumerate(candidate_ids):
+                prospect = pd.DataFrame([{'candidate_id': candidate_id, 'job_id': job_id, 'status': 'applied'}])
+                features_df = feature_engineer.create_features(vagas_df, applicants_df, prospect)
+                expected = self.matcher.get_match_score(feature_engineer.transform_features(features_df))
+                assert scores[j, c] == expected
+    
+    def test_score_candidates_unknown_job(self):
+        """Test scoring an unknown job id raises an error"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            loader = DataLoader(temp_dir)
+            loader.create_sample_data()
+            vagas_df, prospects_df, applicants_df = loader.process_decision_data()
+        
+        feature_engineer = FeatureEngineer()
+        X, y = feature_engineer.prepare_training_data(vagas_df, applicants_df, prospects_df)
+        self.matcher.train(X, y)
+        
+        with pytest.raises(ValueError, match="Unknown job ids"):
+            self.matcher.score_candidates(feature_engineer, vagas_df, applicants_df, ["00000"])
+    
+    def test_top_k_order_matches_full_sort(self):
+        """Test partial selection ranks like a stable full sort, ties included"""
+        scores = np.array([0.2, 0.9, 0.5, 0.9, 0.5, 0.1, 0.5])
+        
+        for k in range(len(scores) + 2):
+            expected = np.argsort(-scores, kind='stable')[:k]
+            assert np.array_equal(top_k_order(scores, k), expected)
+    
+    def test_top_candidates_pagination(self):
+        """Test ranked pages of the candidate pool"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            loader = DataLoader(temp_dir)
+            loader.create_sample_data()
+            vagas_df, prospects_df, applicants_df = loader.process_decision_data()
+        
+        feature_engineer = FeatureEngineer()
+        X, y = feature_engineer.prepare_training_data(vagas_df, applicants_df, prospects_df)
+        self.matcher.train(X, y)
+        
+        ranked, total = self.matcher.top_candidates(feature_engineer, vagas_df, applicants_df, "10977", k=10)
+        first_page, _ = self.matcher.top_candidates(feature_engineer, vagas_df, applicants_df, "10977", k=1)
+        second_page, _ = self.matcher.top_candidates(feature_engineer, vagas_df, applicants_df, "10977",
+                                                     k=1, offset=1)
+        
+        assert total == 2
+        assert len(ranked) == 2
+        assert ranked[0][1] >= ranked[1][1]
+        assert first_page + second_page == ranked
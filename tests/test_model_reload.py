@@ -0,0 +1,93 @@
+"""
+Tests for hot model reload
+"""
+import pytest
+import tempfile
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from data.data_loader import DataLoader
+from data.entity_store import EntityStore
+from features.feature_engineering import FeatureEngineer
+from models.artifact import save_artifact
+from models.candidate_job_matcher import CandidateJobMatcher
+from api.model_reload import ArtifactWatcher, ModelBundle, request_reload
+
+class TestModelReload:
+    
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        loader = DataLoader(self.temp_dir.name)
+        loader.create_sample_data()
+        self.store = EntityStore.from_loader(loader)
+        
+        self.feature_engineer = FeatureEngineer()
+        X, y = self.feature_engineer.prepare_training_data(
+            self.store.vagas_df, self.store.applicants_df, self.store.prospects_df
+        )
+        self.matcher = CandidateJobMatcher({'n_estimators': 5})
+        self.matcher.train(X, y)
+        self.artifact_dir = Path(self.temp_dir.name) / "artifact"
+    
+    def teardown_method(self):
+        self.temp_dir.cleanup()
+    
+    def test_bundle_from_artifact(self):
+        """Test a bundle carries the artifact's version and warms up"""
+        manifest = save_artifact(self.artifact_dir, self.matcher, self.feature_engineer)
+        
+        bundle = ModelBundle.from_artifact(self.artifact_dir)
+        bundle.warm_up(self.store)
+        
+        assert bundle.is_ready
+        assert bundle.version == manifest['model_version']
+        assert bundle.source == str(self.artifact_dir)
+    
+    def test_watcher_detects_new_generation(self):
+        """Test the watcher fires once per new artifact generation"""
+        save_artifact(self.artifact_dir, self.matcher, self.feature_engineer)
+        reloads = []
+        watcher = ArtifactWatcher(self.artifact_dir, lambda: reloads.append(1), interval=60)
+        
+        assert not watcher.check()
+        
+        save_artifact(self.artifact_dir, self.matcher, self.feature_engineer)
+        assert watcher.check()
+        assert not watcher.check()
+        assert len(reloads) == 1
+    
+    def test_watcher_retries_failed_reload(self):
+        """Test a failed reload is attempted again on the next check"""
+        watcher = ArtifactWatcher(self.artifact_dir, lambda: None, interval=60)
+        save_artifact(self.artifact_dir, self.matcher, self.feature_engineer)
+        
+        def fail():
+            raise RuntimeError("broken artifact")
+        watcher.on_change = fail
+        
+        with pytest.raises(RuntimeError):
+            watcher.check()
+        watcher.on_change = lambda: None
+        assert watcher.check()
+    
+    def test_watcher_follows_reload_requests(self):
+        """Test a reload request reaches every watcher except the one marked as having reloaded"""
+        save_artifact(self.artifact_dir, self.matcher, self.feature_engineer)
+        reloads = []
+        requester = ArtifactWatcher(self.artifact_dir, lambda: reloads.append("requester"), interval=60)
+        other = ArtifactWatcher(self.artifact_dir, lambda: reloads.append("other"), interval=60)
+        
+        request_reload(self.artifact_dir)
+        requester.mark_seen()
+        
+        assert not requester.check()
+        assert other.check()
+        assert not other.check()
+        assert reloads == ["other"]
+        
+        request_reload(self.artifact_dir)
+        assert other.check()
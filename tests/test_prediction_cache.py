@@ -0,0 +1,69 @@
+"""
+Tests for the prediction cache
+"""
+import pytest
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from api.prediction_cache import PredictionCache
+
+class FakeClock:
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+class TestPredictionCache:
+    
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.clock = FakeClock()
+        self.cache = PredictionCache(max_size=2, ttl_seconds=10, clock=self.clock)
+    
+    def test_hit_and_miss(self):
+        """Test lookups count hits and misses"""
+        assert self.cache.get(("c1", "j1", "m1", "d1")) is None
+        self.cache.put(("c1", "j1", "m1", "d1"), {'match_score': 0.5})
+        
+        assert self.cache.get(("c1", "j1", "m1", "d1")) == {'match_score': 0.5}
+        # Another model or data version is another entry
+        assert self.cache.get(("c1", "j1", "m2", "d1")) is None
+        
+        stats = self.cache.stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 2
+    
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted first"""
+        self.cache.put("a", 1)
+        self.cache.put("b", 2)
+        self.cache.get("a")
+        self.cache.put("c", 3)
+        
+        assert self.cache.get("b") is None
+        assert self.cache.get("a") == 1
+        assert self.cache.get("c") == 3
+        assert self.cache.stats()['evictions'] == 1
+    
+    def test_ttl_expiration(self):
+        """Test entries expire after the TTL"""
+        self.cache.put("a", 1)
+        self.clock.now = 9.9
+        assert self.cache.get("a") == 1
+        
+        self.clock.now = 10.0
+        assert self.cache.get("a") is None
+        assert self.cache.stats()['expirations'] == 1
+        assert len(self.cache) == 0
+    
+    def test_disabled(self):
+        """Test a zero-size cache stores nothing"""
+        cache = PredictionCache(max_size=0)
+        cache.put("a", 1)
+        
+        assert cache.get("a") is None
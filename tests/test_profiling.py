@@ -0,0 +1,61 @@
+"""
+Tests for sampled request profiling
+"""
+import pytest
+import tempfile
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from monitoring.profiling import RequestProfiler
+
+def allocate(n):
+    return [str(i) for i in range(n)]
+
+class TestRequestProfiler:
+    
+    def test_disabled_by_default(self):
+        """Test nothing is sampled unless enabled or forced"""
+        profiler = RequestProfiler()
+        
+        assert not profiler.should_profile()
+        assert profiler.should_profile(forced=True)
+    
+    def test_sampling(self):
+        """Test the sample rate is compared against the random draw"""
+        draws = iter([0.05, 0.5])
+        profiler = RequestProfiler(sample_rate=0.1, rng=lambda: next(draws))
+        
+        assert profiler.should_profile()
+        assert not profiler.should_profile()
+    
+    def test_run_aggregates_profiles(self):
+        """Test profiled calls return their result and show up in the report"""
+        profiler = RequestProfiler(mode="both")
+        
+        assert len(profiler.run("predict", allocate, 1000)) == 1000
+        profiler.run("predict", allocate, 1000)
+        report = profiler.report(limit=10)
+        
+        assert report['requests_profiled'] == 2
+        assert "allocate" in report['cprofile']
+        assert report['tracemalloc']
+        
+        profiler.reset()
+        assert profiler.report()['requests_profiled'] == 0
+    
+    def test_rotating_output_dir(self):
+        """Test only the newest profile files are kept"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            profiler = RequestProfiler(output_dir=temp_dir, max_files=2)
+            for _ in range(4):
+                profiler.run("predict", allocate, 10)
+            
+            assert len(list(Path(temp_dir).glob("*.prof"))) == 2
+    
+    def test_unknown_mode(self):
+        """Test an invalid mode is rejected"""
+        with pytest.raises(ValueError):
+            RequestProfiler(mode="perf")
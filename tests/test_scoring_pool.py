@@ -0,0 +1,54 @@
+"""
+Tests for the bounded scoring executor
+"""
+import pytest
+import asyncio
+import threading
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from api.scoring_pool import ScoringPool, ScoringPoolFull
+
+class TestScoringPool:
+    
+    def test_runs_off_event_loop_thread(self):
+        """Test work runs on a worker thread and returns its result"""
+        pool = ScoringPool(max_workers=2, max_queue=2)
+        
+        async def main():
+            return await pool.run(lambda a, b: (a + b, threading.current_thread().name), 1, 2)
+        
+        result, thread_name = asyncio.run(main())
+        
+        assert result == 3
+        assert thread_name.startswith("scoring")
+        assert pool.in_flight == 0
+    
+    def test_rejects_when_full(self):
+        """Test requests beyond workers + queue depth are rejected"""
+        pool = ScoringPool(max_workers=1, max_queue=1)
+        release = threading.Event()
+        
+        async def main():
+            running = [asyncio.ensure_future(pool.run(release.wait)) for _ in range(2)]
+            await asyncio.sleep(0)
+            with pytest.raises(ScoringPoolFull):
+                await pool.run(release.wait)
+            release.set()
+            return await asyncio.gather(*running)
+        
+        assert asyncio.run(main()) == [True, True]
+        assert pool.in_flight == 0
+    
+    def test_from_env(self, monkeypatch):
+        """Test pool sizing from the environment"""
+        monkeypatch.setenv("SCORING_WORKERS", "3")
+        monkeypatch.setenv("SCORING_QUEUE_DEPTH", "5")
+        
+        pool = ScoringPool.from_env()
+        
+        assert pool.max_workers == 3
+        assert pool.capacity == 8
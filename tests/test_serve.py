@@ -0,0 +1,63 @@
+"""
+Tests for the prefork launcher
+"""
+import pytest
+import os
+import time
+import tempfile
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from api.serve import PREFORK_WATCH_INTERVAL, PreforkSupervisor, bind_socket, ensure_model_watch
+
+class TestPreforkSupervisor:
+    
+    def test_workers_share_parent_state(self):
+        """Test forked workers see state built in the parent and stop on request"""
+        shared = {'model': 'loaded in parent'}
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            def target():
+                Path(temp_dir, str(os.getpid())).write_text(shared['model'])
+                time.sleep(30)
+            
+            supervisor = PreforkSupervisor(target, n_workers=2)
+            supervisor.start()
+            try:
+                deadline = time.time() + 10
+                while len(list(Path(temp_dir).iterdir())) < 2 and time.time() < deadline:
+                    time.sleep(0.05)
+            finally:
+                supervisor.stop()
+            
+            outputs = {path.name: path.read_text() for path in Path(temp_dir).iterdir()}
+        
+        assert len(outputs) == 2
+        assert set(outputs.values()) == {'loaded in parent'}
+        assert os.getpid() not in map(int, outputs)
+        assert supervisor.workers == {}
+    
+    def test_bind_socket_is_inheritable(self):
+        """Test the listening socket survives fork for the workers"""
+        sock = bind_socket("127.0.0.1", 0)
+        try:
+            assert sock.get_inheritable()
+            assert sock.getsockname()[1] > 0
+        finally:
+            sock.close()
+    
+    def test_model_watch_enforced_for_several_workers(self):
+        """Test prefork serving always watches the artifact, keeping an explicit interval"""
+        environ = {}
+        assert ensure_model_watch(1, environ) == 0
+        assert environ == {}
+        
+        assert ensure_model_watch(4, environ) == PREFORK_WATCH_INTERVAL
+        assert float(environ["MODEL_WATCH_INTERVAL"]) == PREFORK_WATCH_INTERVAL
+        
+        environ = {"MODEL_WATCH_INTERVAL": "0"}
+        assert ensure_model_watch(2, environ) == PREFORK_WATCH_INTERVAL
+        assert ensure_model_watch(2, {"MODEL_WATCH_INTERVAL": "30"}) == 30.0
@@ -0,0 +1,103 @@
+"""
+Tests for sparse skill incidence matrices
+"""
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from features.feature_engineering import FeatureEngineer
+from features.skill_matrix import LocalVocabulary, SkillIncidence, SkillVocabulary, jaccard_pairs
+
+class TestSkillMatrix:
+    
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.candidate_skills = [
+            ["Python", "Django", "PostgreSQL"],
+            ["SAP ABAP", "SAP ECC"],
+            [],
+            ["python", "AWS"]
+        ]
+        self.job_skills = [
+            ["Python", "Django", "AWS"],
+            ["SAP ABAP", "SQL"]
+        ]
+    
+    def _normalized(self, skills):
+        return {skill.lower().strip() for skill in skills if skill}
+    
+    def test_vocabulary_ids_are_stable(self):
+        """Test each skill gets one id"""
+        vocabulary = SkillVocabulary()
+        
+        assert vocabulary.add("python") == 0
+        assert vocabulary.add("sql") == 1
+        assert vocabulary.add("python") == 0
+        assert vocabulary.lookup("java") is None
+        assert len(vocabulary) == 2
+    
+    def test_incidence_rows(self):
+        """Test CSR rows hold one entry per distinct skill"""
+        vocabulary = SkillVocabulary()
+        incidence = SkillIncidence.from_sets([self._normalized(s) for s in self.candidate_skills], vocabulary)
+        
+        assert incidence.matrix.shape == (4, len(vocabulary))
+        assert incidence.sizes.tolist() == [3, 2, 0, 2]
+    
+    def test_jaccard_matches_scalar(self):
+        """Test batched Jaccard equals calculate_skill_match for every pair"""
+        feature_engineer = FeatureEngineer()
+        vocabulary = SkillVocabulary()
+        candidates = SkillIncidence.from_sets([self._normalized(s) for s in self.candidate_skills], vocabulary)
+        jobs = SkillIncidence.from_sets([self._normalized(s) for s in self.job_skills], vocabulary)
+        
+        candidate_idx = np.repeat(np.arange(4), 2)
+        job_idx = np.tile(np.arange(2), 4)
+        pairs = jaccard_pairs(candidates, jobs, candidate_idx, job_idx)
+        
+        for k, (c, j) in enumerate(zip(candidate_idx, job_idx)):
+            expected = feature_engineer.calculate_skill_match(self.candidate_skills[c], self.job_skills[j])
+            assert pairs[k] == expected
+    
+    def test_matrices_built_at_different_vocabulary_sizes(self):
+        """Test matrices stay compatible while the vocabulary grows"""
+        vocabulary = SkillVocabulary()
+        candidates = SkillIncidence.from_sets([{"python"}], vocabulary)
+        jobs = SkillIncidence.from_sets([{"python", "rust"}], vocabulary)
+        
+        assert jaccard_pairs(candidates, jobs, np.array([0]), np.array([0])).tolist() == [0.5]
+    
+    def test_local_vocabulary_leaves_shared_unchanged(self):
+        """Test unknown skills get view-local ids consistent across matrices"""
+        shared = SkillVocabulary()
+        shared.add("python")
+        view = LocalVocabulary(shared)
+        shared.add("late")  # assigned after the view: must not collide with local ids
+        
+        candidates = SkillIncidence.from_sets([{"python", "rust"}, {"late"}], view)
+        jobs = SkillIncidence.from_sets([{"rust"}, {"python"}], view)
+        
+        assert len(shared) == 2
+        assert view.add("python") == 0
+        assert sorted({view.add("rust"), view.add("late")}) == [1, 2]
+        assert jaccard_pairs(candidates, jobs, np.array([0, 0, 1]), np.array([0, 1, 0])).tolist() == [0.5, 0.5, 0.0]
+    
+    def test_create_features_does_not_grow_vocabulary(self):
+        """Test scoring pairs with new skills keeps the shared vocabulary as it was"""
+        feature_engineer = FeatureEngineer()
+        applicants_df = pd.DataFrame({'candidate_id': ["c1"], 'conhecimentos_tecnicos': [["Python", "Brand New"]]})
+        vagas_df = pd.DataFrame({'job_id': ["j1"], 'competencias_tecnicas': [["brand new", "Go"]],
+                                 'salario_range': ["8000-12000"]})
+        prospects_df = pd.DataFrame({'candidate_id': ["c1"], 'job_id': ["j1"]})
+        
+        features_df = feature_engineer.create_features(vagas_df, applicants_df, prospects_df)
+        
+        assert len(feature_engineer.skill_vocabulary) == 0
+        assert features_df['skill_match'].tolist() == [
+            feature_engineer.calculate_skill_match(["Python", "Brand New"], ["brand new", "Go"])
+        ]
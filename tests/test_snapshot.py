@@ -0,0 +1,103 @@
+"""
+Tests for the columnar snapshot cache
+"""
+import pytest
+import pandas as pd
+import numpy as np
+import json
+import os
+import tempfile
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from data.data_loader import DataLoader
+from data.snapshot import TableSnapshot
+
+class TestSnapshot:
+
+    def test_round_trip_preserves_values(self):
+        """Test every column layout survives a save/load cycle"""
+        df = pd.DataFrame([
+            {'job_id': '1', 'skills': ['Python', 'SQL'], 'is_sap': False, 'years': 3, 'mixed': 5, 'text': 'São Paulo'},
+            {'job_id': '2', 'skills': [], 'is_sap': True, 'years': 7, 'mixed': 'five', 'text': None},
+            {'job_id': '3', 'is_sap': True, 'years': 1, 'mixed': {'a': [1]}}
+        ])
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            snapshot = TableSnapshot(Path(temp_dir))
+            snapshot.save({'vagas': df, 'empty': pd.DataFrame()}, {'vagas': None})
+
+            tables = snapshot.load(snapshot.read_manifest())
+
+            pd.testing.assert_frame_equal(tables['vagas'], df)
+            assert tables['vagas'].loc[1, 'text'] is None
+            assert np.isnan(tables['vagas'].loc[2, 'text'])
+            assert tables['empty'].empty
+
+    def test_previous_generation_kept_older_removed(self):
+        """Test a save keeps the generation it replaces readable and removes older ones"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            snapshot = TableSnapshot(Path(temp_dir))
+            snapshot.save({'t': pd.DataFrame({'a': [1, 2]})}, {})
+            first = snapshot.read_manifest()
+            snapshot.save({'t': pd.DataFrame({'a': [3]})}, {})
+            second = snapshot.read_manifest()
+
+            # A reader holding the replaced manifest can still load it
+            assert snapshot.load(first)['t']['a'].tolist() == [1, 2]
+
+            snapshot.save({'t': pd.DataFrame({'a': [4]})}, {})
+            generations = {path.name.split('-', 1)[0] for path in Path(temp_dir).glob("*.npy")}
+            assert generations == {second['generation'], snapshot.read_manifest()['generation']}
+
+    def test_warm_load_matches_cold_parse(self):
+        """Test the loader serves identical tables from the snapshot"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            loader = DataLoader(temp_dir, use_snapshot=True)
+            loader.create_sample_data()
+
+            cold = loader.process_decision_data()
+            assert (Path(temp_dir) / ".snapshot" / "manifest.json").exists()
+            warm = loader.process_decision_data()
+
+            for cold_df, warm_df in zip(cold, warm):
+                pd.testing.assert_frame_equal(cold_df, warm_df)
+
+    def test_snapshot_invalidated_on_change(self):
+        """Test a modified source file triggers a rebuild"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            loader = DataLoader(temp_dir, use_snapshot=True)
+            loader.create_sample_data()
+            loader.process_decision_data()
+
+            applicants_path = Path(temp_dir) / "applicants.json"
+            with open(applicants_path, 'r', encoding='utf-8') as f:
+                applicants = json.load(f)
+            applicants["99999"] = {"nome": "Novo Candidato"}
+            with open(applicants_path, 'w', encoding='utf-8') as f:
+                json.dump(applicants, f)
+
+            _, _, applicants_df = loader.process_decision_data()
+
+            assert "99999" in applicants_df['candidate_id'].tolist()
+
+    def test_touched_file_with_same_content_reused(self):
+        """Test an mtime-only change is resolved by the content hash"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            loader = DataLoader(temp_dir, use_snapshot=True)
+            loader.create_sample_data()
+            loader.process_decision_data()
+            generation = loader.snapshot.read_manifest()['generation']
+
+            vagas_path = Path(temp_dir) / "vagas.json"
+            stat = os.stat(vagas_path)
+            os.utime(vagas_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+            loader.process_decision_data()
+
+            manifest = loader.snapshot.read_manifest()
+            assert manifest['generation'] == generation
+            assert manifest['sources']['vagas']['mtime_ns'] == stat.st_mtime_ns + 10**9
@@ -0,0 +1,87 @@
+"""
+Tests for the synthetic data generator
+"""
+import pytest
+import tempfile
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from data.data_loader import DataLoader
+from data import synthetic_data
+from data.synthetic_data import SyntheticDataGenerator
+from features.feature_engineering import FeatureEngineer
+
+class TestSyntheticData:
+    
+    def test_counts_and_shape(self):
+        """Test the files load with the requested number of records"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            loader = DataLoader(temp_dir)
+            loader.create_synthetic_data(n_jobs=40, n_applicants=300, n_prospects=1000, seed=7)
+            
+            vagas_df, prospects_df, applicants_df = loader.process_decision_data(streaming=True)
+            
+            assert len(vagas_df) == 40
+            assert len(applicants_df) == 300
+            assert len(prospects_df) == 1000
+            assert prospects_df['candidate_id'].isin(applicants_df['candidate_id']).all()
+            assert prospects_df['job_id'].isin(vagas_df['job_id']).all()
+            assert {'competencias_tecnicas', 'salario_range', 'is_sap'} <= set(vagas_df.columns)
+            assert {'conhecimentos_tecnicos', 'pretensao_salarial', 'nivel_ingles'} <= set(applicants_df.columns)
+    
+    def test_deterministic(self):
+        """Test the same seed writes identical files and another seed does not"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = [Path(temp_dir) / name for name in ("a", "b", "c")]
+            for path, seed in zip(paths, (1, 1, 2)):
+                SyntheticDataGenerator(20, 100, 200, seed=seed).write(path)
+            
+            for filename in ("vagas.json", "applicants.json", "prospects.json"):
+                assert (paths[0] / filename).read_bytes() == (paths[1] / filename).read_bytes()
+            assert (paths[0] / "applicants.json").read_bytes() != (paths[2] / "applicants.json").read_bytes()
+    
+    def test_sap_share_and_outcomes(self):
+        """Test the SAP share is respected and hires favour compatible profiles"""
+        generator = SyntheticDataGenerator(n_jobs=400, n_applicants=2000, n_prospects=20000, sap_share=0.3)
+        jobs = dict(generator.iter_jobs())
+        
+        sap_share = sum(job['is_sap'] for job in jobs.values()) / len(jobs)
+        assert sap_share == pytest.approx(0.3, abs=0.06)
+        
+        hired = {True: [0, 0], False: [0, 0]}
+        for job_code, prospects in generator.iter_prospects():
+            job_is_sap = jobs[job_code]['is_sap']
+            for prospect in prospects:
+                candidate = int(prospect['codigo_candidato']) - 100000
+                fit = bool(generator.applicant_is_sap[candidate] == job_is_sap)
+                hired[fit][0] += prospect['situacao'] == 'Contratado'
+                hired[fit][1] += 1
+        assert hired[True][0] / hired[True][1] > hired[False][0] / hired[False][1]
+    
+    def test_prospects_generated_in_chunks(self, monkeypatch):
+        """Test a job's prospects are produced lazily and written across chunk boundaries"""
+        monkeypatch.setattr(synthetic_data, "CHUNK_SIZE", 7)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            generator = SyntheticDataGenerator(n_jobs=3, n_applicants=50, n_prospects=200, seed=5)
+            job_code, prospects = next(generator.iter_prospects())
+            assert not isinstance(prospects, list)
+            assert all('situacao' in prospect for prospect in prospects)
+            
+            generator.write(Path(temp_dir))
+            _, prospects_df, _ = DataLoader(temp_dir).process_decision_data(streaming=True)
+            assert len(prospects_df) == 200
+    
+    def test_features_from_synthetic_data(self):
+        """Test the feature pipeline runs on generated data"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            loader = DataLoader(temp_dir)
+            loader.create_synthetic_data(n_jobs=20, n_applicants=200, n_prospects=500)
+            vagas_df, prospects_df, applicants_df = loader.process_decision_data()
+            
+            X, y = FeatureEngineer().prepare_training_data(vagas_df, applicants_df, prospects_df)
+            
+            assert len(X) == 500
+            assert 0 < y.mean() < 1